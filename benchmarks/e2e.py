@@ -0,0 +1,288 @@
+# benchmarks/e2e.py
+"""
+End-to-end throughput benchmark.
+
+Generates synthetic scripts (10, 100 and 1000 scenes by default) and synthetic
+source clips at several resolutions and durations with ffmpeg's lavfi test
+sources, then runs every phase of main.py against them offline:
+
+- Pixabay searches are answered by a synthetic response layer behind
+  `search_videos` (its rate limiter and search cache still run).
+- Every clip id the responses mention is pre-seeded in a fresh clip cache,
+  so downloads are cache hits and nothing is fetched.
+- Narration comes from a local TTS engine that renders a lavfi sine tone as
+  long as the scene would take to read, standing in for the TTS service.
+
+Script analysis, rendering and final assembly run for real. Wall time, CPU
+time and peak RSS are recorded per phase and written as JSON:
+
+    python benchmarks/e2e.py [--scenes 10 100 1000] [--output results.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BENCHMARK_DIR, '..', 'src')))
+
+from main import build_parser, run_job
+from assets.audio import TTS_ENGINES, LocalTTSEngine
+from assets.clip_cache import ClipCache, link_or_copy
+from utils.ffmpeg import run_ffmpeg
+from utils.model_registry import _current_rss_bytes
+import config
+
+# (width, height) of the synthetic source clips, landscape and portrait
+CLIP_RESOLUTIONS = [(1280, 720), (1920, 1080), (720, 1280), (1080, 1920)]
+CLIP_DURATIONS = [3, 8, 15]
+NARRATION_SECONDS_PER_WORD = 0.4
+
+PLACES = ["forest", "beach", "city street", "mountain lake", "desert road", "old library", "harbor", "snowy village"]
+TIMES = ["at dawn", "at noon", "at sunset", "late at night", "in the early morning"]
+WEATHER = ["under a clear sky", "in light rain", "through thick fog", "as snow falls", "in a warm breeze"]
+SUBJECTS = ["A young woman", "An old fisherman", "Two children", "A tired traveler", "A street musician", "A small dog"]
+ACTIONS = ["walks slowly", "runs toward the light", "stops to listen", "laughs with joy", "looks around nervously", "waits in silence"]
+FEELINGS = ["Everything feels calm and hopeful.", "A sudden fear fills the air.", "The moment is full of quiet sadness.",
+            "Excitement builds with every step.", "There is anger in the distant voices."]
+
+def generate_script(num_scenes, seed=0):
+    """
+    Returns a script of `num_scenes` paragraphs. Each paragraph holds exactly
+    config.MAX_SENTENCES_PER_SCENE sentences, so it becomes one scene.
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(num_scenes):
+        sentences = [
+            f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} through the {rng.choice(PLACES)} {rng.choice(TIMES)}.",
+            f"The {rng.choice(PLACES)} glows {rng.choice(WEATHER)}.",
+            rng.choice(FEELINGS),
+        ]
+        paragraphs.append(" ".join(sentences[:config.MAX_SENTENCES_PER_SCENE]))
+    return "\n\n".join(paragraphs) + "\n"
+
+def generate_source_clips(clips_dir):
+    """Renders one lavfi test-pattern clip per resolution and duration. Returns their descriptions."""
+    os.makedirs(clips_dir, exist_ok=True)
+    clips = []
+    for (width, height), duration in itertools.product(CLIP_RESOLUTIONS, CLIP_DURATIONS):
+        path = os.path.join(clips_dir, f"testsrc_{width}x{height}_{duration}s.mp4")
+        if not os.path.exists(path):
+            run_ffmpeg([
+                '-f', 'lavfi', '-i', f"testsrc2=size={width}x{height}:rate=30:duration={duration}",
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', path
+            ])
+        clips.append({'path': path, 'width': width, 'height': height, 'duration': duration, 'size': os.path.getsize(path)})
+    return clips
+
+def seed_clip_cache(clip_cache, clips, num_ids):
+    """
+    Files `num_ids` distinct Pixabay video ids in the clip cache, cycling over
+    the source clips, so every scene can claim a clip of its own.
+    Returns the synthetic hits describing them.
+    """
+    hits = []
+    for video_id, clip in zip(range(1, num_ids + 1), itertools.cycle(clips)):
+        url = f"https://cdn.pixabay.invalid/video/{video_id}/large.mp4"
+        staging_path = os.path.join(clip_cache.root, 'tmp', f"seed_{video_id}.mp4")
+        link_or_copy(clip['path'], staging_path)
+        clip_cache.store(video_id, 'large', staging_path, url=url)
+        hits.append({
+            'id': video_id,
+            'tags': "synthetic, test pattern",
+            'duration': clip['duration'],
+            'videos': {'large': {'url': url, 'width': clip['width'], 'height': clip['height'], 'size': clip['size']}},
+        })
+    return hits
+
+class SyntheticSearchResponse:
+    """Just enough of requests.Response for search_videos."""
+
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+def synthetic_search(hits):
+    """Returns a stand-in for requests.get that pages through `hits` in rotation."""
+    calls = itertools.count()
+    lock = threading.Lock()
+
+    def get(url, params=None, **kwargs):
+        per_page = int(params.get('per_page', config.PIXABAY_PER_PAGE))
+        with lock:
+            offset = (next(calls) * per_page) % len(hits)
+        window = (hits[offset:] + hits[:offset])[:per_page]
+        return SyntheticSearchResponse({'total': len(hits), 'totalHits': len(hits), 'hits': window})
+    return get
+
+class SineTTSEngine(LocalTTSEngine):
+    """Offline stand-in for TTS: a sine tone as long as the text would take to read."""
+
+    name = 'benchmark_sine'
+
+    def render_wav(self, text, wav_path):
+        duration = max(1.0, len(text.split()) * NARRATION_SECONDS_PER_WORD / self.speed)
+        run_ffmpeg(['-f', 'lavfi', '-i', f"sine=frequency=440:sample_rate={config.TTS_SAMPLE_RATE}:duration={duration}", wav_path])
+
+TTS_ENGINES[SineTTSEngine.name] = SineTTSEngine
+
+class PhaseMetrics:
+    """
+    Phase listener for run_job that records wall time, CPU time and peak RSS
+    per phase. RSS is sampled on a background thread, since a phase's peak
+    usually happens in the middle of it.
+    """
+
+    def __init__(self, sample_interval=0.05):
+        self.phases = []
+        self.sample_interval = sample_interval
+        self._current = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            rss = _current_rss_bytes() or 0
+            with self._lock:
+                if self._current is not None:
+                    self._current['peak_rss_bytes'] = max(self._current['peak_rss_bytes'], rss)
+
+    def start_phase(self, name):
+        self.stop_phase()
+        rss = _current_rss_bytes() or 0
+        with self._lock:
+            self._current = {
+                'name': name,
+                'wall_start': time.perf_counter(),
+                'cpu_start': time.process_time(),
+                'rss_start_bytes': rss,
+                'peak_rss_bytes': rss,
+            }
+
+    def stop_phase(self):
+        with self._lock:
+            phase, self._current = self._current, None
+        if phase is None:
+            return
+        rss = _current_rss_bytes() or 0
+        self.phases.append({
+            'name': phase['name'],
+            'wall_seconds': time.perf_counter() - phase['wall_start'],
+            'cpu_seconds': time.process_time() - phase['cpu_start'],
+            'rss_start_mb': phase['rss_start_bytes'] / (1024 * 1024),
+            'peak_rss_mb': max(phase['peak_rss_bytes'], rss) / (1024 * 1024),
+        })
+
+    def wrap_stages(self, stages):
+        return stages
+
+    def finish(self):
+        self.stop_phase()
+        self._stop.set()
+        self._sampler.join()
+
+def run_benchmark(num_scenes, work_dir, clips, extra_args=()):
+    """Runs main.py's phases over a synthetic script of `num_scenes` scenes and returns its metrics."""
+    run_dir = os.path.join(work_dir, f"scenes_{num_scenes}")
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(run_dir)
+    script_path = os.path.join(run_dir, "script.txt")
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(generate_script(num_scenes, seed=num_scenes))
+
+    clip_cache = ClipCache(os.path.join(run_dir, "clip_cache"))
+    # Twice as many clip ids as scenes, so scenes never run out of unclaimed clips
+    hits = seed_clip_cache(clip_cache, clips, num_ids=2 * num_scenes)
+
+    args = build_parser().parse_args([
+        "--script_path", script_path,
+        "--output_dir", os.path.join(run_dir, "output"),
+        "--api_key", "benchmark",
+        "--clip_cache_dir", clip_cache.root,
+        "--search_cache_path", os.path.join(run_dir, "search_cache.sqlite3"),
+        "--rate_limit", "1000000",
+        "--tts_engine", SineTTSEngine.name,
+        "--narration_cache_dir", os.path.join(run_dir, "narration_cache"),
+        "--duration_history", os.path.join(run_dir, "narration_durations.jsonl"),
+    ] + list(extra_args))
+
+    metrics = PhaseMetrics()
+    started = time.perf_counter()
+    with mock.patch('assets.video.requests.get', side_effect=synthetic_search(hits)):
+        result = run_job(args, profiler=metrics)
+    total_seconds = time.perf_counter() - started
+
+    return {
+        'scenes': num_scenes,
+        'ok': bool(result and result.get('ok')),
+        'total_wall_seconds': total_seconds,
+        'scenes_per_second': num_scenes / total_seconds if total_seconds > 0 else 0.0,
+        'phases': metrics.phases,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results):
+    for run in results['runs']:
+        print(f"\n{run['scenes']} scenes: {run['total_wall_seconds']:.1f}s ({run['scenes_per_second']:.2f} scenes/s){'' if run['ok'] else ' FAILED'}")
+        print(f"  {'phase':<34} {'wall (s)':>10} {'cpu (s)':>10} {'peak RSS (MB)':>14}")
+        for phase in run['phases']:
+            print(f"  {phase['name']:<34} {phase['wall_seconds']:>10.2f} {phase['cpu_seconds']:>10.2f} {phase['peak_rss_mb']:>14.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run main.py end to end on synthetic scripts and media, offline.")
+    parser.add_argument("--scenes", type=int, nargs='+', default=[10, 100, 1000], help="Scene counts of the synthetic scripts.")
+    parser.add_argument("--work_dir", help="Where scripts, clips and outputs are generated (a temporary directory by default).")
+    parser.add_argument("--output", default="e2e_results.json", help="JSON file the results are written to.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated work directory.")
+    parser.add_argument("pipeline_args", nargs=argparse.REMAINDER, help="Extra main.py flags after '--', e.g. -- --stage_workers render=4")
+    args = parser.parse_args()
+    extra_args = [arg for arg in args.pipeline_args if arg != '--']
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="e2e_benchmark_")
+    try:
+        print(f"Generating synthetic source clips in {work_dir}")
+        clips = generate_source_clips(os.path.join(work_dir, "source_clips"))
+        results = {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pipeline_args': extra_args,
+            'runs': [run_benchmark(num_scenes, work_dir, clips, extra_args) for num_scenes in args.scenes],
+        }
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+    print_results(results)
+    print(f"\nResults saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
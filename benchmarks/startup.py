@@ -0,0 +1,110 @@
+# benchmarks/startup.py
+"""
+Startup benchmark for the CLI entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`,
+reports the slowest modules and fails when an entry point exceeds its budget
+in startup_budget.json or pulls in a heavy dependency at import time.
+
+    python benchmarks/startup.py [--budget FILE] [--top N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARK_DIR, '..', 'src')
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output into {module: (self_us, cumulative_us)}.
+    Lines look like `import time:   self [us] | cumulative | imported package`.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue # The header line
+        timings[fields[2].strip()] = (self_us, cumulative_us)
+    return timings
+
+def measure_entry_point(module_name):
+    """Imports `module_name` in a fresh interpreter and returns its importtime timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module_name} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+def top_level_package(module_name):
+    return module_name.split('.', 1)[0]
+
+def benchmark(budget, top=10):
+    """Measures every entry point in `budget` and returns a report dict."""
+    runs = budget.get('runs', 5)
+    forbidden = set(budget.get('forbidden_modules', []))
+    report = {'entry_points': {}, 'passed': True}
+
+    for module_name, budget_ms in budget['entry_points'].items():
+        samples = [measure_entry_point(module_name) for _ in range(runs)]
+        totals_ms = [timings[module_name][1] / 1000 for timings in samples]
+        median_ms = statistics.median(totals_ms)
+
+        # Per-module cost as the median cumulative time across runs
+        modules = {}
+        for timings in samples:
+            for name, (_, cumulative_us) in timings.items():
+                modules.setdefault(name, []).append(cumulative_us / 1000)
+        slowest = sorted(((statistics.median(values), name) for name, values in modules.items() if name != module_name), reverse=True)[:top]
+
+        heavy = sorted({top_level_package(name) for name in samples[0]} & forbidden)
+        passed = median_ms <= budget_ms and not heavy
+        report['passed'] &= passed
+        report['entry_points'][module_name] = {
+            'median_ms': median_ms,
+            'budget_ms': budget_ms,
+            'forbidden_imports': heavy,
+            'slowest_modules': [{'module': name, 'cumulative_ms': ms} for ms, name in slowest],
+            'passed': passed,
+        }
+    return report
+
+def print_report(report):
+    for module_name, entry in report['entry_points'].items():
+        status = "ok" if entry['passed'] else "OVER BUDGET"
+        print(f"{module_name}: {entry['median_ms']:.1f} ms (budget {entry['budget_ms']} ms) {status}")
+        if entry['forbidden_imports']:
+            print(f"  imports heavy dependencies at startup: {', '.join(entry['forbidden_imports'])}")
+        for module in entry['slowest_modules']:
+            print(f"  {module['cumulative_ms']:8.1f} ms  {module['module']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI import time against the startup budget.")
+    parser.add_argument("--budget", default=os.path.join(BENCHMARK_DIR, "startup_budget.json"), help="Budget file with per-entry-point limits in milliseconds.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules listed per entry point.")
+    parser.add_argument("--json", help="Also write the report to this JSON file.")
+    args = parser.parse_args()
+
+    with open(args.budget, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+    report = benchmark(budget, top=args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+    sys.exit(0 if report['passed'] else 1)
+
+if __name__ == "__main__":
+    main()
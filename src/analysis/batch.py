@@ -0,0 +1,72 @@
+# src/analysis/batch.py
+
+import re
+
+from analysis.entities import check_spelling, identify_entities
+from analysis.sentiment import analyze_sentiment
+from analysis.emotion import analyze_emotion_batch
+from analysis.pragmatics import analyze_pragmatics
+import config
+
+# Splits after a paragraph break, keeping the newlines with the preceding paragraph
+PARAGRAPH_BREAK = re.compile(r'(?<=\n\n)(?!\n)')
+
+def parse_script(text, nlp, batch_size=config.NLP_BATCH_SIZE, n_process=config.NLP_N_PROCESS):
+    """
+    Parses a whole script into one Doc. With more than one process, the
+    script's paragraphs are parsed in parallel via `nlp.pipe` and joined back
+    into a single Doc with exactly the original text. Scenes never span a
+    paragraph break, so the joined Doc segments into the same scenes.
+    """
+    paragraphs = [paragraph for paragraph in PARAGRAPH_BREAK.split(text) if paragraph]
+    if n_process == 1 or len(paragraphs) < 2:
+        return nlp(text)
+    from spacy.tokens import Doc
+    docs = list(nlp.pipe(paragraphs, batch_size=batch_size, n_process=n_process))
+    return Doc.from_docs(docs, ensure_whitespace=False)
+
+def parse_scenes(scenes_dict, nlp, batch_size=config.NLP_BATCH_SIZE, n_process=config.NLP_N_PROCESS):
+    """
+    Parses all scene texts with `nlp.pipe`, batching and fanning out over
+    `n_process` worker processes. Returns a dict mapping scene keys to Docs.
+    """
+    scene_keys = list(scenes_dict.keys())
+    docs = nlp.pipe(
+        (scenes_dict[scene_key] for scene_key in scene_keys),
+        batch_size=batch_size,
+        n_process=n_process
+    )
+    return dict(zip(scene_keys, docs))
+
+def analyze_scenes(scenes_dict, nlp, batch_size=config.NLP_BATCH_SIZE, n_process=config.NLP_N_PROCESS, docs=None,
+                   emotion_batch_size=config.EMOTION_BATCH_SIZE):
+    """
+    Runs the full per-scene analysis for every scene in `scenes_dict`.
+    Scene texts are parsed in batches via `nlp.pipe` unless already parsed
+    Docs/Spans are supplied through `docs` (e.g. AnalyzedScript.scenes).
+    Emotion inference runs as length-bucketed transformer batches.
+    Returns the `consolidated_analysis` structure used by main.py.
+    """
+    if docs is None:
+        docs = parse_scenes(scenes_dict, nlp, batch_size=batch_size, n_process=n_process)
+
+    emotions = dict(zip(
+        scenes_dict.keys(),
+        analyze_emotion_batch(scenes_dict.values(), config.EMOTION_MODEL, batch_size=emotion_batch_size)
+    ))
+
+    consolidated_analysis = {}
+    for scene_key, scene_text in scenes_dict.items():
+        print(f"Analyzing scene: {scene_key}")
+        scene_doc = docs[scene_key]
+        consolidated_analysis[scene_key] = {
+            'scene_text': scene_text,
+            'analysis': {
+                'spell_check': check_spelling(scene_text),
+                'sentiment': analyze_sentiment(scene_text),
+                'emotion': emotions[scene_key],
+                'pragmatics': analyze_pragmatics(scene_doc),
+                'entities': identify_entities(scene_doc)
+            }
+        }
+    return consolidated_analysis
@@ -1,19 +1,54 @@
 # src/analysis/emotion.py
 
-from transformers import pipeline
+import config
+from utils.model_registry import model_registry
+from utils.tracing import tracer
 
-emotion_analyzer = None
+def _get_emotion_analyzer(model_name):
+    """Returns the shared Hugging Face pipeline for `model_name` from the model registry."""
+    return model_registry.get('emotion', model_name)
 
 def analyze_emotion(text, model_name):
     """
     Analyzes the emotion of the text using a Hugging Face transformer model.
     """
-    global emotion_analyzer
     try:
-        if emotion_analyzer is None:
-            emotion_analyzer = pipeline("sentiment-analysis", model=model_name, truncation=True, max_length=512)
-        emotion_scores = emotion_analyzer(text)[0]
+        emotion_scores = _get_emotion_analyzer(model_name)(text)[0]
         return emotion_scores
     except Exception as e:
         print(f"Error during emotion analysis: {e}")
         return {}
+
+def analyze_emotion_batch(texts, model_name, batch_size=config.EMOTION_BATCH_SIZE):
+    """
+    Analyzes the emotion of many texts with batched forward passes.
+    Inputs are sorted by token length and split into buckets of `batch_size`,
+    so each batch is only padded to the longest text in its own bucket.
+    Returns one result per input, in the original order; a text whose
+    analysis fails gets {}.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    try:
+        analyzer = _get_emotion_analyzer(model_name)
+        token_ids = analyzer.tokenizer(texts, truncation=True, max_length=512)['input_ids']
+    except Exception as e:
+        print(f"Error during batched emotion analysis: {e}")
+        return [{} for _ in texts]
+    order = sorted(range(len(texts)), key=lambda index: len(token_ids[index]))
+
+    results = [{} for _ in texts]
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        try:
+            with tracer.span("emotion_batch", cat="inference", texts=len(bucket)):
+                bucket_scores = analyzer([texts[index] for index in bucket], batch_size=len(bucket))
+        except Exception as e:
+            # Retry the bucket one text at a time, so a failure only affects its own scene
+            print(f"Error during batched emotion analysis, analyzing {len(bucket)} texts one by one: {e}")
+            bucket_scores = [analyze_emotion(texts[index], model_name) for index in bucket]
+        for index, emotion_scores in zip(bucket, bucket_scores):
+            results[index] = emotion_scores
+    return results
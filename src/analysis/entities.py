@@ -1,8 +1,8 @@
 # src/analysis/entities.py
 
-from spellchecker import SpellChecker
-import spacy
 import config # Import config
+from utils.nlp_helpers import as_doc
+from utils.model_registry import model_registry
 
 def extract_text(script, word_count):
     """Extracts the first `word_count` words from the script."""
@@ -12,13 +12,28 @@ def extract_text(script, word_count):
 
 def check_spelling(text):
     """Checks the spelling of the text and returns a list of misspelled words."""
-    spell = SpellChecker()
+    spell = model_registry.get('spellchecker')
     misspelled = spell.unknown(text.split())
     return list(misspelled)
 
-def identify_entities(text, nlp):
-    """Identifies nouns, adverbs, and verbs in the text."""
-    doc = nlp(text)
+def check_profanity(text):
+    """
+    Checks the text for profanity using profanity-check.
+    Returns True or False, or None if the profanity model is unavailable.
+    """
+    try:
+        profanity_checker = model_registry.get('profanity')
+    except ImportError as e:
+        print(f"Profanity check unavailable: {e}")
+        return None
+    return bool(profanity_checker.predict([text])[0])
+
+def identify_entities(text_or_doc, nlp=None):
+    """
+    Identifies nouns, adverbs, and verbs in the text.
+    Accepts raw text (parsed with `nlp`) or an already parsed Doc/Span.
+    """
+    doc = as_doc(text_or_doc, nlp)
     entities = {
         'nouns': [],
         'adverbs': [],
@@ -71,36 +86,67 @@ def identify_entities(text, nlp):
 #             
 #     return scenes_dict
 
-def segment_text_into_scenes(text, nlp):
+def _group_sentences_into_scenes(doc):
     """
-    Segments the text into meaningful chunks (scenes) using spaCy,
-    based on sentence and paragraph breaks.
+    Groups the sentences of a parsed Doc into scenes, based on paragraph
+    breaks and the maximum number of sentences per scene.
+    Returns a list of sentence lists, one per scene.
     """
-    doc = nlp(text)
-    scenes_dict = {}
+    scenes = []
     current_scene_sentences = []
-    scene_counter = 0
 
-    # Group sentences into scenes
     for sent in doc.sents:
-        current_scene_sentences.append(sent.text.strip())
+        current_scene_sentences.append(sent)
 
         # Check for paragraph breaks (two consecutive newlines) or max sentences
         if (sent.text.endswith('\n\n') or
             len(current_scene_sentences) >= config.MAX_SENTENCES_PER_SCENE):
-            
-            if current_scene_sentences: # Ensure scene is not empty
-                scene_counter += 1
-                scene_key = f"S{scene_counter}"
-                scenes_dict[scene_key] = " ".join(current_scene_sentences)
-                current_scene_sentences = [] # Reset for next scene
+            scenes.append(current_scene_sentences)
+            current_scene_sentences = [] # Reset for next scene
 
     # Add any remaining sentences as the last scene
     if current_scene_sentences:
-        scene_counter += 1
-        scene_key = f"S{scene_counter}"
-        scenes_dict[scene_key] = " ".join(current_scene_sentences)
+        scenes.append(current_scene_sentences)
+
+    return scenes
 
+def segment_doc_into_scenes(doc):
+    """
+    Segments a parsed Doc into scenes.
+    Returns a dict mapping scene keys (S1, S2, ...) to Span views over `doc`.
+    """
+    scenes_dict = {}
+    for scene_counter, sentences in enumerate(_group_sentences_into_scenes(doc), start=1):
+        scenes_dict[f"S{scene_counter}"] = doc[sentences[0].start:sentences[-1].end]
     return scenes_dict
 
+def segment_text_into_scenes(text_or_doc, nlp=None):
+    """
+    Segments the text into meaningful chunks (scenes) using spaCy,
+    based on sentence and paragraph breaks.
+    Accepts raw text (parsed with `nlp`) or an already parsed Doc.
+    """
+    doc = as_doc(text_or_doc, nlp)
+    scenes_dict = {}
+    for scene_counter, sentences in enumerate(_group_sentences_into_scenes(doc), start=1):
+        scenes_dict[f"S{scene_counter}"] = " ".join(sent.text.strip() for sent in sentences)
+    return scenes_dict
 
+def extract_overall_settings(text_or_doc, nlp=None):
+    """
+    Scans the script for location and atmosphere keywords from config.SETTINGS_KEYWORDS.
+    Accepts raw text (parsed with `nlp`) or an already parsed Doc/Span.
+    """
+    doc = as_doc(text_or_doc, nlp)
+    overall_settings = {
+        'locations': [],
+        'atmosphere': []
+    }
+    for token in doc:
+        if token.pos_ in ['NOUN', 'PROPN'] and token.text.lower() in config.SETTINGS_KEYWORDS['locations']:
+            if token.text not in overall_settings['locations']:
+                overall_settings['locations'].append(token.text)
+        if token.text.lower() in config.SETTINGS_KEYWORDS['atmosphere']:
+            if token.text not in overall_settings['atmosphere']:
+                overall_settings['atmosphere'].append(token.text)
+    return overall_settings
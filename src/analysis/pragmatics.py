@@ -1,10 +1,13 @@
 # src/analysis/pragmatics.py
 
-def analyze_pragmatics(text, nlp):
+from utils.nlp_helpers import as_doc
+
+def analyze_pragmatics(text_or_doc, nlp=None):
     """
     Performs pragmatic analysis on the text to identify sentence types and conjunctions.
+    Accepts raw text (parsed with `nlp`) or an already parsed Doc/Span.
     """
-    doc = nlp(text)
+    doc = as_doc(text_or_doc, nlp)
     sentence_types = {}
     conjunctions = []
 
@@ -0,0 +1,33 @@
+# src/analysis/script.py
+
+from analysis.batch import parse_script
+from analysis.entities import segment_doc_into_scenes, extract_overall_settings
+import config
+
+class AnalyzedScript:
+    """
+    A script parsed with spaCy exactly once, over `n_process` processes.
+    Each scene is exposed as a Span view over the shared Doc, so downstream
+    analyses (entities, pragmatics, settings) never re-tokenize the text.
+    """
+
+    def __init__(self, text, nlp, batch_size=config.NLP_BATCH_SIZE, n_process=config.NLP_N_PROCESS):
+        self.text = text
+        self.doc = parse_script(text, nlp, batch_size=batch_size, n_process=n_process)
+        self.scenes = segment_doc_into_scenes(self.doc)
+        self._overall_settings = None
+
+    @property
+    def scene_texts(self):
+        """Returns a dict mapping scene keys to the scene narrative text."""
+        return {
+            scene_key: " ".join(sent.text.strip() for sent in span.sents)
+            for scene_key, span in self.scenes.items()
+        }
+
+    @property
+    def overall_settings(self):
+        """Returns the location and atmosphere keywords found across the whole script."""
+        if self._overall_settings is None:
+            self._overall_settings = extract_overall_settings(self.doc)
+        return self._overall_settings
@@ -1,20 +1,15 @@
 # src/analysis/sentiment.py
 
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-import nltk
+from utils.model_registry import model_registry
 
 def analyze_sentiment(text):
     """
     Analyzes the sentiment of the text using VADER.
-    Downloads 'vader_lexicon' if not already present.
+    The analyzer is loaded once through the model registry, which downloads
+    'vader_lexicon' if not already present.
     """
-    try:
-        analyzer = SentimentIntensityAnalyzer()
-    except LookupError:
-        print("Downloading vader_lexicon for sentiment analysis...")
-        nltk.download('vader_lexicon')
-        analyzer = SentimentIntensityAnalyzer()
-        
+    analyzer = model_registry.get('vader')
+
     scores = analyzer.polarity_scores(text)
     
     if scores['compound'] >= 0.05:
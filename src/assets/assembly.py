@@ -0,0 +1,151 @@
+# src/assets/assembly.py
+
+import os
+import subprocess
+
+from assets.narration import join_narration
+from assets.video import create_final_video, ordered_scene_items
+from utils.ffmpeg import get_ffprobe_exe, run_ffmpeg, probe_streams
+from utils.tracing import tracer
+import config
+
+# Stream properties that must match for the concat demuxer to stream-copy
+CONCAT_STREAM_KEYS = ('codec_name', 'profile', 'width', 'height', 'pix_fmt', 'r_frame_rate', 'time_base')
+
+def _video_signature(path):
+    """Returns the tuple of stream properties relevant to stream-copy concatenation, or None."""
+    probe = probe_streams(path)
+    if not probe:
+        return None
+    video_streams = [stream for stream in probe.get('streams', []) if stream.get('codec_type') == 'video']
+    if len(video_streams) != 1:
+        return None
+    return tuple(video_streams[0].get(key) for key in CONCAT_STREAM_KEYS)
+
+def clips_are_concat_compatible(video_paths):
+    """Checks that every clip has one video stream with identical codec, size, pixel format and frame rate."""
+    signatures = {_video_signature(path) for path in video_paths}
+    return len(signatures) == 1 and None not in signatures
+
+def _escape_concat_path(path):
+    return os.path.abspath(path).replace("'", "'\\''")
+
+def write_concat_list(paths, list_path, outpoints=None):
+    """Writes an ffconcat list file for the concat demuxer, optionally cutting each file at an outpoint in seconds."""
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("ffconcat version 1.0\n")
+        for index, path in enumerate(paths):
+            f.write(f"file '{_escape_concat_path(path)}'\n")
+            if outpoints:
+                f.write(f"outpoint {outpoints[index]:.6f}\n")
+    return list_path
+
+def collect_scene_media(consolidated_data):
+    """
+    Returns (video_paths, audio_paths, durations, frame_counts) for every scene
+    with both an adjusted clip and narration. A frame count is None when the
+    clip's record doesn't say how many frames were rendered.
+    """
+    video_paths, audio_paths, durations, frame_counts = [], [], [], []
+    for scene_key, scene_data in ordered_scene_items(consolidated_data):
+        if scene_key.startswith('S') and 'adjusted_video_info' in scene_data and 'audio_info' in scene_data:
+            adjusted_video_path = scene_data['adjusted_video_info'].get('path')
+            audio_path = scene_data['audio_info'].get('filename')
+            if adjusted_video_path and audio_path and os.path.exists(adjusted_video_path) and os.path.exists(audio_path):
+                video_paths.append(adjusted_video_path)
+                audio_paths.append(audio_path)
+                durations.append(scene_data['adjusted_video_info'].get('duration') or 0)
+                frame_counts.append(scene_data['adjusted_video_info'].get('frames'))
+            else:
+                print(f"Warning: Missing adjusted video or audio for scene {scene_key}. Skipping.")
+    return video_paths, audio_paths, durations, frame_counts
+
+@tracer.traced("assemble_concat", cat="assembly")
+def concat_final_video(video_paths, audio_paths, output_dir, fps=config.TARGET_FPS, frame_counts=None):
+    """
+    Joins conformant scene clips with the concat demuxer using stream copy and
+    muxes the narration in. The video bitstream is never decoded, and the
+    narration (joined by join_narration) is encoded to AAC exactly once.
+    Each clip is cut at its scene's end in the narration timeline, so video
+    and narration stay in sync however many scenes there are.
+    Returns None without writing the video if a clip, per `frame_counts` (the
+    frames rendered per clip), is too short to reach its scene's end, or its
+    frame count is unknown.
+    """
+    video_list_path = os.path.join(output_dir, "final_video_concat.txt")
+    final_video_path = os.path.join(output_dir, config.FINAL_VIDEO_FILE)
+    narration = None
+    try:
+        narration = join_narration(audio_paths, output_dir)
+        scene_frames = narration.scene_frames(fps)
+        for path, needed, rendered in zip(video_paths, scene_frames, frame_counts or [None] * len(video_paths)):
+            if rendered is None or rendered < needed:
+                print(f"Scene clip {path} has {rendered if rendered is not None else 'an unknown number of'} frames, "
+                      f"its scene needs {needed}; it can't be joined with stream copy.")
+                return None
+        # Clips carry spare tail frames and no B-frames, so each cut lands exactly
+        # on a frame; half a frame of slack keeps the last wanted frame in
+        outpoints = [(frames - 0.5) / fps for frames in scene_frames]
+        write_concat_list(video_paths, video_list_path, outpoints)
+        audio_codec = ['-c:a', 'copy'] if narration.codec == 'aac' else ['-c:a', 'aac', '-b:a', config.FINAL_AUDIO_BITRATE]
+        run_ffmpeg([
+            '-f', 'concat', '-safe', '0', '-i', video_list_path,
+            '-i', narration.path,
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-c:v', 'copy',
+        ] + audio_codec + [
+            '-movflags', '+faststart',
+            final_video_path
+        ])
+        return final_video_path
+    finally:
+        if os.path.exists(video_list_path):
+            os.remove(video_list_path)
+        if narration is not None:
+            os.remove(narration.path)
+
+@tracer.traced("final_assembly", cat="assembly")
+def assemble_final_video(consolidated_data, output_dir, mode='auto'):
+    """
+    Creates the final video.
+    'copy' joins the scene clips with stream copy, 'reencode' uses the moviepy
+    path (create_final_video), and 'auto' stream-copies when every clip is
+    compatible and long enough for its scene, and falls back to re-encoding otherwise.
+    Returns the final video path and its duration.
+    """
+    if mode == 'reencode':
+        return create_final_video(consolidated_data, output_dir)
+
+    video_paths, audio_paths, durations, frame_counts = collect_scene_media(consolidated_data)
+    if not video_paths:
+        return None, 0
+
+    if get_ffprobe_exe() is None:
+        if mode == 'copy':
+            print("Error creating final video: ffprobe is not available to verify the scene clips for stream copy.")
+            return None, 0
+        print("ffprobe is not available to verify the scene clips for stream copy; re-encoding final video.")
+        return create_final_video(consolidated_data, output_dir)
+
+    if not clips_are_concat_compatible(video_paths):
+        if mode == 'copy':
+            print("Error creating final video: scene clips are not compatible for stream copy.")
+            return None, 0
+        print("Scene clips differ in codec, resolution or frame rate; re-encoding final video.")
+        return create_final_video(consolidated_data, output_dir)
+
+    try:
+        print(f"\nJoining {len(video_paths)} scene clips with stream copy.")
+        final_video_path = concat_final_video(video_paths, audio_paths, output_dir, frame_counts=frame_counts)
+        if final_video_path is None:
+            if mode == 'copy':
+                print("Error creating final video: scene clips are too short for stream copy.")
+                return None, 0
+            print("Re-encoding final video instead.")
+            return create_final_video(consolidated_data, output_dir)
+        print(f"Saving final video to: {final_video_path}")
+        return final_video_path, sum(durations)
+    except (subprocess.CalledProcessError, OSError) as e:
+        stderr = getattr(e, 'stderr', '') or ''
+        print(f"Error creating final video: {e} {stderr.strip()}")
+        return None, 0
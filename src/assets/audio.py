@@ -1,24 +1,314 @@
 # src/assets/audio.py
 
-from gtts import gTTS
-from mutagen.mp3 import MP3
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
-def generate_audio(scene_key, scene_text, audio_dir):
+from assets.clip_cache import link_or_copy
+from assets.mp3_frames import concat_mp3, mp3_duration
+from utils.ffmpeg import probe_streams, run_ffmpeg
+from utils.tracing import tracer
+import config
+
+# Optional dependencies: only the gTTS engine needs gtts, and durations come from
+# frame counting, with mutagen only as a fallback, so offline hosts can run the local
+# engines. Both are imported on first use, keeping this module cheap for the CLI parser.
+gTTS = None
+MP3 = None
+
+def _load_gtts():
+    """Returns the gTTS class, or None if gtts isn't installed."""
+    global gTTS
+    if gTTS is None:
+        try:
+            from gtts import gTTS as gtts_class
+        except ImportError:
+            return None
+        gTTS = gtts_class
+    return gTTS
+
+def _load_mp3():
+    """Returns mutagen's MP3 class, or None if mutagen isn't installed."""
+    global MP3
+    if MP3 is None:
+        try:
+            from mutagen.mp3 import MP3 as mp3_class
+        except ImportError:
+            return None
+        MP3 = mp3_class
+    return MP3
+
+def audio_duration(audio_filepath):
+    """
+    Returns the duration of an MP3 file in seconds, counting the samples of
+    every frame. Encoder delay and padding are included, as they are in the
+    joined narration track, so clips rendered to this length line up with it.
+    mutagen and ffprobe (which trim them) only cover files that can't be parsed.
+    """
+    try:
+        with open(audio_filepath, 'rb') as f:
+            return mp3_duration(f.read())
+    except (OSError, ValueError):
+        pass # Not parseable as MPEG Layer III
+    mp3_class = _load_mp3()
+    if mp3_class is not None:
+        return mp3_class(audio_filepath).info.length
+    probe = probe_streams(audio_filepath)
+    if probe and probe.get('format', {}).get('duration'):
+        return float(probe['format']['duration'])
+    raise RuntimeError(f"Cannot read the duration of {audio_filepath}: install mutagen or ffprobe")
+
+class TTSEngine:
+    """
+    A text-to-speech backend. `synthesize(text, output_path)` writes MP3
+    narration to `output_path`. `local` engines synthesize on this machine
+    (CPU-bound), the others call a network service. Long texts are split
+    into chunks synthesized concurrently for `chunked` engines.
+    """
+
+    name = None
+    local = False
+    chunked = False
+
+    def __init__(self, voice=None, lang=config.TTS_LANG, speed=config.TTS_SPEED, endpoint=None):
+        self.voice = voice
+        self.lang = lang
+        self.speed = speed
+        self.endpoint = endpoint
+
+    def options(self):
+        """The settings that change the synthesized audio."""
+        return {'engine': self.name, 'voice': self.voice, 'lang': self.lang, 'speed': self.speed}
+
+    def synthesize(self, text, output_path):
+        raise NotImplementedError
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS through gTTS. `voice` selects the accent by Google domain, e.g. 'co.uk'."""
+
+    name = 'gtts'
+    chunked = True # gTTS itself sends one request per ~100 characters, one after another
+
+    def synthesize(self, text, output_path):
+        gtts_class = _load_gtts()
+        if gtts_class is None:
+            raise RuntimeError("The gtts engine requires the gTTS package")
+        kwargs = {'text': text, 'lang': self.lang}
+        if self.voice:
+            kwargs['tld'] = self.voice
+        if self.speed < 1.0:
+            kwargs['slow'] = True # gTTS only has a normal and a slow speed
+        tts = gtts_class(**kwargs)
+        tts.save(output_path)
+
+class LocalTTSEngine(TTSEngine):
+    """An offline engine that renders WAV with a local binary, converted to MP3 with ffmpeg."""
+
+    local = True
+    binaries = ()
+
+    def binary(self):
+        for candidate in self.binaries:
+            path = shutil.which(candidate)
+            if path:
+                return path
+        raise RuntimeError(f"The {self.name} engine requires one of: {', '.join(self.binaries)}")
+
+    def render_wav(self, text, wav_path):
+        raise NotImplementedError
+
+    def synthesize(self, text, output_path):
+        fd, wav_path = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(output_path) or None)
+        os.close(fd)
+        try:
+            self.render_wav(text, wav_path)
+            run_ffmpeg(['-i', wav_path, '-ac', '1', '-ar', str(config.TTS_SAMPLE_RATE),
+                        '-c:a', 'libmp3lame', '-b:a', config.TTS_MP3_BITRATE, output_path])
+        finally:
+            os.remove(wav_path)
+
+class EspeakEngine(LocalTTSEngine):
+    """espeak-ng (or espeak). `voice` is an espeak voice name; it defaults to the language."""
+
+    name = 'espeak'
+    binaries = ('espeak-ng', 'espeak')
+
+    def render_wav(self, text, wav_path):
+        words_per_minute = str(int(config.ESPEAK_WORDS_PER_MINUTE * self.speed))
+        subprocess.run([self.binary(), '-v', self.voice or self.lang, '-s', words_per_minute, '-w', wav_path, '--stdin'],
+                       input=text, text=True, check=True, capture_output=True)
+
+class PiperEngine(LocalTTSEngine):
+    """Piper neural TTS. `voice` is the path of a Piper .onnx voice model."""
+
+    name = 'piper'
+    binaries = ('piper',)
+
+    def render_wav(self, text, wav_path):
+        if not self.voice:
+            raise RuntimeError("The piper engine requires --tts_voice pointing at a .onnx voice model")
+        subprocess.run([self.binary(), '--model', self.voice, '--output_file', wav_path, '--length_scale', str(1.0 / self.speed)],
+                       input=text, text=True, check=True, capture_output=True)
+
+class HTTPTTSEngine(TTSEngine):
+    """
+    A TTS service answering `GET <endpoint>?text=&lang=&voice=&speed=` with MP3
+    audio, e.g. a self-hosted server or devtools/tts_server.py.
+    """
+
+    name = 'http'
+    chunked = True
+
+    def options(self):
+        return dict(super().options(), endpoint=self.endpoint or config.TTS_HTTP_URL)
+
+    def synthesize(self, text, output_path):
+        import urllib.parse
+        import urllib.request
+        endpoint = self.endpoint or config.TTS_HTTP_URL
+        if not endpoint:
+            raise RuntimeError("The http engine requires --tts_endpoint or the TTS_HTTP_URL environment variable")
+        params = {'text': text, 'lang': self.lang, 'speed': self.speed}
+        if self.voice:
+            params['voice'] = self.voice
+        url = f"{endpoint}{'&' if '?' in endpoint else '?'}{urllib.parse.urlencode(params)}"
+        with urllib.request.urlopen(url, timeout=config.TTS_HTTP_TIMEOUT) as response:
+            audio = response.read()
+        with open(output_path, 'wb') as f:
+            f.write(audio)
+
+# Engines selectable with --tts_engine
+TTS_ENGINES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine, PiperEngine, HTTPTTSEngine)}
+
+def get_tts_engine(name=config.TTS_ENGINE, voice=None, lang=config.TTS_LANG, speed=config.TTS_SPEED, endpoint=None):
+    """Returns a TTS engine instance by name. Raises ValueError for an unknown engine."""
+    try:
+        engine_class = TTS_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown TTS engine '{name}', expected one of: {', '.join(sorted(TTS_ENGINES))}")
+    return engine_class(voice=voice, lang=lang, speed=speed, endpoint=endpoint)
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+CLAUSE_BOUNDARY = re.compile(r'(?<=[,;:])\s+|\s+(?=[\u2013\u2014-]\s)')
+
+def _text_pieces(text, max_chars):
+    """Yields the sentences of `text`, split further at clauses and then words until each fits `max_chars`."""
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        if len(sentence) <= max_chars:
+            yield sentence
+            continue
+        for clause in CLAUSE_BOUNDARY.split(sentence):
+            if len(clause) <= max_chars:
+                yield clause
+                continue
+            line = ""
+            for word in clause.split():
+                if line and len(line) + 1 + len(word) > max_chars:
+                    yield line
+                    line = word
+                else:
+                    line = f"{line} {word}" if line else word
+            if line:
+                yield line
+
+def split_for_synthesis(text, max_chars=config.TTS_CHUNK_CHARS):
+    """
+    Splits text into chunks of at most `max_chars` characters at sentence
+    boundaries, falling back to clause boundaries and then word boundaries.
+    Consecutive pieces are packed together while they fit. A single word
+    longer than `max_chars` becomes a chunk of its own.
+    """
+    chunks = []
+    for piece in _text_pieces(' '.join(text.split()), max_chars):
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+_chunk_executor = None
+_chunk_executor_lock = threading.Lock()
+
+def _get_chunk_executor():
+    """The pool chunk requests run on. Separate from the stage pools, whose tts workers wait on it."""
+    global _chunk_executor
+    with _chunk_executor_lock:
+        if _chunk_executor is None:
+            _chunk_executor = ThreadPoolExecutor(max_workers=config.TTS_CHUNK_WORKERS, thread_name_prefix="tts-chunk")
+        return _chunk_executor
+
+def _synthesize_chunk(engine, chunk, chunk_path):
+    with tracer.span("tts_chunk", cat="tts", chars=len(chunk)):
+        engine.synthesize(chunk, chunk_path)
+    with open(chunk_path, 'rb') as f:
+        return f.read()
+
+def synthesize_chunked(engine, text, output_path, max_chars=config.TTS_CHUNK_CHARS):
+    """
+    Synthesizes `text` to `output_path`. For chunked engines, text longer than
+    `max_chars` is split with split_for_synthesis, the chunks are synthesized
+    concurrently, and their MP3 frames are joined in order without decoding.
+    Returns the exact duration of a joined file, or None when it wasn't split.
+    """
+    chunks = split_for_synthesis(text, max_chars) if engine.chunked else [text]
+    if len(chunks) <= 1:
+        engine.synthesize(text, output_path)
+        return None
+
+    chunk_dir = tempfile.mkdtemp(prefix=".chunks-", dir=os.path.dirname(output_path) or None)
+    try:
+        executor = _get_chunk_executor()
+        futures = [executor.submit(_synthesize_chunk, engine, chunk, os.path.join(chunk_dir, f"{index}.mp3"))
+                   for index, chunk in enumerate(chunks)]
+        try:
+            parts = [future.result() for future in futures]
+        finally:
+            # After a failed chunk, drop the queued ones and let running ones finish before cleaning up
+            for future in futures:
+                future.cancel()
+            wait(futures)
+        audio = concat_mp3(parts)
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+    with open(output_path, 'wb') as f:
+        f.write(audio)
+    return mp3_duration(audio)
+
+@tracer.traced("tts", cat="tts")
+def generate_audio(scene_key, scene_text, audio_dir, engine=None, cache=None):
     """
     Generates a text-to-speech audio file for the given scene text.
+    Uses gTTS unless another TTS engine is given. When a NarrationCache is
+    given, previously synthesized narration of the same text and engine
+    settings is hard-linked into place instead.
     Returns the file path and duration of the audio file.
     """
+    engine = engine or GTTSEngine()
     audio_filename = f"{scene_key}.mp3"
     audio_filepath = os.path.join(audio_dir, audio_filename)
 
     try:
-        tts = gTTS(text=scene_text, lang='en')
-        tts.save(audio_filepath)
+        if cache is not None:
+            cached = cache.lookup(scene_text, engine.options())
+            if cached:
+                cached_path, duration = cached
+                try:
+                    link_or_copy(cached_path, audio_filepath)
+                    return audio_filepath, duration
+                except OSError as e:
+                    # Evicted or pruned since the lookup; synthesize it again
+                    print(f"Cached narration for scene {scene_key} is gone ({e}); synthesizing it.")
 
-        audio = MP3(audio_filepath)
-        duration = audio.info.length
+        duration = synthesize_chunked(engine, scene_text, audio_filepath)
+        if duration is None:
+            duration = audio_duration(audio_filepath)
 
+        if cache is not None:
+            cache.store(scene_text, engine.options(), audio_filepath, duration)
         return audio_filepath, duration
     except Exception as e:
         print(f"Error generating audio for scene {scene_key}: {e}")
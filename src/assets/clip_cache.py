@@ -0,0 +1,111 @@
+# src/assets/clip_cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import config
+
+def _file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def link_or_copy(source_path, dest_path):
+    """Hard-links `source_path` to `dest_path`, copying instead when linking is not possible."""
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copy2(source_path, dest_path)
+
+class ClipCache:
+    """
+    Persistent, content-verified cache of downloaded Pixabay clips, shared across runs.
+    Entries are keyed by Pixabay video id and rendition (large, medium, ...).
+    Each clip is stored once with a JSON sidecar recording its size and
+    sha256, and cache hits are hard-linked into the run directory.
+    """
+
+    def __init__(self, root=config.CLIP_CACHE_DIR, verify_hash=False):
+        self.root = root
+        self.verify_hash = verify_hash
+        os.makedirs(os.path.join(self.root, 'tmp'), exist_ok=True)
+
+    def _entry_paths(self, video_id, rendition):
+        key = f"{video_id}_{rendition}"
+        shard_dir = os.path.join(self.root, str(video_id)[-2:].rjust(2, '0'))
+        return os.path.join(shard_dir, f"{key}.mp4"), os.path.join(shard_dir, f"{key}.json")
+
+    def lookup(self, video_id, rendition):
+        """Returns the cached clip path if a valid entry exists, otherwise None."""
+        clip_path, meta_path = self._entry_paths(video_id, rendition)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if os.path.getsize(clip_path) != meta['size']:
+                raise ValueError("size mismatch")
+            if self.verify_hash and _file_sha256(clip_path) != meta['sha256']:
+                raise ValueError("checksum mismatch")
+            return clip_path
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Discarding corrupt cache entry for video {video_id} ({rendition}): {e}")
+            self.invalidate(video_id, rendition)
+            return None
+
+    def store(self, video_id, rendition, source_path, url=None):
+        """Moves a downloaded file into the cache and writes its sidecar. Returns the cached path."""
+        clip_path, meta_path = self._entry_paths(video_id, rendition)
+        os.makedirs(os.path.dirname(clip_path), exist_ok=True)
+        meta = {
+            'video_id': video_id,
+            'rendition': rendition,
+            'url': url,
+            'size': os.path.getsize(source_path),
+            'sha256': _file_sha256(source_path),
+            'stored_at': time.time()
+        }
+        os.replace(source_path, clip_path)
+        meta_tmp_path = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(meta_tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp_path, meta_path)
+        return clip_path
+
+    def invalidate(self, video_id, rendition):
+        for path in self._entry_paths(video_id, rendition):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def fetch(self, video_id, rendition, url, dest_path, downloader, expected_size=None):
+        """
+        Places the clip at `dest_path`, from the cache when possible.
+        On a miss the clip is downloaded into the cache first (and checked
+        against `expected_size` when Pixabay reports one).
+        Returns True if the clip came from the cache, False if it was downloaded.
+        """
+        cached_path = self.lookup(video_id, rendition)
+        if cached_path:
+            link_or_copy(cached_path, dest_path)
+            print(f"Clip cache hit for video {video_id} ({rendition})")
+            return True
+
+        tmp_path = os.path.join(self.root, 'tmp', f"{video_id}_{rendition}.{uuid.uuid4().hex}")
+        try:
+            downloader.download(url, tmp_path)
+            if expected_size and os.path.getsize(tmp_path) != expected_size:
+                raise OSError(f"Downloaded size {os.path.getsize(tmp_path)} does not match expected {expected_size}")
+            cached_path = self.store(video_id, rendition, tmp_path, url=url)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        link_or_copy(cached_path, dest_path)
+        return False
@@ -0,0 +1,113 @@
+# src/assets/downloader.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+def _build_session(pool_size):
+    """Creates a keep-alive Session whose connection pool fits `pool_size` concurrent downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=config.DOWNLOAD_POOL_HOSTS, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class Downloader:
+    """
+    Downloads files over a shared keep-alive Session, so concurrent downloads
+    reuse pooled connections instead of opening a new one per clip.
+    Every completed download records its size, elapsed time and throughput.
+    """
+
+    def __init__(self, max_workers=config.DOWNLOAD_WORKERS, chunk_size=config.DOWNLOAD_CHUNK_SIZE,
+                 timeout=config.DOWNLOAD_TIMEOUT, session=None):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = session or _build_session(max_workers)
+        self.stats = []
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers=None, chunk_size=None):
+        """Changes the worker count (resizing the connection pool) and/or the chunk size."""
+        if chunk_size:
+            self.chunk_size = chunk_size
+        if max_workers and max_workers != self.max_workers:
+            self.max_workers = max_workers
+            self.session.close()
+            self.session = _build_session(max_workers)
+
+    def download(self, url, save_path):
+        """
+        Streams `url` into `save_path` through a temporary '.part' file.
+        Returns the download's stats dict. Raises requests/OS errors to the caller.
+        """
+        partial_path = save_path + '.part'
+        start = time.perf_counter()
+        num_bytes = 0
+        response = self.session.get(url, stream=True, timeout=self.timeout)
+        try:
+            response.raise_for_status()
+            with open(partial_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    num_bytes += len(chunk)
+            os.replace(partial_path, save_path)
+        finally:
+            response.close()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        seconds = time.perf_counter() - start
+        stats = {
+            'url': url,
+            'path': save_path,
+            'bytes': num_bytes,
+            'seconds': seconds,
+            'mb_per_second': (num_bytes / (1024 * 1024)) / seconds if seconds > 0 else 0.0
+        }
+        with self._lock:
+            self.stats.append(stats)
+        print(f"Downloaded {save_path}: {num_bytes / (1024 * 1024):.1f} MB in {seconds:.2f}s ({stats['mb_per_second']:.1f} MB/s)")
+        return stats
+
+    def download_many(self, jobs):
+        """
+        Downloads (url, save_path) pairs on a bounded pool of `max_workers` threads.
+        Returns one stats dict per job, or None for jobs that failed, in job order.
+        """
+        def run(job):
+            url, save_path = job
+            try:
+                return self.download(url, save_path)
+            except (requests.exceptions.RequestException, OSError) as e:
+                print(f"Error downloading video: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download") as executor:
+            return list(executor.map(run, jobs))
+
+    def summary(self):
+        """Returns aggregate download statistics."""
+        with self._lock:
+            stats = list(self.stats)
+        total_bytes = sum(item['bytes'] for item in stats)
+        total_seconds = sum(item['seconds'] for item in stats)
+        return {
+            'downloads': len(stats),
+            'bytes': total_bytes,
+            'seconds': total_seconds,
+            'mean_mb_per_second': (total_bytes / (1024 * 1024)) / total_seconds if total_seconds > 0 else 0.0
+        }
+
+    def close(self):
+        self.session.close()
+
+# Shared by every download in the process so connections are reused
+default_downloader = Downloader()
@@ -0,0 +1,126 @@
+# src/assets/duration_estimator.py
+
+import json
+import os
+import threading
+import uuid
+
+from assets.narration_cache import narration_key, normalize_text
+import config
+
+def calibration_key(options):
+    """Narration durations are calibrated separately per engine, voice, language and speed."""
+    return json.dumps(options, sort_keys=True)
+
+def fit_line(samples):
+    """
+    Least-squares fit of duration = intercept + slope * chars over (chars, duration)
+    samples. Returns (intercept, slope), or None if the samples can't define a line.
+    """
+    count = len(samples)
+    if count < 2:
+        return None
+    mean_chars = sum(chars for chars, _ in samples) / count
+    mean_duration = sum(duration for _, duration in samples) / count
+    variance = sum((chars - mean_chars) ** 2 for chars, _ in samples)
+    if variance == 0:
+        return None
+    covariance = sum((chars - mean_chars) * (duration - mean_duration) for chars, duration in samples)
+    slope = covariance / variance
+    if slope <= 0:
+        return None # Too noisy to trust; longer text is never shorter speech
+    return mean_duration - slope * mean_chars, slope
+
+class DurationEstimator:
+    """
+    Predicts narration durations from text before it is synthesized, so clip
+    search and downloads need not wait for TTS. Each engine and voice is
+    calibrated by a least-squares line over its history of (text length,
+    duration) pairs, kept in an append-only JSONL file shared across runs.
+    Until an engine has enough history, a default speaking rate is used.
+    Only the latest DURATION_HISTORY_SAMPLES per engine and voice are kept:
+    the file is rewritten with just those once it holds twice as many lines.
+    """
+
+    def __init__(self, history_path=config.DURATION_HISTORY_PATH):
+        self.history_path = history_path
+        self._lock = threading.Lock()
+        self._samples = {} # History entries per calibration, oldest first
+        self._keys = set()
+        self._fits = {}
+        self._lines = 0
+        self._load_history()
+        with self._lock:
+            self._compact_if_needed()
+
+    def _load_history(self):
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        self._add(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue # A torn line from an interrupted write
+        except FileNotFoundError:
+            pass
+
+    def _add(self, entry):
+        if entry['key'] in self._keys:
+            return False
+        calibration = calibration_key(entry['options'])
+        entry = {'key': entry['key'], 'options': entry['options'], 'chars': entry['chars'], 'duration': entry['duration']}
+        self._keys.add(entry['key'])
+        samples = self._samples.setdefault(calibration, [])
+        samples.append(entry)
+        for dropped in samples[:-config.DURATION_HISTORY_SAMPLES]: # Calibrate on recent history only
+            self._keys.discard(dropped['key'])
+        del samples[:-config.DURATION_HISTORY_SAMPLES]
+        self._fits.pop(calibration, None)
+        return True
+
+    def _compact_if_needed(self):
+        """Rewrites the history with only the kept samples once it holds twice as many lines. Caller holds `_lock`."""
+        kept = sum(len(samples) for samples in self._samples.values())
+        if self._lines <= 2 * kept:
+            return
+        os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+        tmp_path = f"{self.history_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for samples in self._samples.values():
+                for entry in samples:
+                    f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.history_path)
+        self._lines = kept
+
+    def _fit(self, calibration):
+        with self._lock:
+            if calibration not in self._fits:
+                samples = [(entry['chars'], entry['duration']) for entry in self._samples.get(calibration, [])]
+                self._fits[calibration] = fit_line(samples) if len(samples) >= config.DURATION_MIN_SAMPLES else None
+            return self._fits[calibration]
+
+    def estimate(self, text, options):
+        """Returns the predicted narration duration of `text` in seconds."""
+        chars = len(normalize_text(text))
+        fit = self._fit(calibration_key(options))
+        if fit is None:
+            speed = options.get('speed') or 1.0
+            return chars / (config.NARRATION_CHARS_PER_SECOND * speed)
+        intercept, slope = fit
+        return max(intercept + slope * chars, 0.0)
+
+    def record(self, text, options, duration):
+        """Adds a synthesized narration's real duration to the history. Repeated texts are recorded once."""
+        if not duration:
+            return
+        key = narration_key(text, options)
+        entry = {'key': key, 'options': options, 'chars': len(normalize_text(text)), 'duration': duration}
+        with self._lock:
+            if not self._add(entry):
+                return
+            os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+            with open(self.history_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+            self._lines += 1
+            self._compact_if_needed()
@@ -0,0 +1,137 @@
+# src/assets/mp3_frames.py
+"""
+MPEG audio Layer III frame parsing, for joining MP3 files without decoding.
+
+An MP3 stream is a sequence of self-contained frames, so files with the same
+format can be joined by concatenating their frames. Container metadata has to
+go: ID3v2/ID3v1 tags, and the Xing/Info/VBRI header frame whose frame count
+would describe only the first file.
+"""
+
+# Bitrates in kbps by [MPEG-1?][bitrate index], Layer III
+_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0),
+}
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5) and rate index
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+class MP3Frame:
+    """One frame of an MP3 stream: its byte range in the source and its format."""
+
+    __slots__ = ('start', 'end', 'version', 'sample_rate', 'channels', 'samples')
+
+    def __init__(self, start, end, version, sample_rate, channels, samples):
+        self.start = start
+        self.end = end
+        self.version = version
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.samples = samples
+
+    @property
+    def format(self):
+        """What must match for frames of two files to be concatenated."""
+        return (self.version, self.sample_rate, self.channels)
+
+def _parse_header(data, offset):
+    """Returns the MP3Frame starting at `offset`, or None if there is no valid Layer III header."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None # Reserved version, not Layer III, free-format or bad bitrate, reserved rate
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+    length = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    samples = 1152 if mpeg1 else 576
+    return MP3Frame(offset, offset + length, version, sample_rate, channels, samples)
+
+def _id3v2_size(data, offset):
+    """Size of an ID3v2 tag at `offset` (header, body and footer), or 0 if there is none."""
+    if data[offset:offset + 3] != b'ID3' or offset + 10 > len(data):
+        return 0
+    size = 0
+    for byte in data[offset + 6:offset + 10]:
+        size = (size << 7) | (byte & 0x7F) # Sync-safe integer
+    footer = 10 if data[offset + 5] & 0x10 else 0
+    return 10 + size + footer
+
+def _is_info_frame(data, frame):
+    """True for the Xing/Info (LAME) or VBRI header frame encoders put first."""
+    side_info = (32 if frame.channels == 2 else 17) if frame.version == 3 else (17 if frame.channels == 2 else 9)
+    tag_offset = frame.start + 4 + side_info
+    if data[tag_offset:tag_offset + 4] in (b'Xing', b'Info'):
+        return True
+    return data[frame.start + 36:frame.start + 40] == b'VBRI'
+
+def parse_frames(data):
+    """
+    Returns the audio frames of MP3 `data`, skipping ID3 tags, the Xing/Info
+    header frame and any junk between frames. Raises ValueError when no
+    frames are found or the frames change format midway.
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128 # ID3v1 tag
+    frames = []
+    offset = 0
+    while offset < end:
+        tag_size = _id3v2_size(data, offset)
+        if tag_size:
+            offset += tag_size
+            continue
+        frame = _parse_header(data, offset)
+        if frame is None or frame.end > end:
+            if frame is not None and frames:
+                break # A truncated last frame
+            offset += 1 # Resynchronize on the next header
+            continue
+        # Accept a frame only if the next one follows directly, or it is the last one
+        following = _parse_header(data, frame.end)
+        if following is None and frame.end < end and not data[frame.end:frame.end + 3] in (b'ID3', b'TAG'):
+            offset += 1
+            continue
+        if frames or not _is_info_frame(data, frame):
+            frames.append(frame)
+        offset = frame.end
+    if not frames:
+        raise ValueError("No MP3 frames found")
+    if any(frame.format != frames[0].format for frame in frames):
+        raise ValueError("MP3 frames change format midway")
+    return frames
+
+def frames_duration(frames):
+    """Duration in seconds of parsed frames."""
+    return sum(frame.samples for frame in frames) / frames[0].sample_rate if frames else 0.0
+
+def mp3_duration(data):
+    """Exact duration in seconds of MP3 `data`, from its frame count."""
+    return frames_duration(parse_frames(data))
+
+def concat_mp3(parts):
+    """
+    Joins MP3 byte strings into one MP3 stream by concatenating their audio
+    frames in order. Raises ValueError when the parts' formats differ, since
+    frames of different sample rates or channel counts can't share a stream.
+    """
+    output = bytearray()
+    stream_format = None
+    for data in parts:
+        frames = parse_frames(data)
+        if stream_format is None:
+            stream_format = frames[0].format
+        elif frames[0].format != stream_format:
+            raise ValueError(f"Cannot join MP3 formats {stream_format} and {frames[0].format} without re-encoding")
+        for frame in frames:
+            output += data[frame.start:frame.end]
+    return bytes(output)
@@ -0,0 +1,115 @@
+# src/assets/narration.py
+"""
+Joins per-scene narration into the video's single audio track.
+
+Scene MP3s in one format are joined by concatenating their frames, which
+never decodes audio and gives exact, sample-accurate scene offsets from the
+frame counts. Narration in mixed formats is joined with one ffmpeg encode.
+"""
+
+import os
+
+from assets.mp3_frames import parse_frames
+from utils.ffmpeg import run_ffmpeg
+from utils.tracing import tracer
+import config
+
+class NarrationTrack:
+    """A joined narration file, its codec, each scene's start offset in seconds and the total duration."""
+
+    def __init__(self, path, codec, offsets, duration):
+        self.path = path
+        self.codec = codec
+        self.offsets = offsets
+        self.duration = duration
+
+    def scene_frames(self, fps):
+        """
+        Video frames each scene gets so the clips follow the narration: scene
+        boundaries are snapped to the nearest frame of the narration timeline,
+        so rounding never accumulates into drift across scenes.
+        """
+        boundaries = [round(offset * fps) for offset in self.offsets] + [round(self.duration * fps)]
+        return [end - start for start, end in zip(boundaries, boundaries[1:])]
+
+def concat_narration_frames(audio_paths, output_path):
+    """
+    Joins MP3 files by copying their audio frames into `output_path`, one file
+    in memory at a time. Returns (offsets, duration), or None when a file isn't
+    parseable MP3 or the formats differ (nothing is left at `output_path`).
+    """
+    offsets = []
+    samples = 0
+    stream_format = None
+    with open(output_path, 'wb') as output:
+        for audio_path in audio_paths:
+            with open(audio_path, 'rb') as f:
+                data = f.read()
+            try:
+                frames = parse_frames(data)
+            except ValueError as e:
+                print(f"Narration {audio_path} can't be joined frame by frame: {e}")
+                break
+            if stream_format is None:
+                stream_format = frames[0].format
+            elif frames[0].format != stream_format:
+                print(f"Narration {audio_path} has format {frames[0].format}, expected {stream_format}")
+                break
+            offsets.append(samples / stream_format[1])
+            view = memoryview(data)
+            for frame in frames:
+                output.write(view[frame.start:frame.end])
+            samples += sum(frame.samples for frame in frames)
+        else:
+            return offsets, (samples / stream_format[1] if stream_format else 0.0)
+    os.remove(output_path)
+    return None
+
+def transcode_narration(audio_paths, output_path):
+    """
+    Joins narration in any mix of formats with a single ffmpeg run that
+    resamples every scene to a common format and encodes it once to AAC.
+    Each scene is padded to its counted duration, since ffmpeg's decoder drops
+    the encoder delay and padding that the clips were rendered to include.
+    Returns (offsets, duration) from the scenes' durations.
+    """
+    from assets.audio import audio_duration
+    durations = [audio_duration(audio_path) for audio_path in audio_paths]
+    inputs, labels = [], []
+    for index, (audio_path, duration) in enumerate(zip(audio_paths, durations)):
+        inputs += ['-i', audio_path]
+        labels.append(f"[{index}:a:0]aformat=sample_rates={config.NARRATION_SAMPLE_RATE}:channel_layouts=mono,"
+                      f"apad=whole_dur={duration:.6f},atrim=duration={duration:.6f}[a{index}]")
+    graph = ";".join(labels) + ";" + "".join(f"[a{index}]" for index in range(len(audio_paths)))
+    graph += f"concat=n={len(audio_paths)}:v=0:a=1[narration]"
+    run_ffmpeg(inputs + ['-filter_complex', graph, '-map', '[narration]',
+                         '-c:a', 'aac', '-b:a', config.FINAL_AUDIO_BITRATE, output_path])
+
+    offsets, position = [], 0.0
+    for duration in durations:
+        offsets.append(position)
+        position += duration
+    return offsets, position
+
+@tracer.traced("narration_join", cat="assembly")
+def join_narration(audio_paths, output_dir):
+    """
+    Joins the scenes' narration in order into one file in `output_dir`.
+    Frame-level MP3 concatenation is used when every scene shares a format,
+    otherwise a single transcode to AAC. Returns a NarrationTrack.
+    Raises subprocess.CalledProcessError if the transcode fails.
+    """
+    base_path = os.path.join(output_dir, config.NARRATION_FILE)
+    mp3_path = f"{base_path}.mp3"
+    joined = concat_narration_frames(audio_paths, mp3_path)
+    if joined is not None:
+        return NarrationTrack(mp3_path, 'mp3', *joined)
+
+    print("Scene narration differs in format; joining it with a single transcode.")
+    aac_path = f"{base_path}.m4a"
+    try:
+        return NarrationTrack(aac_path, 'aac', *transcode_narration(audio_paths, aac_path))
+    except BaseException:
+        if os.path.exists(aac_path):
+            os.remove(aac_path) # Don't leave a partial encode behind
+        raise
@@ -0,0 +1,173 @@
+# src/assets/narration_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+import uuid
+
+from assets.clip_cache import link_or_copy
+from assets.mp3_frames import mp3_duration
+import config
+
+def normalize_text(text):
+    """Unicode-normalizes the text and collapses whitespace, which doesn't change the speech."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+def narration_key(text, options):
+    """Cache key of a narration: the normalized text plus the engine, voice, language and speed."""
+    serialized = json.dumps({'text': normalize_text(text), 'options': options}, sort_keys=True)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+class NarrationCache:
+    """
+    Persistent, content-addressed cache of synthesized narration, shared across
+    runs and scripts so repeated lines (intros, outros, sponsor reads) are
+    synthesized once. Each entry is an MP3 plus its duration. Durations live in
+    an append-only index loaded once, so a hit costs a single stat of the MP3
+    instead of a TTS round trip and an MP3 parse.
+
+    The cache is capped at `max_bytes` of MP3s: storing beyond it evicts the
+    least recently used entries, and prune() trims it on demand. Recency is
+    tracked in memory and persisted whenever the index is compacted.
+    """
+
+    def __init__(self, root=config.NARRATION_CACHE_DIR, max_bytes=config.NARRATION_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        self._index = {} # Least recently used first
+        self._total_bytes = 0
+        os.makedirs(os.path.join(root, 'tmp'), exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._index.pop(entry['key'], None)
+                        if not entry.get('deleted'):
+                            self._index[entry['key']] = entry
+                    except (ValueError, KeyError):
+                        continue # A torn line from an interrupted write
+        except FileNotFoundError:
+            pass
+        self._total_bytes = sum(entry['size'] for entry in self._index.values())
+
+    def _entry_path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.mp3")
+
+    def _append(self, entry):
+        # Caller holds `_lock`
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _discard(self, key):
+        """Removes an entry and its MP3. Caller holds `_lock`."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry['size']
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _compact(self):
+        """Rewrites the index with only the live entries, in recency order. Caller holds `_lock`."""
+        tmp_path = f"{self.index_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._index.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def _evict(self, max_bytes, keep=None):
+        """Evicts least recently used entries until the cache fits `max_bytes`. Caller holds `_lock`."""
+        evicted = 0
+        for key in list(self._index):
+            if self._total_bytes <= max_bytes:
+                break
+            if key != keep:
+                self._discard(key)
+                evicted += 1
+        if evicted:
+            self._compact()
+        return evicted
+
+    def lookup(self, text, options):
+        """Returns (cached MP3 path, duration) for a valid entry, otherwise None."""
+        key = narration_key(text, options)
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None:
+            return None
+        path = self._entry_path(key)
+        try:
+            if os.stat(path).st_size != entry['size']:
+                raise ValueError("size mismatch")
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Discarding corrupt narration cache entry {key}: {e}")
+            with self._lock:
+                if self._index.get(key) is entry:
+                    self._discard(key)
+                    self._append({'key': key, 'deleted': True})
+            return None
+        if not entry.get('frame_counted'):
+            # Recorded when durations excluded the encoder delay and padding; count the frames once
+            try:
+                with open(path, 'rb') as f:
+                    entry = dict(entry, duration=mp3_duration(f.read()), frame_counted=True)
+            except (OSError, ValueError) as e:
+                print(f"Narration cache entry {key} has no readable duration: {e}")
+                return None
+            with self._lock:
+                if key in self._index:
+                    self._index[key] = entry
+                    self._append(entry)
+        with self._lock:
+            if key in self._index:
+                self._index[key] = self._index.pop(key) # Most recently used
+        return path, entry['duration']
+
+    def store(self, text, options, audio_path, duration):
+        """Files a synthesized MP3 and its duration under the narration's key. Returns the cached path."""
+        key = narration_key(text, options)
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(self.root, 'tmp', f"{key}.{uuid.uuid4().hex}")
+        link_or_copy(audio_path, tmp_path)
+        os.replace(tmp_path, path)
+
+        entry = {'key': key, 'duration': duration, 'size': os.path.getsize(path), 'options': options, 'frame_counted': True}
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous['size']
+            self._index[key] = entry
+            self._total_bytes += entry['size']
+            self._append(entry)
+            if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+                self._evict(self.max_bytes, keep=key)
+        return path
+
+    def prune(self, max_bytes=None):
+        """
+        Evicts least recently used entries until the cache holds at most
+        `max_bytes` (default: the cache's cap; 0 empties it). Returns the
+        number of entries removed.
+        """
+        with self._lock:
+            return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return self._total_bytes
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
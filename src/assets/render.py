@@ -0,0 +1,82 @@
+# src/assets/render.py
+
+import math
+import subprocess
+
+from utils.ffmpeg import run_ffmpeg
+from utils.tracing import tracer
+import config
+
+def build_filter_chain(target_resolution=(1080, 1920), target_fps=30):
+    """
+    Returns the ffmpeg video filter chain that conforms a clip to the target
+    frame: scale to cover, center-crop to the exact size, then resample fps.
+    """
+    width, height = target_resolution
+    return ",".join([
+        f"scale={width}:{height}:force_original_aspect_ratio=increase",
+        f"crop={width}:{height}",
+        f"fps={target_fps}",
+        "setsar=1",
+        "format=yuv420p"
+    ])
+
+def render_frame_count(target_duration, target_fps=30):
+    """
+    Frames rendered for a scene: enough to cover `target_duration` plus
+    RENDER_TAIL_FRAMES, so assembly can cut every clip at the frame nearest
+    its scene's exact end in the narration.
+    """
+    # Round before ceil to avoid floating point issues (e.g. 2.0000000001 frames)
+    return math.ceil(round(target_duration * target_fps, 6)) + config.RENDER_TAIL_FRAMES
+
+def render_timeout(target_duration):
+    """Seconds a scene render may take before it is treated as failed."""
+    return config.RENDER_TIMEOUT_BASE + config.RENDER_TIMEOUT_PER_SECOND * target_duration
+
+def plan_scene_render(input_path, output_path, target_duration, target_resolution=(1080, 1920), target_fps=30):
+    """
+    Builds the ffmpeg arguments that turn a raw download into the scene's
+    final-form clip in a single encode. The source is looped indefinitely on
+    input and the output is cut after render_frame_count() frames, which
+    covers both the trim and the loop case without knowing the source length
+    up front. B-frames are off so decode order matches display order and
+    assembly can drop trailing frames with stream copy.
+    """
+    return [
+        '-stream_loop', '-1',
+        '-i', input_path,
+        '-frames:v', str(render_frame_count(target_duration, target_fps)),
+        '-vf', build_filter_chain(target_resolution, target_fps),
+        '-an',
+        '-c:v', 'libx264',
+        '-bf', '0',
+        '-preset', config.RENDER_PRESET,
+        '-crf', str(config.RENDER_CRF),
+        '-pix_fmt', 'yuv420p',
+        '-video_track_timescale', str(config.RENDER_TIMESCALE),
+        '-movflags', '+faststart',
+        output_path
+    ]
+
+@tracer.traced("render", cat="encode")
+def render_scene_clip(input_path, output_path, target_duration, target_resolution=(1080, 1920), target_fps=30):
+    """
+    Renders the scene clip (scale, crop, fps, trim/loop, duration) from the raw
+    download with one libx264 encode. Returns True on success; a render that
+    outlives render_timeout() is killed and counts as failed.
+    """
+    if not target_duration or target_duration <= 0:
+        print(f"Error rendering {input_path}: invalid target duration {target_duration}")
+        return False
+    try:
+        run_ffmpeg(plan_scene_render(input_path, output_path, target_duration, target_resolution, target_fps),
+                   timeout=render_timeout(target_duration))
+        return True
+    except subprocess.TimeoutExpired:
+        print(f"Error rendering video clip {input_path}: no result after {render_timeout(target_duration):.0f}s")
+        return False
+    except (subprocess.CalledProcessError, OSError) as e:
+        stderr = getattr(e, 'stderr', '') or ''
+        print(f"Error rendering video clip {input_path}: {e} {stderr.strip()}")
+        return False
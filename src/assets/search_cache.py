@@ -0,0 +1,110 @@
+# src/assets/search_cache.py
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+# Parameters that identify a search; the API key is deliberately excluded.
+# 'endpoint' keeps responses of a stand-in server apart from the real API's.
+CACHE_KEY_PARAMS = ('endpoint', 'q', 'orientation', 'safesearch', 'video_type', 'editors_choice', 'per_page', 'order', 'page')
+
+class SearchCache:
+    """
+    Persistent SQLite cache of Pixabay search responses.
+    Entries are keyed by the normalized search parameters, expire after
+    `ttl_seconds` (Pixabay asks clients to cache for 24 hours), and the least
+    recently used entries are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(self, path=config.SEARCH_CACHE_PATH, ttl_seconds=config.SEARCH_CACHE_TTL,
+                 max_entries=config.SEARCH_CACHE_MAX_ENTRIES, clock=time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                " key TEXT PRIMARY KEY,"
+                " params TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed_at)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yields a connection inside a transaction, closing it afterwards (sqlite3's own context manager doesn't)."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def normalize_params(params):
+        """Returns the cache-relevant parameters with the query lower-cased and whitespace collapsed."""
+        normalized = {}
+        for name in CACHE_KEY_PARAMS:
+            value = params.get(name)
+            if name == 'q' and value is not None:
+                value = ' '.join(str(value).lower().split())
+            normalized[name] = None if value is None else str(value)
+        return normalized
+
+    @classmethod
+    def make_key(cls, params):
+        serialized = json.dumps(cls.normalize_params(params), sort_keys=True)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def get(self, params):
+        """Returns the cached response for `params`, or None if missing or expired."""
+        key = self.make_key(params)
+        now = self._clock()
+        with self._lock, self._connect() as connection:
+            row = connection.execute("SELECT response, created_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                connection.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(response)
+
+    def put(self, params, response):
+        """Stores a search response and evicts the least recently used entries beyond `max_entries`."""
+        key = self.make_key(params)
+        now = self._clock()
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO search_cache (key, params, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(self.normalize_params(params), sort_keys=True), json.dumps(response), now, now)
+            )
+            connection.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                " SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def purge_expired(self):
+        """Deletes every expired entry. Returns the number of entries removed."""
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute("DELETE FROM search_cache WHERE created_at < ?", (self._clock() - self.ttl_seconds,))
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._lock, self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
@@ -1,7 +1,12 @@
 import requests
 import os
-import moviepy.editor as mp
-from moviepy.video.io.ffmpeg_tools import ffmpeg_extract_subclip
+from assets.downloader import default_downloader
+from utils.rate_limiter import RateLimiter
+from utils.tracing import tracer
+import config
+
+# Shared by every search so concurrent scenes stay within the Pixabay quota
+pixabay_rate_limiter = RateLimiter(config.PIXABAY_RATE_LIMIT_REQUESTS, config.PIXABAY_RATE_LIMIT_WINDOW)
 
 def generate_queries(scene_analysis, overall_settings):
     """
@@ -66,11 +71,17 @@ def generate_queries(scene_analysis, overall_settings):
 
     return list(dict.fromkeys(sub_queries))
 
-def search_videos(query, api_key, is_g_rated=False, video_type='film', per_page=200, order='latest'):
+def search_videos(query, api_key, is_g_rated=False, video_type='film', per_page=200, order='latest', rate_limiter=None,
+                  page=1, cache=None, endpoint_url=None):
     """
     Searches for vertical videos on Pixabay.
+    When a SearchCache is given, a fresh cached response is returned without
+    calling the API. Requests go through the shared rate limiter, which honours
+    Pixabay's X-RateLimit headers; HTTP 429 responses are retried after the reset.
+    `endpoint_url` overrides config.PIXABAY_API_URL, e.g. to target a local stand-in.
     """
-    endpoint_url = "https://pixabay.com/api/videos/"
+    rate_limiter = rate_limiter or pixabay_rate_limiter
+    endpoint_url = endpoint_url or config.PIXABAY_API_URL
     params = {
         'key': api_key,
         'q': query,
@@ -79,36 +90,72 @@ def search_videos(query, api_key, is_g_rated=False, video_type='film', per_page=
         'video_type': video_type,
         'editors_choice': 'true', # Keep hardcoded for now, will make configurable later
         'per_page': per_page, # Added per_page
-        'order': order # Added order
+        'order': order, # Added order
+        'page': page
     }
 
-    try:
-        response = requests.get(endpoint_url, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error during Pixabay API request: {e}")
-        return None
-
-def download_video(video_url, save_path):
+    with tracer.span("search_videos", cat="network", query=query, page=page) as span:
+        if cache is not None:
+            cached_response = cache.get(dict(params, endpoint=endpoint_url))
+            if cached_response is not None:
+                span['cached'] = True
+                return cached_response
+
+        try:
+            for attempt in range(config.PIXABAY_MAX_RETRIES + 1):
+                with tracer.span("rate_limit_wait", cat="network"):
+                    rate_limiter.acquire()
+                response = requests.get(endpoint_url, params=params)
+                rate_limiter.update_from_headers(response.headers)
+                if response.status_code != 429 or attempt == config.PIXABAY_MAX_RETRIES:
+                    break
+                retry_after = _retry_after_seconds(response.headers)
+                print(f"Pixabay rate limit reached, retrying in {retry_after:.0f}s")
+                rate_limiter.block_for(retry_after)
+            response.raise_for_status()
+            results = response.json()
+            if cache is not None:
+                cache.put(dict(params, endpoint=endpoint_url), results)
+            return results
+        except requests.exceptions.RequestException as e:
+            print(f"Error during Pixabay API request: {e}")
+            return None
+
+def _retry_after_seconds(headers, default=config.PIXABAY_RATE_LIMIT_WINDOW):
+    """Returns how long to wait after an HTTP 429, from Retry-After or X-RateLimit-Reset."""
+    for header in ('Retry-After', 'X-RateLimit-Reset'):
+        try:
+            return float(headers[header])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return default
+
+def download_video(video_url, save_path, downloader=None, cache=None, video_id=None, rendition=None, expected_size=None):
     """
     Downloads a video from a URL.
+    Uses the shared pooled downloader unless another one is given. When a
+    ClipCache and the Pixabay video id/rendition are given, the cache is
+    consulted first and hits are hard-linked to `save_path`.
     """
-    try:
-        video_response = requests.get(video_url, stream=True)
-        video_response.raise_for_status()
-        with open(save_path, 'wb') as vf:
-            for chunk in video_response.iter_content(chunk_size=8192):
-                vf.write(chunk)
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading video: {e}")
-        return False
+    downloader = downloader or default_downloader
+    with tracer.span("download_video", cat="network", video_id=video_id, rendition=rendition):
+        try:
+            if cache is not None and video_id is not None:
+                cache.fetch(video_id, rendition, video_url, save_path, downloader, expected_size=expected_size)
+            else:
+                downloader.download(video_url, save_path)
+            return True
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"Error downloading video: {e}")
+            return False
 
+@tracer.traced("standardize", cat="encode")
 def standardize_video_clip(input_path, output_path, target_resolution=(1080, 1920), target_fps=30):
     """
     Standardizes a video clip to a target resolution and frame rate.
     """
+    # moviepy takes seconds to import, so only the moviepy code paths pay for it
+    import moviepy.editor as mp
     clip = None
     try:
         clip = mp.VideoFileClip(input_path)
@@ -129,10 +176,12 @@ def standardize_video_clip(input_path, output_path, target_resolution=(1080, 192
         if clip:
             clip.close()
 
+@tracer.traced("adjust", cat="encode")
 def adjust_video_duration(input_path, output_path, target_duration):
     """
     Adjusts the duration of a video to match the target duration.
     """
+    import moviepy.editor as mp
     original_clip = None
     looped_clip = None
     remaining_clip = None
@@ -178,18 +227,33 @@ def adjust_video_duration(input_path, output_path, target_duration):
         if clip_to_save and clip_to_save != original_clip:
             clip_to_save.close()
 
+def ordered_scene_items(consolidated_data):
+    """Returns the scene items in narrative order (S2 before S10)."""
+    def scene_number(item):
+        try:
+            return int(item[0][1:])
+        except ValueError:
+            return float('inf')
+    return sorted(consolidated_data.items(), key=lambda item: (scene_number(item), item[0]))
+
+@tracer.traced("assemble_reencode", cat="assembly")
 def create_final_video(consolidated_data, output_dir):
     """
     Combines the adjusted video clips and audio files into a final video.
+    The narration is joined into one file first (frame by frame when the
+    scenes share an MP3 format), so moviepy reads a single audio stream.
     """
+    import moviepy.editor as mp
+    from assets.narration import join_narration
     video_clips = []
-    audio_clips = []
+    audio_paths = []
     final_video_clip = None
     final_audio_clip = None
+    narration = None
     
     try:
         # Sort scenes by key to ensure correct order
-        sorted_scenes = sorted(consolidated_data.items(), key=lambda item: item[0])
+        sorted_scenes = ordered_scene_items(consolidated_data)
 
         for scene_key, scene_data in sorted_scenes:
             if scene_key.startswith('S') and 'adjusted_video_info' in scene_data and 'audio_info' in scene_data:
@@ -199,17 +263,21 @@ def create_final_video(consolidated_data, output_dir):
                 if adjusted_video_path and audio_path and os.path.exists(adjusted_video_path) and os.path.exists(audio_path):
                     print(f"Processing scene {scene_key} for final video.")
                     video_clips.append(mp.VideoFileClip(adjusted_video_path))
-                    audio_clips.append(mp.AudioFileClip(audio_path))
+                    audio_paths.append(audio_path)
                 else:
                     print(f"Warning: Missing adjusted video or audio for scene {scene_key}. Skipping.")
 
         if video_clips:
-            final_video_clip = mp.concatenate_videoclips(video_clips)
-            final_audio_clip = mp.concatenate_audioclips(audio_clips)
+            narration = join_narration(audio_paths, output_dir)
+            # Cut each clip at its scene's end in the narration so rounding doesn't drift across scenes
+            scene_clips = [clip.subclip(0, min(frames / config.TARGET_FPS, clip.duration))
+                           for clip, frames in zip(video_clips, narration.scene_frames(config.TARGET_FPS))]
+            final_video_clip = mp.concatenate_videoclips(scene_clips)
+            final_audio_clip = mp.AudioFileClip(narration.path)
             
             final_video_clip = final_video_clip.set_audio(final_audio_clip)
             
-            final_video_path = os.path.join(output_dir, "final_youtube_short.mp4")
+            final_video_path = os.path.join(output_dir, config.FINAL_VIDEO_FILE)
             
             print(f"\nSaving final video to: {final_video_path}")
             final_video_clip.write_videofile(final_video_path, codec='libx264', audio_codec='aac')
@@ -223,9 +291,9 @@ def create_final_video(consolidated_data, output_dir):
     finally:
         for clip in video_clips:
             clip.close()
-        for clip in audio_clips:
-            clip.close()
         if final_video_clip:
             final_video_clip.close()
         if final_audio_clip:
             final_audio_clip.close()
+        if narration is not None and os.path.exists(narration.path):
+            os.remove(narration.path)
@@ -9,17 +9,99 @@ LETTER = "loveletter.txt"
 OUTPUT_DIR = "output"
 CONSOLIDATED_JSON_FILE = "consolidated_analysis_results.json"
 QUERY_LOG_FILE = "QueryLog.json"
+RUN_JOURNAL_FILE = "run_journal.jsonl"
+PROFILE_DIR = "profile"
+SCENE_STORE_DIR = "scene_cache"
 AUDIO_DIR = "audio"
 VIDEO_CLIPS_DIR = "video_clips"
 ADJUSTED_CLIPS_DIR = "adjusted_video_clips"
+FINAL_VIDEO_FILE = "final_youtube_short.mp4"
 
 # NLP Model Names
 SPACY_MODEL = "en_core_web_sm"
 EMOTION_MODEL = "cardiffnlp/twitter-roberta-base-emotion"
 
+# NLP Batch Settings
+NLP_BATCH_SIZE = 64
+NLP_N_PROCESS = 1
+EMOTION_BATCH_SIZE = 16
+
 # Pixabay Settings
+# Search endpoint; point it at devtools/pixabay_server.py for offline runs
+PIXABAY_API_URL = os.environ.get("PIXABAY_API_URL", "https://pixabay.com/api/videos/")
 PIXABAY_PER_PAGE = 200
 PIXABAY_ORDER = "latest"
+# Pixabay allows 100 requests per 60 seconds by default
+PIXABAY_RATE_LIMIT_REQUESTS = 100
+PIXABAY_RATE_LIMIT_WINDOW = 60
+PIXABAY_MAX_RETRIES = 3
+# Search responses are cached on disk; Pixabay asks clients to cache for 24 hours
+SEARCH_CACHE_PATH = os.environ.get("PIXABAY_SEARCH_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "video_creation_cli", "pixabay_search.sqlite3"))
+SEARCH_CACHE_TTL = 24 * 60 * 60
+SEARCH_CACHE_MAX_ENTRIES = 10000
+
+# Download Settings
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024 # 1 MiB
+DOWNLOAD_TIMEOUT = (10, 60) # (connect, read) seconds
+DOWNLOAD_POOL_HOSTS = 4
+CLIP_CACHE_DIR = os.environ.get("PIXABAY_CLIP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "video_creation_cli", "clips"))
+
+# Pipeline Settings (worker threads per scene stage)
+STAGE_WORKERS = {
+    'tts': 4,
+    'search': 4,
+    'download': DOWNLOAD_WORKERS,
+    'render': 2
+}
+MAX_RENDER_ATTEMPTS = 3 # Clips tried per scene when rendering fails
+
+# Batch Settings (scripts processed concurrently over the shared stage pools)
+BATCH_JOBS = 2
+BATCH_REPORT_FILE = "batch_report.json"
+
+# Render Service Settings (local job API of --serve)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_JOBS = 2
+SERVICE_JOBS_DIR = os.path.join(OUTPUT_DIR, "jobs")
+SERVICE_MAX_FINISHED_JOBS = 100 # Older finished jobs are forgotten and their directories removed
+
+# TTS Settings (narration engine; see assets/audio.py for the engines)
+TTS_ENGINE = "gtts"
+TTS_LANG = "en"
+TTS_SPEED = 1.0
+TTS_MP3_BITRATE = "32k" # Local engines encode like gTTS: 24 kHz mono MP3
+TTS_SAMPLE_RATE = 24000
+ESPEAK_WORDS_PER_MINUTE = 175
+TTS_HTTP_URL = os.environ.get("TTS_HTTP_URL") # Endpoint of the 'http' engine
+TTS_HTTP_TIMEOUT = 30
+TTS_CHUNK_CHARS = 100 # gTTS's own request size
+TTS_CHUNK_WORKERS = 8 # Concurrent chunk requests across all scenes
+NARRATION_CACHE_DIR = os.environ.get("NARRATION_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "video_creation_cli", "narration"))
+NARRATION_CACHE_MAX_BYTES = int(os.environ.get("NARRATION_CACHE_MAX_BYTES", 2 * 1024 ** 3)) # LRU-evicted beyond this
+
+# Narration duration estimates, for choosing clips before TTS finishes
+DURATION_HISTORY_PATH = os.environ.get("DURATION_HISTORY_PATH", os.path.join(os.path.expanduser("~"), ".cache", "video_creation_cli", "narration_durations.jsonl"))
+NARRATION_CHARS_PER_SECOND = 14.0 # Speaking rate assumed until an engine and voice have history
+DURATION_MIN_SAMPLES = 5 # History needed before a calibration replaces the default rate
+DURATION_HISTORY_SAMPLES = 500 # Most recent samples per engine and voice used for calibration
+DURATION_TOLERANCE = 1.0 # Seconds the real narration may differ from the estimate before the clip is re-selected
+
+# Render Settings (single-encode scene clips)
+TARGET_RESOLUTION = (1080, 1920)
+TARGET_FPS = 30
+RENDER_PRESET = "veryfast"
+RENDER_CRF = 20
+RENDER_TIMESCALE = 15360
+RENDER_TAIL_FRAMES = 1 # Spare frames per clip, trimmed at assembly to the narration's exact scene boundaries
+# A render is abandoned after RENDER_TIMEOUT_BASE seconds plus this many per second of clip,
+# e.g. a looped source without decodable frames that would never reach its frame count
+RENDER_TIMEOUT_BASE = 60
+RENDER_TIMEOUT_PER_SECOND = 10
+FINAL_AUDIO_BITRATE = "192k"
+NARRATION_FILE = "final_narration" # Joined narration, kept only while the final video is assembled
+NARRATION_SAMPLE_RATE = 24000 # Common rate when scene narration in mixed formats is transcoded
 
 # Script Settings
 TEXT_EXTRACTION_WORD_COUNT = 10000
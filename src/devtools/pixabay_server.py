@@ -0,0 +1,370 @@
+# src/devtools/pixabay_server.py
+"""
+Local stand-in for the Pixabay video API, for offline load and integration tests.
+
+Serves Pixabay-shaped JSON from /api/videos/ and streams the clips of a fixture
+catalog from /videos/<id>/<rendition>.mp4. Latency, rate limiting (with
+X-RateLimit headers), injected 429/5xx errors and truncated video bodies are
+configurable, so retries, pagination and concurrent downloads can be exercised.
+
+    python -m devtools.pixabay_server --fixtures path/to/clips --port 8766
+    python main.py --pixabay_endpoint http://127.0.0.1:8766/api/videos/ ...
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mov')
+RENDITIONS = ('large', 'medium', 'small', 'tiny')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+class FixtureCatalog:
+    """
+    The videos the stand-in serves. Each entry has an `id`, `tags`, `duration`,
+    `width`, `height` and the `path` of the file streamed for every rendition.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: entry['id'])
+        self._by_id = {entry['id']: entry for entry in self.entries}
+
+    @classmethod
+    def from_directory(cls, fixtures_dir):
+        """
+        Loads `catalog.json` from `fixtures_dir` when present (a list of entries
+        whose `file` is relative to the directory); otherwise every video file
+        becomes an entry tagged with the words of its name, e.g.
+        `forest_walk_1080x1920.mp4` -> tags "forest, walk", 1080x1920.
+        """
+        catalog_path = os.path.join(fixtures_dir, "catalog.json")
+        if os.path.exists(catalog_path):
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            for entry in entries:
+                entry['path'] = os.path.join(fixtures_dir, entry.pop('file'))
+                entry.setdefault('duration', 10)
+                entry.setdefault('width', 1080)
+                entry.setdefault('height', 1920)
+            return cls(entries)
+
+        entries = []
+        names = sorted(name for name in os.listdir(fixtures_dir) if name.lower().endswith(VIDEO_EXTENSIONS))
+        for video_id, name in enumerate(names, start=1):
+            stem = os.path.splitext(name)[0]
+            size_match = re.search(r'(\d+)x(\d+)', stem)
+            words = [word for word in re.split(r'[_\-\s]+', re.sub(r'\d+x\d+', '', stem)) if word and not word.isdigit()]
+            entries.append({
+                'id': video_id,
+                'tags': ", ".join(word.lower() for word in words),
+                'duration': 10,
+                'width': int(size_match.group(1)) if size_match else 1080,
+                'height': int(size_match.group(2)) if size_match else 1920,
+                'path': os.path.join(fixtures_dir, name),
+            })
+        return cls(entries)
+
+    def search(self, query):
+        """Entries whose tags contain any word of `query`; every entry for an empty query."""
+        words = query.lower().split()
+        if not words:
+            return list(self.entries)
+        return [entry for entry in self.entries if any(word in entry['tags'] for word in words)]
+
+    def get(self, video_id):
+        return self._by_id.get(video_id)
+
+class PixabayStandIn:
+    """
+    A threaded HTTP server imitating the Pixabay video API.
+
+    `latency` (+ up to `latency_jitter`) seconds delay every response.
+    `rate_limit` requests per `rate_limit_window` seconds are allowed on the API
+    before it answers 429 (0 disables the limit). `error_rate`, `throttle_rate`
+    and `truncate_rate` are the probabilities of an injected `error_status`
+    response, an injected 429, and a video body cut off halfway.
+    `bandwidth` caps each video stream in bytes per second (0 is unlimited).
+    """
+
+    def __init__(self, catalog, host="127.0.0.1", port=0, api_key=None, latency=0.0, latency_jitter=0.0,
+                 rate_limit=0, rate_limit_window=60, error_rate=0.0, error_status=503, throttle_rate=0.0,
+                 truncate_rate=0.0, bandwidth=0, seed=None):
+        self.catalog = catalog
+        self.api_key = api_key
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.truncate_rate = truncate_rate
+        self.bandwidth = bandwidth
+        self.stats = {'api_requests': 0, 'video_requests': 0, 'rate_limited': 0, 'injected_errors': 0,
+                      'truncated': 0, 'bytes_sent': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._thread = None
+
+        handler = type("BoundPixabayHandler", (PixabayHandler,), {'stand_in': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/api/videos/"
+
+    def video_url(self, video_id, rendition):
+        return f"{self.url}/videos/{video_id}/{rendition}.mp4"
+
+    def start(self):
+        """Serves in a background thread and returns self."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="pixabay-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def count(self, stat, amount=1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def chance(self, probability):
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+    def delay(self):
+        if self.latency or self.latency_jitter:
+            with self._lock:
+                jitter = self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+            time.sleep(self.latency + jitter)
+
+    def take_rate_limit_slot(self):
+        """Counts an API request against the window. Returns (allowed, rate-limit headers)."""
+        if not self.rate_limit:
+            return True, {}
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start, self._window_count = now, 0
+            allowed = self._window_count < self.rate_limit
+            if allowed:
+                self._window_count += 1
+            reset = max(0.0, self.rate_limit_window - (now - self._window_start))
+            headers = {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self.rate_limit - self._window_count),
+                'X-RateLimit-Reset': str(int(reset + 0.999)),
+            }
+        return allowed, headers
+
+    def hit(self, entry):
+        """The Pixabay-shaped hit describing a catalog entry."""
+        size = os.path.getsize(entry['path'])
+        return {
+            'id': entry['id'],
+            'pageURL': f"{self.url}/videos/{entry['id']}/",
+            'type': "film",
+            'tags': entry['tags'],
+            'duration': entry['duration'],
+            'videos': {
+                rendition: {
+                    'url': self.video_url(entry['id'], rendition),
+                    'width': entry['width'],
+                    'height': entry['height'],
+                    'size': size,
+                    'thumbnail': "",
+                } for rendition in RENDITIONS
+            },
+            'views': 0,
+            'downloads': 0,
+            'likes': 0,
+            'comments': 0,
+            'user_id': 0,
+            'user': "stand-in",
+            'userImageURL': "",
+        }
+
+class PixabayHandler(BaseHTTPRequestHandler):
+    """Request handler of PixabayStandIn."""
+
+    stand_in = None
+    protocol_version = "HTTP/1.1"
+
+    def _send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error_text(self, status, message, headers=None):
+        # Pixabay answers errors with a plain-text "[ERROR <status>] <message>" body
+        self._send_body(status, f"[ERROR {status}] {message}".encode('utf-8'), "text/plain; charset=utf-8", headers)
+
+    def do_GET(self):
+        stand_in = self.stand_in
+        url = urlparse(self.path)
+        stand_in.delay()
+
+        if url.path.rstrip('/') == '/api/videos':
+            self._search(parse_qs(url.query))
+            return
+        video_match = re.fullmatch(r'/videos/(\d+)/(\w+)\.mp4', url.path)
+        if video_match:
+            self._stream_video(int(video_match.group(1)), video_match.group(2))
+            return
+        if url.path == '/_stats':
+            with stand_in._lock:
+                stats = dict(stand_in.stats)
+            self._send_body(200, json.dumps(stats).encode('utf-8'), "application/json")
+            return
+        self._send_error_text(404, "Not found")
+
+    def _search(self, query):
+        stand_in = self.stand_in
+        stand_in.count('api_requests')
+        allowed, headers = stand_in.take_rate_limit_slot()
+        if not allowed or stand_in.chance(stand_in.throttle_rate):
+            stand_in.count('rate_limited')
+            self._send_error_text(429, "Too Many Requests", dict(headers, **{'Retry-After': headers.get('X-RateLimit-Reset', "1")}))
+            return
+        if stand_in.chance(stand_in.error_rate):
+            stand_in.count('injected_errors')
+            self._send_error_text(stand_in.error_status, "Injected server error", headers)
+            return
+
+        key = query.get('key', [""])[0]
+        if not key or (stand_in.api_key and key != stand_in.api_key):
+            self._send_error_text(400, "Invalid or missing API key", headers)
+            return
+        try:
+            per_page = int(query.get('per_page', ["20"])[0])
+            page = int(query.get('page', ["1"])[0])
+        except ValueError:
+            self._send_error_text(400, "Invalid per_page or page", headers)
+            return
+        if not 3 <= per_page <= 200:
+            self._send_error_text(400, '"per_page" is out of valid range.', headers)
+            return
+
+        matches = stand_in.catalog.search(query.get('q', [""])[0])
+        start = (page - 1) * per_page
+        if page < 1 or (start >= len(matches) and page > 1):
+            self._send_error_text(400, '"page" is out of valid range.', headers)
+            return
+        payload = {
+            'total': len(matches),
+            'totalHits': len(matches),
+            'hits': [stand_in.hit(entry) for entry in matches[start:start + per_page]],
+        }
+        self._send_body(200, json.dumps(payload).encode('utf-8'), "application/json", headers)
+
+    def _stream_video(self, video_id, rendition):
+        stand_in = self.stand_in
+        stand_in.count('video_requests')
+        entry = stand_in.catalog.get(video_id)
+        if entry is None or rendition not in RENDITIONS:
+            self._send_error_text(404, "Video not found")
+            return
+        if stand_in.chance(stand_in.error_rate):
+            stand_in.count('injected_errors')
+            self._send_error_text(stand_in.error_status, "Injected server error")
+            return
+
+        size = os.path.getsize(entry['path'])
+        # A truncated response promises the full length but hangs up halfway
+        limit = size // 2 if stand_in.chance(stand_in.truncate_rate) else size
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+
+        sent = 0
+        started = time.monotonic()
+        with open(entry['path'], 'rb') as f:
+            while sent < limit:
+                chunk = f.read(min(STREAM_CHUNK_SIZE, limit - sent))
+                if not chunk:
+                    break
+                try:
+                    self.wfile.write(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    break
+                sent += len(chunk)
+                if stand_in.bandwidth:
+                    # Sleep until the bytes sent so far fit the bandwidth cap
+                    ahead = sent / stand_in.bandwidth - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        stand_in.count('bytes_sent', sent)
+        if limit < size:
+            stand_in.count('truncated')
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the Pixabay video API from a fixture catalog.")
+    parser.add_argument("--fixtures", required=True, help="Directory of fixture videos, optionally with a catalog.json.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on.")
+    parser.add_argument("--api_key", help="Only accept this API key (any non-empty key is accepted by default).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--latency_jitter", type=float, default=0.0, help="Up to this many extra random seconds per response.")
+    parser.add_argument("--rate_limit", type=int, default=0, help="API requests allowed per window before answering 429 (0 disables).")
+    parser.add_argument("--rate_limit_window", type=float, default=60, help="Length of the rate-limit window in seconds.")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Probability of an injected server error.")
+    parser.add_argument("--error_status", type=int, default=503, help="HTTP status of injected server errors.")
+    parser.add_argument("--throttle_rate", type=float, default=0.0, help="Probability of an injected 429 on the API.")
+    parser.add_argument("--truncate_rate", type=float, default=0.0, help="Probability that a video body is cut off halfway.")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Per-stream bandwidth cap in bytes per second (0 is unlimited).")
+    parser.add_argument("--seed", type=int, help="Seed for the injected faults, for reproducible runs.")
+    args = parser.parse_args()
+
+    catalog = FixtureCatalog.from_directory(args.fixtures)
+    stand_in = PixabayStandIn(
+        catalog, host=args.host, port=args.port, api_key=args.api_key, latency=args.latency,
+        latency_jitter=args.latency_jitter, rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+        error_rate=args.error_rate, error_status=args.error_status, throttle_rate=args.throttle_rate,
+        truncate_rate=args.truncate_rate, bandwidth=args.bandwidth, seed=args.seed
+    )
+    print(f"Serving {len(catalog.entries)} fixture videos at {stand_in.api_url}")
+    print(f"Point the pipeline at it with --pixabay_endpoint {stand_in.api_url} (or PIXABAY_API_URL)")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+
+if __name__ == "__main__":
+    main()
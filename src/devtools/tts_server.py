@@ -0,0 +1,132 @@
+# src/devtools/tts_server.py
+"""
+Local stand-in for an HTTP TTS service, for offline tests of chunked synthesis.
+
+GET /synthesize?text=...&lang=...&voice=...&speed=... answers with a synthetic
+MP3 of silent MPEG-1 Layer III frames (44.1 kHz, 128 kbps, joint stereo) whose
+length follows the text, so durations and frame-level joins can be checked.
+
+    python -m devtools.tts_server --port 8767 --latency 0.2
+    python main.py --tts_engine http --tts_endpoint http://127.0.0.1:8767/synthesize ...
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# MPEG-1 Layer III, no CRC, 128 kbps, 44.1 kHz, no padding, joint stereo
+SILENT_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+SILENT_FRAME_SIZE = 417 # 144 * 128000 // 44100
+SILENT_FRAME = SILENT_FRAME_HEADER + bytes(SILENT_FRAME_SIZE - len(SILENT_FRAME_HEADER))
+SILENT_FRAME_SECONDS = 1152 / 44100
+
+def silent_mp3(seconds):
+    """An MP3 of silent frames lasting at least `seconds` (at least one frame)."""
+    frame_count = max(1, int(seconds / SILENT_FRAME_SECONDS + 0.999999))
+    return SILENT_FRAME * frame_count
+
+class TTSStandIn:
+    """
+    A threaded HTTP server imitating a TTS service. Each request takes
+    `latency` seconds and returns `seconds_per_char` seconds of silence per
+    character (divided by the requested speed). Requests are recorded in
+    `requests` and the peak number served at once in `max_concurrency`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, seconds_per_char=0.06):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.requests = []
+        self.max_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+        handler = type("BoundTTSHandler", (TTSHandler,), {'stand_in': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/synthesize"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="tts-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def synthesize(self, params):
+        with self._lock:
+            self.requests.append(params)
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            speed = float(params.get('speed') or 1.0)
+            return silent_mp3(len(params.get('text', "")) * self.seconds_per_char / speed)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+class TTSHandler(BaseHTTPRequestHandler):
+    """Request handler of TTSStandIn."""
+
+    stand_in = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/synthesize':
+            self._send(404, b"Not found", "text/plain")
+            return
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if not params.get('text', "").strip():
+            self._send(400, b"Missing text", "text/plain")
+            return
+        self._send(200, self.stand_in.synthesize(params), "audio/mpeg")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in TTS service that returns silent MP3 audio.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8767, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds each request takes.")
+    parser.add_argument("--seconds_per_char", type=float, default=0.06, help="Seconds of audio returned per character of text.")
+    args = parser.parse_args()
+
+    stand_in = TTSStandIn(host=args.host, port=args.port, latency=args.latency, seconds_per_char=args.seconds_per_char)
+    print(f"Serving silent TTS audio at {stand_in.url}")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+
+if __name__ == "__main__":
+    main()
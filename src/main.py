@@ -1,27 +1,57 @@
 # src/main.py
 
 import argparse
+import copy
 import os
 import json
-import spacy
-from datetime import datetime
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.file_helpers import read_text_file
-from analysis.entities import extract_text, check_spelling, identify_entities, segment_text_into_scenes
-from analysis.sentiment import analyze_sentiment
-from analysis.emotion import analyze_emotion
-from analysis.pragmatics import analyze_pragmatics
-from assets.audio import generate_audio
-from assets.video import generate_queries, search_videos, download_video, adjust_video_duration, create_final_video, standardize_video_clip
+from analysis.script import AnalyzedScript
+from analysis.batch import analyze_scenes
+from assets.clip_cache import ClipCache
+from assets.search_cache import SearchCache
+from assets.duration_estimator import DurationEstimator
+from assets.narration_cache import NarrationCache
+from pipeline.runner import ScenePipeline, StagePools, parse_stage_workers
+from pipeline.stages import RunContext, build_scene_stages, restore_scene_progress, stage_recorder
+from pipeline.incremental import SceneStore, scene_fingerprints, split_reusable_analysis
+from pipeline.journal import RunJournal, hash_text
+from utils.model_registry import model_registry
+from utils.profiling import PhaseProfiler, NullProfiler
+from utils.tracing import tracer
 import config
 
-def main():
+# The network and video modules (requests, moviepy, gTTS) are imported inside
+# the phases that use them, so --help and analysis-only runs start quickly.
+# benchmarks/startup.py tracks the import cost of this module.
+
+def positive_float(value):
+    """argparse type for options that must be greater than zero."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def stage_worker_spec(value):
+    """argparse type for --stage_workers: checks the 'stage=N,...' spec and returns it unchanged."""
+    try:
+        parse_stage_workers(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+def build_parser():
+    from assets.audio import TTS_ENGINES # Light: the engines import their backends on first use
     parser = argparse.ArgumentParser(description="A CLI tool to process a video script and generate assets.")
-    parser.add_argument("--script_path", required=True, help="The path to the input text file containing the script.")
+    parser.add_argument("--script_path", help="The path to the input text file containing the script.")
     parser.add_argument("--output_dir", default=config.OUTPUT_DIR, help="The path to the directory where the final assets will be saved.")
     parser.add_argument("--api_key", default=config.PIXABAY_API_KEY, help="The Pixabay API key. Can also be set via the PIXABAY_API_KEY environment variable.")
     parser.add_argument("--skip_downloads", action="store_true", help="A flag to run the analysis without downloading videos.")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted run in --output_dir from its run journal, skipping finished work.")
+    parser.add_argument("--full_rebuild", action="store_true", help="Regenerate every scene instead of reusing unchanged scenes from earlier runs in --output_dir.")
     
     # New arguments for Pixabay API filtering
     parser.add_argument("--exclude_ai", action="store_true", help="If set, excludes AI-generated content (note: Pixabay API does not directly support this filter).")
@@ -30,180 +60,322 @@ def main():
     # New arguments for video diversity
     parser.add_argument("--per_page", type=int, default=config.PIXABAY_PER_PAGE, help="Number of results per page from Pixabay.")
     parser.add_argument("--order", default=config.PIXABAY_ORDER, help="Order of results from Pixabay (popular, latest).")
-    
-    args = parser.parse_args()
+    parser.add_argument("--pixabay_endpoint", default=config.PIXABAY_API_URL, help="Pixabay video search endpoint, e.g. a local devtools/pixabay_server.py stand-in. Can also be set via the PIXABAY_API_URL environment variable.")
+    parser.add_argument("--rate_limit", type=int, default=config.PIXABAY_RATE_LIMIT_REQUESTS, help="Maximum Pixabay API requests per rate-limit window.")
+    parser.add_argument("--rate_limit_window", type=float, default=config.PIXABAY_RATE_LIMIT_WINDOW, help="Length of the Pixabay rate-limit window in seconds.")
+    parser.add_argument("--search_cache_path", default=config.SEARCH_CACHE_PATH, help="SQLite file of the persistent Pixabay search-response cache.")
+    parser.add_argument("--search_cache_ttl", type=float, default=config.SEARCH_CACHE_TTL, help="Seconds a cached search response stays valid.")
+    parser.add_argument("--no_search_cache", action="store_true", help="If set, always queries the Pixabay API instead of using the search cache.")
+    # Arguments for batched scene analysis
+    parser.add_argument("--nlp_batch_size", type=int, default=config.NLP_BATCH_SIZE, help="Number of paragraphs per spaCy batch when parsing the script with nlp.pipe.")
+    parser.add_argument("--nlp_processes", type=int, default=config.NLP_N_PROCESS, help="Number of worker processes for spaCy script parsing (-1 uses all cores).")
+    parser.add_argument("--emotion_batch_size", type=int, default=config.EMOTION_BATCH_SIZE, help="Number of scenes per batched forward pass of the emotion model.")
+    # Arguments for pipelined execution
+    parser.add_argument("--stage_workers", type=stage_worker_spec, default="", help="Per-stage worker counts, e.g. 'tts=4,download=8,render=2'. Unlisted stages use config.STAGE_WORKERS.")
+    parser.add_argument("--assembly", choices=['auto', 'copy', 'reencode'], default='auto', help="Final assembly mode: stream-copy conformant scene clips ('copy'), re-encode with moviepy ('reencode'), or pick automatically ('auto').")
+    parser.add_argument("--clip_cache_dir", default=config.CLIP_CACHE_DIR, help="Directory of the persistent Pixabay clip cache shared across runs.")
+    parser.add_argument("--no_clip_cache", action="store_true", help="If set, always downloads clips instead of using the clip cache.")
+    parser.add_argument("--download_chunk_size", type=int, default=config.DOWNLOAD_CHUNK_SIZE, help="Chunk size in bytes for streaming clip downloads.")
+    # Arguments for narration
+    parser.add_argument("--tts_engine", default=config.TTS_ENGINE, choices=sorted(TTS_ENGINES), help="Narration engine: 'gtts' or 'http' (network), or the offline 'espeak' (espeak-ng) and 'piper' engines.")
+    parser.add_argument("--tts_voice", help="Engine-specific voice: a gTTS accent domain (e.g. 'co.uk'), an espeak voice name, or a Piper .onnx model path.")
+    parser.add_argument("--tts_lang", default=config.TTS_LANG, help="Narration language code.")
+    parser.add_argument("--tts_speed", type=positive_float, default=config.TTS_SPEED, help="Narration speed multiplier (gTTS only distinguishes normal and slow).")
+    parser.add_argument("--tts_endpoint", default=config.TTS_HTTP_URL, help="Endpoint of the 'http' TTS engine, e.g. a devtools/tts_server.py stand-in. Can also be set via the TTS_HTTP_URL environment variable.")
+    parser.add_argument("--narration_cache_dir", default=config.NARRATION_CACHE_DIR, help="Directory of the persistent narration cache shared across runs and scripts.")
+    parser.add_argument("--no_narration_cache", action="store_true", help="If set, always synthesizes narration instead of using the narration cache.")
+    parser.add_argument("--duration_history", default=config.DURATION_HISTORY_PATH, help="JSONL history of narration durations per engine and voice, used to estimate scene durations before TTS.")
+    # Arguments for diagnostics
+    parser.add_argument("--profile", action="store_true", help="Profile each phase with cProfile, saving .prof files and a wall/CPU time summary under <output_dir>/profile.")
+    parser.add_argument("--trace", help="Write a Chrome Trace Event timeline of every scene's stages to this JSON file (open in chrome://tracing or Perfetto).")
+    # Arguments for batch mode
+    parser.add_argument("--batch", help="Process every script in this directory, writing each to its own folder under --output_dir.")
+    parser.add_argument("--batch_jobs", type=int, default=config.BATCH_JOBS, help="Number of scripts processed concurrently in --batch mode.")
+    # Arguments for the render service
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived render service that accepts jobs over a local HTTP API.")
+    parser.add_argument("--host", default=config.SERVICE_HOST, help="Address the render service listens on.")
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT, help="Port the render service listens on.")
+    parser.add_argument("--jobs_dir", default=config.SERVICE_JOBS_DIR, help="Directory where the render service keeps each job's script and output.")
+    parser.add_argument("--service_jobs", type=int, default=config.SERVICE_JOBS, help="Number of jobs the render service processes concurrently.")
+    return parser
 
-    if not args.api_key:
-        print("Error: Pixabay API key not found. Please set the PIXABAY_API_KEY environment variable or provide it using the --api_key argument.")
-        return
+def run_job(args, pools=None, analysis_lock=None, profiler=None):
+    """
+    Processes one script end to end and returns a summary of the run.
+    `pools` lets several jobs share the per-stage worker pools; `analysis_lock`
+    serializes model inference across jobs that share the loaded models.
+    `profiler` receives the phase boundaries (see utils/profiling.py); by
+    default it follows the --profile flag.
+    """
+    if profiler is None:
+        profiler = PhaseProfiler(os.path.join(args.output_dir, config.PROFILE_DIR)) if args.profile else NullProfiler()
+    try:
+        return _run_phases(args, pools, analysis_lock, profiler)
+    finally:
+        profiler.finish()
+
+def _run_phases(args, pools, analysis_lock, profiler):
+    started = time.perf_counter()
+    result = {'script_path': args.script_path, 'output_dir': args.output_dir, 'ok': False}
 
     # --- 1. Initialization ---
     print("--- Phase 1: Initialization ---")
+    profiler.start_phase("initialization")
     os.makedirs(args.output_dir, exist_ok=True)
     
     script_text = read_text_file(args.script_path)
     if not script_text:
-        return
-
+        return result
+    from assets.audio import get_tts_engine
     try:
-        nlp = spacy.load(config.SPACY_MODEL)
-    except OSError:
-        print(f"Downloading spaCy model: {config.SPACY_MODEL}")
-        spacy.cli.download(config.SPACY_MODEL)
-        nlp = spacy.load(config.SPACY_MODEL)
+        tts_engine = get_tts_engine(args.tts_engine, voice=args.tts_voice, lang=args.tts_lang, speed=args.tts_speed,
+                                    endpoint=args.tts_endpoint)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return result
+
+    # A resumed run replays the journal of the interrupted one in the same output directory
+    journal = RunJournal(os.path.join(args.output_dir, config.RUN_JOURNAL_FILE))
+    script_hash = hash_text(script_text)
+    progress = journal.load() if args.resume else None
+    if progress and progress['script_hash'] != script_hash:
+        print("The script changed since the journaled run; starting from scratch.")
+        progress = None
+    if not progress:
+        journal.reset()
+        nlp = model_registry.get('spacy', config.SPACY_MODEL)
+    analysis_lock = analysis_lock or threading.Lock()
+    # Results of earlier runs are filed by fingerprint so unchanged scenes are not regenerated
+    store = None if args.full_rebuild else SceneStore(os.path.join(args.output_dir, config.SCENE_STORE_DIR))
 
     # --- 2. Script Analysis ---
     print("\n--- Phase 2: Script Analysis ---")
-    # Removed extracted_text as it's no longer needed for segmentation
-    # extracted_text = extract_text(script_text, config.TEXT_EXTRACTION_WORD_COUNT)
-    
-    # Pass nlp to the new segment_text_into_scenes function
-    scenes_dict = segment_text_into_scenes(script_text, nlp)
+    profiler.start_phase("script_analysis")
+    if progress:
+        print(f"Resuming from journal: {journal.path}")
+        scenes_dict = progress['scenes']
+        overall_settings = progress['overall_settings']
+        consolidated_analysis = progress['consolidated_analysis']
+        fingerprints = {scene_key: scene_fingerprints(scene_text, overall_settings, args) for scene_key, scene_text in scenes_dict.items()}
+    else:
+        # Removed extracted_text as it's no longer needed for segmentation
+        # extracted_text = extract_text(script_text, config.TEXT_EXTRACTION_WORD_COUNT)
+
+        # Parse the script once; scenes are Span views over the shared Doc
+        with analysis_lock, tracer.span("parse_script", cat="analysis"):
+            script = AnalyzedScript(script_text, nlp, batch_size=args.nlp_batch_size, n_process=args.nlp_processes)
+            scenes_dict = script.scene_texts
+            overall_settings = script.overall_settings
+
+        fingerprints = {scene_key: scene_fingerprints(scene_text, overall_settings, args) for scene_key, scene_text in scenes_dict.items()}
+        reused_analysis, pending_scenes = split_reusable_analysis(scenes_dict, fingerprints, store)
+        if reused_analysis:
+            print(f"Reusing analysis for {len(reused_analysis)} unchanged scenes.")
+
+        # Reuse the Span views from the full-script parse, which already ran over the worker processes
+        with analysis_lock, tracer.span("analyze_scenes", cat="analysis", scenes=len(pending_scenes)):
+            analyzed = analyze_scenes(
+                pending_scenes,
+                nlp,
+                docs={scene_key: script.scenes[scene_key] for scene_key in pending_scenes},
+                emotion_batch_size=args.emotion_batch_size
+            ) if pending_scenes else {}
+        if store:
+            for scene_key, scene_data in analyzed.items():
+                # Don't pin a failed emotion inference into the store
+                if scene_data['analysis'].get('emotion'):
+                    store.put('analysis', fingerprints[scene_key]['analysis'], scene_data['analysis'])
+        consolidated_analysis = {scene_key: analyzed.get(scene_key) or reused_analysis[scene_key] for scene_key in scenes_dict}
+        journal.record_analysis(script_hash, scenes_dict, overall_settings, consolidated_analysis)
 
     # Save scenes_dict to scene.json
     scenes_json_path = os.path.join(args.output_dir, config.SCENE_JSON_FILE)
     with open(scenes_json_path, 'w', encoding='utf-8') as f:
         json.dump(scenes_dict, f, indent=4)
     print(f"Scenes saved to: {scenes_json_path}")
-    
-    consolidated_analysis = {}
-    for scene_key, scene_text in scenes_dict.items():
-        print(f"Analyzing scene: {scene_key}")
-        consolidated_analysis[scene_key] = {
-            'scene_text': scene_text,
-            'analysis': {
-                'spell_check': check_spelling(scene_text),
-                'sentiment': analyze_sentiment(scene_text),
-                'emotion': analyze_emotion(scene_text, config.EMOTION_MODEL),
-                'pragmatics': analyze_pragmatics(scene_text, nlp),
-                'entities': identify_entities(scene_text, nlp)
-            }
-        }
-
-    # --- 3. Asset Generation & Retrieval ---
-    print("\n--- Phase 3: Asset Generation & Retrieval ---")
-    audio_dir = os.path.join(args.output_dir, config.AUDIO_DIR)
-    os.makedirs(audio_dir, exist_ok=True)
-    
-    for scene_key, scene_data in consolidated_analysis.items():
-        print(f"Generating audio for scene: {scene_key}")
-        audio_filepath, duration = generate_audio(scene_key, scene_data['scene_text'], audio_dir)
-        consolidated_analysis[scene_key]['audio_info'] = {
-            'filename': audio_filepath,
-            'duration': duration
-        }
 
+    # --- 3-4. Asset Generation, Retrieval & Preparation ---
+    # Scenes flow independently through TTS alongside search -> download, then render,
+    # each stage on its own worker pool, so network waits and encodes overlap across scenes.
+    # Clips are picked by estimated narration durations, so downloads don't wait for TTS.
+    print("\n--- Phase 3-4: Asset Generation, Retrieval & Preparation (pipelined per scene) ---")
+    profiler.start_phase("asset_generation_and_preparation")
+    clip_cache = None if args.no_clip_cache or args.skip_downloads else ClipCache(args.clip_cache_dir)
+    search_cache = None if args.no_search_cache or args.skip_downloads else SearchCache(args.search_cache_path, ttl_seconds=args.search_cache_ttl)
+    narration_cache = None if args.no_narration_cache else NarrationCache(args.narration_cache_dir)
+    context = RunContext(args, consolidated_analysis, overall_settings, clip_cache=clip_cache, search_cache=search_cache,
+                         tts_engine=tts_engine, narration_cache=narration_cache,
+                         duration_estimator=DurationEstimator(args.duration_history))
+    context.estimate_durations(tts_engine.options())
+    os.makedirs(context.audio_dir, exist_ok=True)
     if not args.skip_downloads:
-        video_clips_dir = os.path.join(args.output_dir, config.VIDEO_CLIPS_DIR)
-        os.makedirs(video_clips_dir, exist_ok=True)
-        query_log = []
-        downloaded_video_ids = set() # Set to track downloaded video IDs
-        
-        overall_settings = {
-            'locations': [],
-            'atmosphere': []
-        }
-        # Use script_text for overall settings, not extracted_text
-        doc = nlp(script_text)
-        for token in doc:
-            if token.pos_ in ['NOUN', 'PROPN'] and token.text.lower() in config.SETTINGS_KEYWORDS['locations']:
-                if token.text not in overall_settings['locations']:
-                    overall_settings['locations'].append(token.text)
-            if token.text.lower() in config.SETTINGS_KEYWORDS['atmosphere']:
-                if token.text not in overall_settings['atmosphere']:
-                    overall_settings['atmosphere'].append(token.text)
-
-        for scene_key, scene_data in consolidated_analysis.items():
-            print(f"Retrieving video for scene: {scene_key}")
-            queries = generate_queries(scene_data['analysis'], overall_settings)
-            consolidated_analysis[scene_key]['generated_queries'] = queries
-            
-            video_found = False
-            for query in queries:
-                if video_found: break
-                search_results = search_videos(
-                    query,
-                    args.api_key,
-                    is_g_rated=args.safesearch,
-                    video_type=args.video_type,
-                    per_page=args.per_page, # Pass new argument
-                    order=args.order # Pass new argument
-                )
-                log_entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'scene_key': scene_key,
-                    'query': query,
-                    'results': search_results
-                }
-                query_log.append(log_entry)
-                
-                if search_results and search_results['hits']:
-                    for hit in search_results['hits']:
-                        if hit['id'] not in downloaded_video_ids: # Check for duplicates
-                            video_url = hit.get('videos', {}).get('large', {}).get('url')
-                            if not video_url:
-                                video_url = hit.get('videos', {}).get('medium', {}).get('url')
-                            
-                            if video_url:
-                                # Temporary path for downloaded video before standardization
-                                raw_video_filename = f"{scene_key}_{hit['id']}_raw.mp4"
-                                raw_video_filepath = os.path.join(video_clips_dir, raw_video_filename)
-
-                                # Path for standardized video
-                                standardized_video_filename = f"{scene_key}_{hit['id']}_standardized.mp4"
-                                standardized_video_filepath = os.path.join(video_clips_dir, standardized_video_filename)
-
-                                if download_video(video_url, raw_video_filepath):
-                                    print(f"Standardizing video: {raw_video_filepath}")
-                                    if standardize_video_clip(raw_video_filepath, standardized_video_filepath):
-                                        consolidated_analysis[scene_key]['video_info'] = {
-                                            'id': hit['id'],
-                                            'url': video_url,
-                                            'tags': hit['tags'],
-                                            'download_path': standardized_video_filepath # Store path to standardized video
-                                        }
-                                        downloaded_video_ids.add(hit['id']) # Add to set
-                                        video_found = True
-                                        # Clean up raw downloaded video
-                                        os.remove(raw_video_filepath)
-                                        break 
-                time.sleep(1) # To avoid hitting API rate limits
+        os.makedirs(context.video_clips_dir, exist_ok=True)
+        os.makedirs(context.adjusted_clips_dir, exist_ok=True)
+
+    owns_pools = pools is None
+    if owns_pools:
+        pools = StagePools(stage_workers(args))
+        configure_shared_clients(args, pools)
+    try:
+        stages = profiler.wrap_stages(build_scene_stages(args.skip_downloads))
+        completed = restore_scene_progress(stages, progress['scene_progress'], context) if progress else None
+        if store:
+            completed = store.restore_scenes(stages, fingerprints, context, completed=completed)
+        pipeline = ScenePipeline(stages, pools)
+        pipeline.run(consolidated_analysis.keys(), context, completed=completed,
+                     on_stage_complete=stage_recorder(context, journal, store, fingerprints))
+    finally:
+        if owns_pools:
+            pools.shutdown()
+    if store:
+        store.save(fingerprints.values())
 
+    if not args.skip_downloads:
         query_log_path = os.path.join(args.output_dir, config.QUERY_LOG_FILE)
         with open(query_log_path, 'w', encoding='utf-8') as f:
-            json.dump(query_log, f, indent=4)
+            json.dump(context.query_log, f, indent=4)
 
-    # --- 4. Asset Preparation ---
-    print("\n--- Phase 4: Asset Preparation ---")
-    if not args.skip_downloads:
-        adjusted_clips_dir = os.path.join(args.output_dir, config.ADJUSTED_CLIPS_DIR)
-        os.makedirs(adjusted_clips_dir, exist_ok=True)
-
-        for scene_key, scene_data in consolidated_analysis.items():
-            if 'video_info' in scene_data and 'audio_info' in scene_data:
-                print(f"Adjusting video for scene: {scene_key}")
-                input_path = scene_data['video_info']['download_path']
-                output_filename = f"{scene_key}_adjusted.mp4"
-                output_path = os.path.join(adjusted_clips_dir, output_filename)
-                target_duration = scene_data['audio_info']['duration']
-                
-                if adjust_video_duration(input_path, output_path, target_duration):
-                    consolidated_analysis[scene_key]['adjusted_video_info'] = {
-                        'path': output_path,
-                        'duration': target_duration
-                    }
+        if owns_pools:
+            print_download_summary()
 
     # --- 5. Final Output ---
     print("\n--- Phase 5: Final Output ---")
+    profiler.start_phase("final_output")
     final_json_path = os.path.join(args.output_dir, config.CONSOLIDATED_JSON_FILE)
     with open(final_json_path, 'w', encoding='utf-8') as f:
         json.dump(consolidated_analysis, f, indent=4)
         
     print(f"Processing complete. All assets and logs saved in: {args.output_dir}")
+    if owns_pools:
+        model_registry.print_report()
 
     # --- 6. Create Final Video ---
     print("\n--- Phase 6: Creating Final Video ---")
-    create_final_video(consolidated_analysis, args.output_dir)
+    profiler.start_phase("final_video")
+    from assets.assembly import assemble_final_video
+    final_video_path, _ = assemble_final_video(consolidated_analysis, args.output_dir, mode=args.assembly)
+    result['final_video'] = final_video_path
+    result['scenes'] = len(consolidated_analysis)
+    result['ok'] = final_video_path is not None
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def stage_workers(args):
+    """
+    Per-stage worker counts: --stage_workers over config.STAGE_WORKERS, except
+    that offline TTS engines get one worker per CPU unless set explicitly,
+    since local synthesis is CPU-bound rather than waiting on the network.
+    """
+    from assets.audio import TTS_ENGINES
+    workers = parse_stage_workers(args.stage_workers)
+    engine_class = TTS_ENGINES.get(args.tts_engine)
+    if engine_class is not None and engine_class.local:
+        workers.setdefault('tts', os.cpu_count() or 1)
+    return workers
+
+def configure_shared_clients(args, pools):
+    """Sizes the process-wide API rate limiter and download connection pool."""
+    from assets.video import pixabay_rate_limiter
+    from assets.downloader import default_downloader
+    pixabay_rate_limiter.configure(args.rate_limit, args.rate_limit_window)
+    # Size the shared connection pool to the number of concurrent downloads
+    default_downloader.configure(max_workers=pools.workers['download'], chunk_size=args.download_chunk_size)
+
+def print_download_summary():
+    from assets.downloader import default_downloader
+    download_summary = default_downloader.summary()
+    if download_summary['downloads']:
+        print(f"Downloaded {download_summary['downloads']} clips, "
+              f"{download_summary['bytes'] / (1024 * 1024):.1f} MB at {download_summary['mean_mb_per_second']:.1f} MB/s per connection")
+
+def find_batch_scripts(batch_dir):
+    """Returns the script files of a batch directory in name order."""
+    return sorted(
+        os.path.join(batch_dir, name) for name in os.listdir(batch_dir)
+        if name.endswith('.txt') and os.path.isfile(os.path.join(batch_dir, name))
+    )
+
+def batch_job_args(args, script_path):
+    """Copies the batch arguments for one script, with its own output directory."""
+    job_args = copy.copy(args)
+    job_args.script_path = script_path
+    job_args.output_dir = os.path.join(args.output_dir, os.path.splitext(os.path.basename(script_path))[0])
+    return job_args
+
+def run_batch(args):
+    """
+    Processes every script in `args.batch` concurrently. Models are loaded once
+    through the registry and all scripts share the same per-stage worker pools,
+    so scenes from different scripts interleave on the network and encode pools.
+    """
+    script_paths = find_batch_scripts(args.batch)
+    if not script_paths:
+        print(f"Error: No .txt scripts found in {args.batch}")
+        return []
+
+    print(f"--- Batch: {len(script_paths)} scripts, {args.batch_jobs} at a time ---")
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Warm the shared models before the jobs start so none of them pays the load alone
+    model_registry.warm_up([('spacy', config.SPACY_MODEL), ('emotion', config.EMOTION_MODEL)])
+    analysis_lock = threading.Lock()
+
+    started = time.perf_counter()
+    with StagePools(stage_workers(args)) as pools:
+        configure_shared_clients(args, pools)
+        with ThreadPoolExecutor(max_workers=max(1, args.batch_jobs), thread_name_prefix="batch-job") as jobs:
+            futures = [jobs.submit(run_job, batch_job_args(args, script_path), pools, analysis_lock) for script_path in script_paths]
+            results = []
+            for script_path, future in zip(script_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error processing {script_path}: {e}")
+                    results.append({'script_path': script_path, 'ok': False, 'error': str(e)})
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(1 for result in results if result['ok'])
+    report = {
+        'scripts': len(results),
+        'succeeded': succeeded,
+        'seconds': elapsed,
+        'scripts_per_hour': succeeded * 3600 / elapsed if elapsed > 0 else 0.0,
+        'jobs': results,
+    }
+    report_path = os.path.join(args.output_dir, config.BATCH_REPORT_FILE)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    print(f"\n--- Batch complete: {succeeded}/{len(results)} scripts in {elapsed:.1f}s "
+          f"({report['scripts_per_hour']:.1f} scripts/hour) ---")
+    print(f"Batch report saved to: {report_path}")
+    print_download_summary()
+    model_registry.print_report()
+    return results
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("Error: Pixabay API key not found. Please set the PIXABAY_API_KEY environment variable or provide it using the --api_key argument.")
+        return
+    if not (args.serve or args.batch or args.script_path):
+        parser.error("one of --script_path, --batch or --serve is required")
+
+    if args.trace:
+        tracer.enable()
+    try:
+        if args.serve:
+            # Imported here since service.py builds on this module
+            from service import serve
+            serve(args)
+        elif args.batch:
+            run_batch(args)
+        else:
+            run_job(args)
+    finally:
+        if args.trace:
+            tracer.save(args.trace)
 
 if __name__ == "__main__":
     main()
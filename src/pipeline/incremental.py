@@ -0,0 +1,232 @@
+# src/pipeline/incremental.py
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+from assets.clip_cache import link_or_copy
+import config
+
+def fingerprint(*parts):
+    """Returns a stable hash of JSON-serializable inputs."""
+    serialized = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def tts_options(args):
+    """The options that change a scene's narration audio."""
+    options = {'engine': args.tts_engine, 'voice': args.tts_voice, 'lang': args.tts_lang, 'speed': args.tts_speed}
+    if args.tts_engine == 'http':
+        options['endpoint'] = args.tts_endpoint
+    return options
+
+def search_options(args):
+    """The options that change which clip a scene's search selects."""
+    return {
+        'safesearch': args.safesearch,
+        'video_type': args.video_type,
+        'per_page': args.per_page,
+        'order': args.order,
+        'endpoint': args.pixabay_endpoint
+    }
+
+def render_options(args):
+    """The options that change a scene's rendered clip."""
+    return {
+        'resolution': list(config.TARGET_RESOLUTION),
+        'fps': config.TARGET_FPS,
+        'preset': config.RENDER_PRESET,
+        'crf': config.RENDER_CRF,
+        'bframes': 0,
+        'tail_frames': config.RENDER_TAIL_FRAMES
+    }
+
+def scene_fingerprints(scene_text, overall_settings, args):
+    """
+    Returns one fingerprint per stage for a scene. Each stage hashes its own
+    inputs plus the fingerprints of the stages it depends on, so an edit only
+    invalidates the stages downstream of what actually changed.
+    Search queries include the script-wide `overall_settings`, so adding or
+    removing a location or atmosphere keyword anywhere in the script changes
+    every scene's search fingerprint and re-selects, re-downloads and
+    re-renders every clip; narration is unaffected.
+    """
+    analysis = fingerprint('analysis', scene_text, config.SPACY_MODEL, config.EMOTION_MODEL)
+    tts = fingerprint('tts', scene_text, tts_options(args))
+    search = fingerprint('search', analysis, overall_settings, search_options(args))
+    render = fingerprint('render', tts, search, render_options(args))
+    return {'analysis': analysis, 'tts': tts, 'search': search, 'download': search, 'render': render}
+
+def split_reusable_analysis(scenes_dict, fingerprints, store):
+    """
+    Returns (reused, pending): the consolidated entries of scenes whose stored
+    analysis is still valid, and the texts of scenes that must be analyzed.
+    """
+    reused, pending = {}, {}
+    for scene_key, scene_text in scenes_dict.items():
+        stored_analysis = store.get('analysis', fingerprints[scene_key]['analysis']) if store else None
+        if stored_analysis is None:
+            pending[scene_key] = scene_text
+        else:
+            reused[scene_key] = {'scene_text': scene_text, 'analysis': stored_analysis}
+    return reused, pending
+
+class SceneStore:
+    """
+    Content-addressed store of per-scene results inside an output directory.
+    Analysis results, narration, clip selections, raw clips and rendered
+    clips are filed under their stage fingerprints, so after a script edit
+    only scenes whose inputs changed are regenerated, even when scene keys
+    shift. Files are hard-linked between the store and the run directories.
+    save() drops entries and files that no current scene refers to, so the
+    store holds the results of the latest run only.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def save(self, current_fingerprints=None):
+        """
+        Writes the manifest atomically. When `current_fingerprints` (the
+        per-stage fingerprints of every scene of the run) is given, entries
+        with other fingerprints are dropped first and stored files no entry
+        refers to are removed.
+        """
+        with self._lock:
+            if current_fingerprints is not None:
+                self._prune(list(current_fingerprints))
+            tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _prune(self, current_fingerprints):
+        """Drops stale entries and unreferenced files. Caller holds `_lock`."""
+        for stage_name, entries in self.manifest.items():
+            current = {fingerprints[stage_name] for fingerprints in current_fingerprints if stage_name in fingerprints}
+            for stage_fingerprint in [fp for fp in entries if fp not in current]:
+                del entries[stage_fingerprint]
+        referenced = {os.path.abspath(entry['path']) for entries in self.manifest.values()
+                      for entry in entries.values() if isinstance(entry, dict) and entry.get('path')}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name != os.path.basename(self.manifest_path) and os.path.isfile(path) and os.path.abspath(path) not in referenced:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Could not remove stale scene store file {path}: {e}")
+
+    def get(self, stage_name, stage_fingerprint):
+        with self._lock:
+            return self.manifest.get(stage_name, {}).get(stage_fingerprint)
+
+    def put(self, stage_name, stage_fingerprint, entry):
+        with self._lock:
+            self.manifest.setdefault(stage_name, {})[stage_fingerprint] = entry
+
+    def _file_path(self, stage_fingerprint, suffix):
+        return os.path.join(self.root, f"{stage_fingerprint}{suffix}")
+
+    def store_file(self, source_path, stage_fingerprint, suffix):
+        stored_path = self._file_path(stage_fingerprint, suffix)
+        link_or_copy(source_path, stored_path)
+        return stored_path
+
+    def restore_file(self, stored_path, dest_path):
+        if not stored_path or not os.path.exists(stored_path):
+            return False
+        link_or_copy(stored_path, dest_path)
+        return True
+
+    def publish_stage(self, scene_key, stage_name, fingerprints, context):
+        """Files the output of a completed stage under its fingerprint."""
+        scene_data = context.consolidated_analysis[scene_key]
+        state = context.scene_state[scene_key]
+        stage_fingerprint = fingerprints[stage_name]
+        if stage_name == 'tts':
+            audio_info = scene_data['audio_info']
+            self.put('tts', stage_fingerprint, {
+                'path': self.store_file(audio_info['filename'], stage_fingerprint, ".mp3"),
+                'duration': audio_info['duration']
+            })
+        elif stage_name == 'search':
+            self.put('search', stage_fingerprint, {
+                'generated_queries': scene_data.get('generated_queries', []),
+                'candidates': state.get('candidates', []),
+                'next_query': state.get('next_query', 0)
+            })
+        elif stage_name == 'download':
+            self.put('download', stage_fingerprint, {
+                'path': self.store_file(state['raw_path'], stage_fingerprint, "_raw.mp4"),
+                'selected': state['selected'],
+                'planned_duration': state.get('planned_duration')
+            })
+        elif stage_name == 'render':
+            self.put('render', stage_fingerprint, {
+                'path': self.store_file(scene_data['adjusted_video_info']['path'], stage_fingerprint, ".mp4"),
+                'video_info': scene_data['video_info'],
+                'duration': scene_data['adjusted_video_info']['duration'],
+                'frames': scene_data['adjusted_video_info'].get('frames')
+            })
+
+    def restore_stage(self, scene_key, stage_name, fingerprints, context):
+        """Restores a stage's stored output into the scene. Returns True if the stage can be skipped."""
+        entry = self.get(stage_name, fingerprints[stage_name])
+        if entry is None:
+            return False
+        scene_data = context.consolidated_analysis[scene_key]
+        state = context.scene_state[scene_key]
+        if stage_name == 'tts':
+            audio_filepath = os.path.join(context.audio_dir, f"{scene_key}.mp3")
+            if not self.restore_file(entry['path'], audio_filepath):
+                return False
+            scene_data['audio_info'] = {'filename': audio_filepath, 'duration': entry['duration']}
+        elif stage_name == 'search':
+            scene_data['generated_queries'] = entry['generated_queries']
+            state['candidates'] = entry['candidates']
+            state['next_query'] = entry.get('next_query', 0)
+        elif stage_name == 'download':
+            selected = entry['selected']
+            raw_video_filepath = os.path.join(context.video_clips_dir, f"{scene_key}_{selected['id']}_raw.mp4")
+            if not context.claim_video(selected['id']):
+                return False
+            if not self.restore_file(entry['path'], raw_video_filepath):
+                context.release_video(selected['id'])
+                return False
+            state['selected'] = selected
+            state['raw_path'] = raw_video_filepath
+            state['planned_duration'] = entry.get('planned_duration')
+        elif stage_name == 'render':
+            output_path = os.path.join(context.adjusted_clips_dir, f"{scene_key}_adjusted.mp4")
+            if not self.restore_file(entry['path'], output_path):
+                return False
+            scene_data['video_info'] = dict(entry['video_info'], download_path=state.get('raw_path'))
+            scene_data['adjusted_video_info'] = {'path': output_path, 'duration': entry['duration'], 'frames': entry.get('frames')}
+        return True
+
+    def restore_scenes(self, stages, scene_fingerprints_by_key, context, completed=None):
+        """
+        Restores every stage whose fingerprint is already stored (in dependency
+        order) and returns the completed stages per scene, merged with `completed`.
+        """
+        completed = {scene_key: set(stage_names) for scene_key, stage_names in (completed or {}).items()}
+        reused = 0
+        for scene_key, fingerprints in scene_fingerprints_by_key.items():
+            done = completed.setdefault(scene_key, set())
+            for stage in stages:
+                if stage.name in done:
+                    continue
+                if all(dependency in done for dependency in stage.after) and self.restore_stage(scene_key, stage.name, fingerprints, context):
+                    done.add(stage.name)
+                    reused += 1
+        print(f"Reused {reused} unchanged scene stages from {self.root}")
+        return completed
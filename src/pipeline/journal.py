@@ -0,0 +1,88 @@
+# src/pipeline/journal.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class RunJournal:
+    """
+    Append-only JSON Lines journal of a pipeline run.
+    The script analysis and every completed scene stage (with the scene's
+    record and artifact paths) are appended and fsynced as they happen, so a
+    crash loses at most the stages still in progress. A torn final line from
+    an interrupted write is ignored when the journal is replayed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Starts a fresh journal, discarding any previous run."""
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8'):
+                pass
+
+    def _append(self, event):
+        event['time'] = time.time()
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_analysis(self, script_hash, scenes_dict, overall_settings, consolidated_analysis):
+        self._append({
+            'event': 'analysis',
+            'script_hash': script_hash,
+            'scenes': scenes_dict,
+            'overall_settings': overall_settings,
+            'consolidated_analysis': consolidated_analysis
+        })
+
+    def record_stage(self, scene_key, stage_name, scene_record, scene_state):
+        self._append({
+            'event': 'stage',
+            'scene_key': scene_key,
+            'stage': stage_name,
+            'record': scene_record,
+            'state': scene_state
+        })
+
+    def load(self):
+        """
+        Replays the journal. Returns None if there is nothing to resume, otherwise
+        a dict with the recorded analysis and, per scene, its completed stages and
+        latest record/state.
+        """
+        if not os.path.exists(self.path):
+            return None
+        progress = None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    print(f"Ignoring incomplete journal entry in {self.path}")
+                    continue
+                if event.get('event') == 'analysis':
+                    progress = {
+                        'script_hash': event['script_hash'],
+                        'scenes': event['scenes'],
+                        'overall_settings': event['overall_settings'],
+                        'consolidated_analysis': event['consolidated_analysis'],
+                        'scene_progress': {}
+                    }
+                elif event.get('event') == 'stage' and progress is not None:
+                    scene_progress = progress['scene_progress'].setdefault(event['scene_key'], {'stages': [], 'record': {}, 'state': {}})
+                    if event['stage'] not in scene_progress['stages']:
+                        scene_progress['stages'].append(event['stage'])
+                    scene_progress['record'] = event['record']
+                    scene_progress['state'] = event['state']
+        return progress
@@ -0,0 +1,180 @@
+# src/pipeline/runner.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.tracing import tracer
+import config
+
+class Stage:
+    """
+    One step of the per-scene task graph.
+    `func(scene_key, context)` returns True when the scene may continue to the
+    stages that depend on it, or a Rerun to send it back to earlier stages;
+    `after` names the stages that must finish first.
+    """
+
+    def __init__(self, name, func, after=()):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+
+class Rerun:
+    """
+    Stage result that sends a scene back to earlier stages, e.g. render asking
+    for another download. The named stages and every stage depending on them
+    run again, each on its own pool.
+    """
+
+    def __init__(self, *stage_names):
+        self.stage_names = stage_names
+
+class StagePools:
+    """
+    One bounded worker pool per stage, so each stage's concurrency is
+    configured separately (e.g. many network-bound downloads, few encodes).
+    Pools can be shared by several pipeline runs.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = dict(config.STAGE_WORKERS)
+        self.workers.update(workers or {})
+        self._executors = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, stage_name):
+        with self._lock:
+            if stage_name not in self._executors:
+                self._executors[stage_name] = ThreadPoolExecutor(
+                    max_workers=max(1, self.workers.get(stage_name, 1)),
+                    thread_name_prefix=f"{stage_name}-worker"
+                )
+            return self._executors[stage_name]
+
+    def submit(self, stage_name, fn, *args):
+        return self._executor(stage_name).submit(fn, *args)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors = {}
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+class ScenePipeline:
+    """
+    Runs every scene through the stage graph concurrently.
+    A scene's next stage is queued on its own pool as soon as the stages it
+    depends on have finished, so different scenes occupy different stages
+    at the same time instead of waiting on phase-wide barriers.
+    """
+
+    def __init__(self, stages, pools):
+        self.stages = list(stages)
+        self.pools = pools
+
+    def downstream(self, stage_names):
+        """Returns `stage_names` plus every stage that depends on them, directly or indirectly."""
+        names = set(stage_names)
+        for stage in self.stages: # Stages are listed in dependency order
+            if names.intersection(stage.after):
+                names.add(stage.name)
+        return names
+
+    def run(self, scene_keys, context, completed=None, on_stage_complete=None):
+        """
+        Runs all scenes to completion and blocks until every scene is done.
+        `completed` optionally maps scene keys to stages already finished in an
+        earlier run, which are skipped. `on_stage_complete(scene_key, stage_name)`
+        is called after each successful stage, before its dependents are queued.
+        A stage returning a Rerun resets the named stages and their dependents.
+        Returns a dict mapping each scene key to the set of completed stage names.
+        """
+        scene_keys = list(scene_keys)
+        completed = {scene_key: set((completed or {}).get(scene_key, ())) for scene_key in scene_keys}
+        submitted = {scene_key: set(completed[scene_key]) for scene_key in scene_keys}
+        in_flight = {scene_key: 0 for scene_key in scene_keys}
+        lock = threading.Lock()
+        all_done = threading.Event()
+        remaining = [len(scene_keys)]
+
+        def submit_ready(scene_key):
+            # Caller holds `lock`
+            for stage in self.stages:
+                if stage.name in submitted[scene_key]:
+                    continue
+                if all(dependency in completed[scene_key] for dependency in stage.after):
+                    submitted[scene_key].add(stage.name)
+                    in_flight[scene_key] += 1
+                    self.pools.submit(stage.name, run_stage, stage, scene_key, time.perf_counter())
+
+        def run_stage(stage, scene_key, queued_at):
+            # Time spent queued for a free worker shows up on the span as `queued_ms`
+            queued_ms = (time.perf_counter() - queued_at) * 1000
+            with tracer.span(stage.name, cat="stage", scene=scene_key, queued_ms=round(queued_ms, 3)) as span:
+                try:
+                    succeeded = stage.func(scene_key, context)
+                except Exception as e:
+                    print(f"Error in stage '{stage.name}' for scene {scene_key}: {e}")
+                    succeeded = False
+                rerun = succeeded if isinstance(succeeded, Rerun) else None
+                if rerun is not None:
+                    succeeded = False
+                    span['rerun'] = list(rerun.stage_names)
+                span['succeeded'] = bool(succeeded)
+            if succeeded and on_stage_complete is not None:
+                try:
+                    on_stage_complete(scene_key, stage.name)
+                except Exception as e:
+                    print(f"Error recording stage '{stage.name}' for scene {scene_key}: {e}")
+            with lock:
+                in_flight[scene_key] -= 1
+                if succeeded:
+                    completed[scene_key].add(stage.name)
+                    submit_ready(scene_key)
+                elif rerun is not None:
+                    reset = self.downstream(rerun.stage_names)
+                    completed[scene_key] -= reset
+                    submitted[scene_key] -= reset
+                    submit_ready(scene_key)
+                if in_flight[scene_key] == 0:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        all_done.set()
+
+        with lock:
+            for scene_key in scene_keys:
+                submit_ready(scene_key)
+                if in_flight[scene_key] == 0:
+                    remaining[0] -= 1
+            if remaining[0] == 0:
+                all_done.set()
+
+        all_done.wait()
+        return completed
+
+def parse_stage_workers(spec):
+    """Parses a 'stage=N,stage=N' string into a dict of per-stage worker counts."""
+    workers = {}
+    if not spec:
+        return workers
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        stage_name, _, count = item.partition('=')
+        try:
+            count = int(count)
+        except ValueError:
+            raise ValueError(f"Invalid stage worker setting '{item}', expected stage=N")
+        if not stage_name.strip() or count < 1:
+            raise ValueError(f"Invalid stage worker setting '{item}', expected a stage and at least 1 worker")
+        workers[stage_name.strip()] = count
+    return workers
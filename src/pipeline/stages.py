@@ -0,0 +1,344 @@
+# src/pipeline/stages.py
+
+import os
+import threading
+from datetime import datetime
+
+from pipeline.runner import Rerun, Stage
+import config
+
+class RunContext:
+    """
+    Shared state for one pipeline run, handed to every stage.
+    Scene results are written into `consolidated_analysis`; transient
+    per-scene data (e.g. search candidates) lives in `scene_state`.
+    """
+
+    def __init__(self, args, consolidated_analysis, overall_settings, clip_cache=None, search_cache=None, tts_engine=None,
+                 narration_cache=None, duration_estimator=None):
+        self.args = args
+        self.tts_engine = tts_engine
+        self.narration_cache = narration_cache
+        self.duration_estimator = duration_estimator
+        self.clip_cache = clip_cache
+        self.search_cache = search_cache
+        self.consolidated_analysis = consolidated_analysis
+        self.overall_settings = overall_settings
+        self.audio_dir = os.path.join(args.output_dir, config.AUDIO_DIR)
+        self.video_clips_dir = os.path.join(args.output_dir, config.VIDEO_CLIPS_DIR)
+        self.adjusted_clips_dir = os.path.join(args.output_dir, config.ADJUSTED_CLIPS_DIR)
+        self.query_log = []
+        self.scene_state = {scene_key: {} for scene_key in consolidated_analysis}
+        self._lock = threading.Lock()
+        self._claimed_video_ids = set()
+
+    def log_query(self, log_entry):
+        with self._lock:
+            self.query_log.append(log_entry)
+
+    def claim_video(self, video_id):
+        """Reserves a Pixabay video for one scene. Returns False if another scene already has it."""
+        with self._lock:
+            if video_id in self._claimed_video_ids:
+                return False
+            self._claimed_video_ids.add(video_id)
+            return True
+
+    def is_claimed(self, video_id):
+        with self._lock:
+            return video_id in self._claimed_video_ids
+
+    def release_video(self, video_id):
+        with self._lock:
+            self._claimed_video_ids.discard(video_id)
+
+    def estimate_durations(self, tts_options):
+        """
+        Predicts every scene's narration duration from its text, so clip
+        selection can start right after segmentation instead of after TTS.
+        """
+        if self.duration_estimator is None:
+            return
+        for scene_key, scene_data in self.consolidated_analysis.items():
+            self.scene_state[scene_key]['estimated_duration'] = self.duration_estimator.estimate(scene_data['scene_text'], tts_options)
+
+    def planned_duration(self, scene_key):
+        """The narration duration to pick clips for: the real one once TTS is done, otherwise the estimate."""
+        audio_info = self.consolidated_analysis[scene_key].get('audio_info') or {}
+        return audio_info.get('duration') or self.scene_state[scene_key].get('estimated_duration')
+
+def _remove_stale_output(path):
+    # Outputs may be hard links into the clip cache or scene store; never write through them
+    if os.path.lexists(path):
+        os.remove(path)
+
+def _select_rendition(hit):
+    """Returns (rendition, url, size) for the largest usable rendition of a hit, or None."""
+    for rendition in ('large', 'medium'):
+        video = hit.get('videos', {}).get(rendition, {})
+        if video.get('url'):
+            return rendition, video['url'], video.get('size')
+    return None
+
+def _plan_candidates(candidates, target_duration):
+    """Orders candidates so clips at least `target_duration` long come first, otherwise keeping the search order."""
+    if not target_duration:
+        return list(candidates)
+    return sorted(candidates, key=lambda candidate: (candidate.get('duration') or 0) < target_duration)
+
+def _download_candidate(scene_key, context, candidates):
+    """
+    Downloads the first of `candidates` no other scene has claimed and that
+    didn't fail to render. Returns the candidate and raw path, or None.
+    """
+    from assets.video import download_video
+    rejected = set(context.scene_state[scene_key].get('rejected', []))
+    for candidate in candidates:
+        if candidate['id'] in rejected:
+            continue
+        if not context.claim_video(candidate['id']): # Check for duplicates across scenes
+            continue
+        # The raw download is the single source for the scene's render
+        raw_video_filename = f"{scene_key}_{candidate['id']}_raw.mp4"
+        raw_video_filepath = os.path.join(context.video_clips_dir, raw_video_filename)
+        if download_video(candidate['url'], raw_video_filepath, cache=context.clip_cache, video_id=candidate['id'],
+                          rendition=candidate['rendition'], expected_size=candidate['size']):
+            return candidate, raw_video_filepath
+        context.release_video(candidate['id'])
+    return None
+
+def _needs_reselection(scene_key, context):
+    """
+    True when the real narration differs from the duration the scene's clip
+    was chosen for by more than DURATION_TOLERANCE, the clip no longer covers
+    it, and an unclaimed candidate long enough to cover it is left.
+    """
+    state = context.scene_state[scene_key]
+    duration = context.consolidated_analysis[scene_key]['audio_info']['duration']
+    planned = state.get('planned_duration')
+    selected = state['selected']
+    if planned is None or abs(duration - planned) <= config.DURATION_TOLERANCE:
+        return False
+    if not selected.get('duration') or selected['duration'] >= duration:
+        return False
+    rejected = set(state.get('rejected', []))
+    return any(candidate['id'] != selected['id'] and candidate['id'] not in rejected and not context.is_claimed(candidate['id'])
+               and (candidate.get('duration') or 0) >= duration
+               for candidate in state.get('candidates', []))
+
+def _release_selection(scene_key, context):
+    """Gives up the scene's downloaded clip: releases the claim and removes the raw file."""
+    state = context.scene_state[scene_key]
+    selected, raw_path = state.pop('selected', None), state.pop('raw_path', None)
+    if selected:
+        context.release_video(selected['id'])
+    if raw_path:
+        _remove_stale_output(raw_path)
+
+# Each stage imports its backend on first use, so runs that skip a stage
+# (e.g. --skip_downloads) never import the libraries behind it.
+
+def tts_stage(scene_key, context):
+    from assets.audio import generate_audio
+    scene_data = context.consolidated_analysis[scene_key]
+    print(f"Generating audio for scene: {scene_key}")
+    _remove_stale_output(os.path.join(context.audio_dir, f"{scene_key}.mp3"))
+    audio_filepath, duration = generate_audio(scene_key, scene_data['scene_text'], context.audio_dir, engine=context.tts_engine,
+                                              cache=context.narration_cache)
+    if context.duration_estimator is not None and context.tts_engine is not None and duration:
+        context.duration_estimator.record(scene_data['scene_text'], context.tts_engine.options(), duration)
+    scene_data['audio_info'] = {
+        'filename': audio_filepath,
+        'duration': duration
+    }
+    return audio_filepath is not None
+
+def _search_next_query(scene_key, context):
+    """
+    Runs the scene's next unsearched query and adds its hits to the scene's
+    candidates. Returns False once every query has been searched.
+    """
+    from assets.video import search_videos
+    args = context.args
+    state = context.scene_state[scene_key]
+    queries = context.consolidated_analysis[scene_key].get('generated_queries', [])
+    query_index = state.get('next_query', 0)
+    if query_index >= len(queries):
+        return False
+    query = queries[query_index]
+    state['next_query'] = query_index + 1
+    candidates = state.setdefault('candidates', [])
+    known_ids = {candidate['id'] for candidate in candidates}
+
+    search_results = search_videos(
+        query,
+        args.api_key,
+        is_g_rated=args.safesearch,
+        video_type=args.video_type,
+        per_page=args.per_page,
+        order=args.order,
+        cache=context.search_cache,
+        endpoint_url=args.pixabay_endpoint
+    )
+    context.log_query({
+        'timestamp': datetime.now().isoformat(),
+        'scene_key': scene_key,
+        'query': query,
+        'results': search_results
+    })
+
+    if search_results and search_results['hits']:
+        for hit in search_results['hits']:
+            selected = _select_rendition(hit)
+            if selected and hit['id'] not in known_ids:
+                rendition, video_url, size = selected
+                known_ids.add(hit['id'])
+                candidates.append({'id': hit['id'], 'url': video_url, 'rendition': rendition, 'size': size, 'tags': hit.get('tags'),
+                                   'duration': hit.get('duration')})
+    return True
+
+def search_stage(scene_key, context):
+    """
+    Searches the scene's queries in order until one yields a clip no other
+    scene has claimed yet. Later queries stay available to download_stage.
+    """
+    from assets.video import generate_queries
+    scene_data = context.consolidated_analysis[scene_key]
+    state = context.scene_state[scene_key]
+    print(f"Retrieving video for scene: {scene_key}")
+    scene_data['generated_queries'] = generate_queries(scene_data['analysis'], context.overall_settings)
+    state['candidates'] = []
+    state['next_query'] = 0
+
+    while _search_next_query(scene_key, context):
+        if any(not context.is_claimed(candidate['id']) for candidate in state['candidates']):
+            break
+    return bool(state['candidates'])
+
+def download_stage(scene_key, context):
+    """
+    Downloads a clip for the scene, preferring clips that cover its narration
+    (or its estimate, before TTS is done). When other scenes have claimed every
+    candidate, the scene's remaining queries are searched for more.
+    """
+    state = context.scene_state[scene_key]
+    planned = context.planned_duration(scene_key)
+    downloaded = _download_candidate(scene_key, context, _plan_candidates(state.get('candidates', []), planned))
+    while not downloaded and _search_next_query(scene_key, context):
+        downloaded = _download_candidate(scene_key, context, _plan_candidates(state['candidates'], planned))
+    if not downloaded:
+        return False
+    state['selected'], state['raw_path'] = downloaded
+    state['planned_duration'] = planned
+    return True
+
+def render_stage(scene_key, context):
+    """
+    Renders the scene's final-form clip from the raw download in a single
+    encode. If the clip fails to render, it is released and the scene goes
+    back to download_stage for its next candidate, up to MAX_RENDER_ATTEMPTS.
+    The scene also goes back when its clip was chosen for an estimated
+    duration that turned out wrong (see _needs_reselection), so the
+    replacement is downloaded on the download pool, not a render worker.
+    """
+    from assets.render import render_frame_count, render_scene_clip
+    state = context.scene_state[scene_key]
+    scene_data = context.consolidated_analysis[scene_key]
+    if _needs_reselection(scene_key, context):
+        print(f"Narration for scene {scene_key} is {scene_data['audio_info']['duration']:.1f}s, "
+              f"planned {state['planned_duration']:.1f}s; re-selecting its clip")
+        _release_selection(scene_key, context)
+        return Rerun('download')
+    candidate = state['selected']
+    raw_video_filepath = state['raw_path']
+    output_path = os.path.join(context.adjusted_clips_dir, f"{scene_key}_adjusted.mp4")
+    target_duration = scene_data['audio_info']['duration']
+
+    print(f"Rendering video for scene: {scene_key}")
+    _remove_stale_output(output_path)
+    if not render_scene_clip(raw_video_filepath, output_path, target_duration,
+                             target_resolution=config.TARGET_RESOLUTION, target_fps=config.TARGET_FPS):
+        rejected = state.setdefault('rejected', [])
+        rejected.append(candidate['id'])
+        _release_selection(scene_key, context)
+        if len(rejected) >= config.MAX_RENDER_ATTEMPTS:
+            return False
+        print(f"Clip {candidate['id']} failed to render for scene {scene_key}; trying its next candidate")
+        return Rerun('download')
+
+    scene_data['video_info'] = {
+        'id': candidate['id'],
+        'url': candidate['url'],
+        'tags': candidate['tags'],
+        'download_path': raw_video_filepath
+    }
+    scene_data['adjusted_video_info'] = {
+        'path': output_path,
+        'duration': target_duration,
+        'frames': render_frame_count(target_duration, config.TARGET_FPS)
+    }
+    return True
+
+def _stage_artifacts(stage_name, scene_data, state):
+    """Returns the files a completed stage must have left behind."""
+    if stage_name == 'tts':
+        return [scene_data.get('audio_info', {}).get('filename')]
+    if stage_name == 'download':
+        return [state.get('raw_path')]
+    if stage_name == 'render':
+        return [scene_data.get('adjusted_video_info', {}).get('path')]
+    return []
+
+def restore_scene_progress(stages, scene_progress, context):
+    """
+    Restores journaled scene records into `context` and returns the stages that
+    can be skipped per scene. A stage only counts as done if its artifacts still
+    exist and every stage it depends on is done as well.
+    """
+    completed = {}
+    for scene_key, progress in scene_progress.items():
+        if scene_key not in context.consolidated_analysis:
+            continue
+        context.consolidated_analysis[scene_key].update(progress['record'])
+        context.scene_state[scene_key].update(progress['state'])
+        scene_data = context.consolidated_analysis[scene_key]
+        state = context.scene_state[scene_key]
+
+        done = set()
+        for stage in stages:
+            if (stage.name in progress['stages']
+                    and all(dependency in done for dependency in stage.after)
+                    and all(path and os.path.exists(path) for path in _stage_artifacts(stage.name, scene_data, state))):
+                done.add(stage.name)
+        if 'download' in done:
+            context.claim_video(state['selected']['id'])
+        completed[scene_key] = done
+    return completed
+
+def stage_recorder(context, journal, store=None, fingerprints=None):
+    """
+    Returns an on_stage_complete callback that journals each finished stage
+    and, when a SceneStore is given, files its output under the stage fingerprint.
+    """
+    def on_stage_complete(scene_key, stage_name):
+        journal.record_stage(scene_key, stage_name,
+                             dict(context.consolidated_analysis[scene_key]),
+                             dict(context.scene_state[scene_key]))
+        if store is not None:
+            store.publish_stage(scene_key, stage_name, fingerprints[scene_key], context)
+    return on_stage_complete
+
+def build_scene_stages(skip_downloads=False):
+    """
+    Returns the per-scene stage graph: TTS alongside search -> download, then
+    render. Downloads pick clips by the estimated narration duration, so they
+    don't wait for TTS; render corrects the pick if the estimate was off.
+    """
+    stages = [Stage('tts', tts_stage)]
+    if not skip_downloads:
+        stages.extend([
+            Stage('search', search_stage),
+            Stage('download', download_stage, after=('search',)),
+            Stage('render', render_stage, after=('tts', 'download')),
+        ])
+    return stages
@@ -0,0 +1,250 @@
+# src/service.py
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from main import build_parser, run_job, configure_shared_clients, stage_workers
+from pipeline.runner import StagePools
+from utils.model_registry import model_registry
+import config
+
+# Per-run files a finished job exposes as artifacts
+ARTIFACT_FILES = {
+    'final_video': config.FINAL_VIDEO_FILE,
+    'consolidated_analysis': config.CONSOLIDATED_JSON_FILE,
+    'scenes': config.SCENE_JSON_FILE,
+    'query_log': config.QUERY_LOG_FILE,
+}
+
+# Options that only make sense for the CLI process itself
+SERVICE_ONLY_OPTIONS = {'script_path', 'output_dir', 'trace', 'batch', 'batch_jobs', 'serve', 'host', 'port', 'jobs_dir', 'service_jobs'}
+# Options of the worker pools, clients, caches and endpoints every job shares, and options that
+# name files or hosts the service process would read or write; they are fixed when the service starts
+SHARED_RESOURCE_OPTIONS = {
+    'stage_workers', 'rate_limit', 'rate_limit_window', 'download_chunk_size',
+    'clip_cache_dir', 'search_cache_path', 'narration_cache_dir', 'duration_history',
+    'tts_voice', 'pixabay_endpoint', 'tts_endpoint',
+}
+
+def _raise_value_error(message):
+    raise ValueError(message)
+
+def build_job_args(base_args, options, script_path, output_dir):
+    """
+    Returns the argparse namespace for one job: the service's own arguments
+    overridden by the job's `options`, keyed like the `main.py` flags. The
+    options are parsed by the CLI parser, so they get its type conversion and
+    choices. Raises ValueError for unknown, shared-resource or invalid options.
+    """
+    parser = build_parser()
+    parser.error = _raise_value_error # Report bad options to the client instead of exiting
+    actions = {action.dest: action for action in parser._actions if action.option_strings}
+    unknown = sorted(set(options) - set(actions) | (set(options) & SERVICE_ONLY_OPTIONS))
+    if unknown:
+        raise ValueError(f"Unknown job options: {', '.join(unknown)}")
+    shared = sorted(set(options) & SHARED_RESOURCE_OPTIONS)
+    if shared:
+        raise ValueError(f"Options set when the service starts can't be changed per job: {', '.join(shared)}")
+
+    job_args = parser.parse_args([])
+    vars(job_args).update(vars(base_args))
+    argv = []
+    for name, value in options.items():
+        action = actions[name]
+        if action.nargs == 0: # store_true / store_false flags
+            if not isinstance(value, bool):
+                raise ValueError(f"Option {name} must be true or false")
+            setattr(job_args, name, value)
+        elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            argv.append(f"{action.option_strings[0]}={value}") # '=' keeps values like '-1' from reading as flags
+        else:
+            raise ValueError(f"Option {name} must be a string or a number")
+    job_args = parser.parse_args(argv, namespace=job_args)
+    job_args.script_path = script_path
+    job_args.output_dir = output_dir
+    return job_args
+
+class JobManager:
+    """
+    Queues script jobs and runs them in this process, so the loaded models,
+    caches and per-stage worker pools are shared by every job.
+    `runner(args, pools, analysis_lock)` processes one job. Only the most
+    recent `max_finished_jobs` finished jobs are kept; older ones are dropped
+    along with their directories.
+    """
+
+    def __init__(self, base_args, jobs_dir, pools, max_jobs=1, runner=run_job,
+                 max_finished_jobs=config.SERVICE_MAX_FINISHED_JOBS):
+        self.base_args = base_args
+        self.jobs_dir = jobs_dir
+        self.pools = pools
+        self.runner = runner
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._analysis_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="service-job")
+
+    def submit(self, script_text, options=None):
+        """Queues a job and returns its id. Raises ValueError for an invalid request."""
+        if not isinstance(script_text, str) or not script_text.strip():
+            raise ValueError("script_text must be a non-empty string")
+        if not isinstance(options or {}, dict):
+            raise ValueError("options must be an object")
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        script_path = os.path.join(job_dir, "script.txt")
+        output_dir = os.path.join(job_dir, "output")
+        job_args = build_job_args(self.base_args, options or {}, script_path, output_dir)
+
+        os.makedirs(job_dir, exist_ok=True)
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(script_text)
+
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'created': time.time(),
+            'started': None,
+            'finished': None,
+            'output_dir': output_dir,
+            'artifacts': {},
+            'error': None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job_id, job_args)
+        return job_id
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id, **fields):
+        """Records a job's outcome and evicts the oldest finished jobs beyond the limit."""
+        with self._lock:
+            self._jobs[job_id].update(fields, finished=time.time())
+            finished = sorted((job for job in self._jobs.values() if job['finished'] is not None),
+                              key=lambda job: job['finished'])
+            evicted = finished[:max(0, len(finished) - self.max_finished_jobs)]
+            for job in evicted:
+                del self._jobs[job['id']]
+        for job in evicted:
+            shutil.rmtree(os.path.join(self.jobs_dir, job['id']), ignore_errors=True)
+
+    def _run(self, job_id, job_args):
+        self._update(job_id, status='running', started=time.time())
+        try:
+            result = self.runner(job_args, self.pools, self._analysis_lock)
+        except Exception as e:
+            print(f"Error processing job {job_id}: {e}")
+            self._finish(job_id, status='failed', error=str(e))
+            return
+        ok = bool(result and result.get('ok'))
+        self._finish(
+            job_id,
+            status='done' if ok else 'failed',
+            artifacts=self._artifacts(job_args.output_dir),
+            error=None if ok else "The job did not complete; see the service log.",
+        )
+
+    def _artifacts(self, output_dir):
+        artifacts = {}
+        for name, file_name in ARTIFACT_FILES.items():
+            path = os.path.join(output_dir, file_name)
+            if os.path.exists(path):
+                artifacts[name] = os.path.abspath(path)
+        return artifacts
+
+    def get(self, job_id):
+        """Returns a copy of the job's status, or None for an unknown id."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self):
+        with self._lock:
+            return [dict(job) for job in sorted(self._jobs.values(), key=lambda job: job['created'])]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the render service:
+    POST /jobs {"script_text": ..., "options": {...}} queues a job,
+    GET /jobs lists jobs and GET /jobs/<id> returns one job's status and artifacts.
+    """
+
+    manager = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        if parts == ['jobs']:
+            self._send_json(200, {'jobs': self.manager.list()})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.manager.get(parts[1])
+            if job:
+                self._send_json(200, job)
+            else:
+                self._send_json(404, {'error': f"Unknown job: {parts[1]}"})
+        else:
+            self._send_json(404, {'error': "Not found"})
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+            self._send_json(404, {'error': "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("The request body must be a JSON object")
+            job_id = self.manager.submit(payload.get('script_text'), payload.get('options'))
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError too
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(202, {'id': job_id, 'status_url': f"/jobs/{job_id}"})
+
+    def log_message(self, format, *args):
+        print(f"[service] {self.address_string()} - {format % args}")
+
+def make_server(manager, host=config.SERVICE_HOST, port=config.SERVICE_PORT):
+    """Returns an HTTP server bound to `host:port` that serves `manager`'s job API."""
+    handler = type("BoundJobRequestHandler", (JobRequestHandler,), {'manager': manager})
+    return ThreadingHTTPServer((host, port), handler)
+
+def serve(args):
+    """Runs the render service until interrupted, with models loaded once up front."""
+    print("--- Render service: loading models ---")
+    model_registry.warm_up([('spacy', config.SPACY_MODEL), ('emotion', config.EMOTION_MODEL)])
+
+    with StagePools(stage_workers(args)) as pools:
+        configure_shared_clients(args, pools)
+        manager = JobManager(args, args.jobs_dir, pools, max_jobs=args.service_jobs)
+        server = make_server(manager, args.host, args.port)
+        host, port = server.server_address[:2]
+        print(f"--- Render service listening on http://{host}:{port} (jobs in {args.jobs_dir}) ---")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down the render service.")
+        finally:
+            server.server_close()
+            manager.shutdown()
@@ -0,0 +1,46 @@
+# src/utils/ffmpeg.py
+
+import json
+import os
+import shutil
+import subprocess
+
+def get_ffmpeg_exe():
+    """Returns the ffmpeg binary bundled with moviepy (imageio-ffmpeg), or 'ffmpeg' from PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return shutil.which('ffmpeg') or 'ffmpeg'
+
+def run_ffmpeg(ffmpeg_args, timeout=None):
+    """
+    Runs ffmpeg with the given arguments, overwriting outputs.
+    Raises subprocess.CalledProcessError (with ffmpeg's stderr) on failure, or
+    subprocess.TimeoutExpired after killing ffmpeg if it runs past `timeout` seconds.
+    """
+    command = [get_ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-y'] + list(ffmpeg_args)
+    return subprocess.run(command, check=True, capture_output=True, text=True, timeout=timeout)
+
+def get_ffprobe_exe():
+    """Returns an ffprobe binary from PATH or next to the ffmpeg binary, or None if there is none."""
+    ffprobe = shutil.which('ffprobe')
+    if ffprobe:
+        return ffprobe
+    candidate = os.path.join(os.path.dirname(get_ffmpeg_exe()), 'ffprobe')
+    return candidate if os.path.exists(candidate) else None
+
+def probe_streams(path):
+    """
+    Returns ffprobe's stream and format information for a media file as a dict,
+    or None if ffprobe is unavailable or the file cannot be probed.
+    """
+    ffprobe = get_ffprobe_exe()
+    if not ffprobe:
+        return None
+    command = [ffprobe, '-v', 'error', '-show_streams', '-show_format', '-of', 'json', path]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return json.loads(result.stdout)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return None
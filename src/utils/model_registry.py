@@ -0,0 +1,157 @@
+# src/utils/model_registry.py
+
+import gc
+import os
+import threading
+import time
+
+import config
+
+def _current_rss_bytes():
+    """Returns the resident set size of this process in bytes, or None if it cannot be read."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+class ModelRegistry:
+    """
+    Owns every model used by the pipeline.
+    Each model is loaded lazily, exactly once per process, the first time it is
+    requested; later calls return the warm instance. Load time and the resident
+    memory added by each load are recorded for reporting; loads run one at a
+    time so a model's memory figure never includes another model loading.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        self._optional = set()
+        # Guards loads, unloads and stats; re-entrant because a loader may get() another model
+        self._lock = threading.RLock()
+
+    def register(self, name, loader, optional=False):
+        """
+        Registers a loader callable. The loader receives the requested variant (or None).
+        Optional models depend on packages that need not be installed.
+        """
+        self._loaders[name] = loader
+        if optional:
+            self._optional.add(name)
+
+    def _key(self, name, variant):
+        return name if variant is None else f"{name}:{variant}"
+
+    def get(self, name, variant=None):
+        """Returns the model `name` (optionally a specific variant), loading it on first use."""
+        key = self._key(name, variant)
+        model = self._models.get(key) # Lock-free fast path for warm models
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise ValueError(f"Unknown model: {name}")
+
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            rss_before = _current_rss_bytes()
+            start = time.perf_counter()
+            model = self._loaders[name](variant)
+            load_seconds = time.perf_counter() - start
+            rss_after = _current_rss_bytes()
+            self._models[key] = model
+            self._stats[key] = {
+                'model': key,
+                'load_seconds': load_seconds,
+                'rss_bytes': rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            }
+            return model
+
+    def is_loaded(self, name, variant=None):
+        return self._key(name, variant) in self._models
+
+    def warm_up(self, names=None):
+        """
+        Loads the given models ahead of time. `names` holds model names or
+        (name, variant) tuples; all registered models are loaded when omitted,
+        skipping optional models whose packages aren't installed.
+        """
+        for entry in (names if names is not None else list(self._loaders)):
+            name, variant = entry if isinstance(entry, tuple) else (entry, None)
+            try:
+                self.get(name, variant)
+            except ImportError as e:
+                if name not in self._optional:
+                    raise
+                print(f"Skipping optional model {name}: {e}")
+
+    def unload(self, name=None, variant=None):
+        """Drops a loaded model (or every model when `name` is omitted) so its memory can be reclaimed."""
+        with self._lock:
+            if name is None:
+                keys = list(self._models)
+            else:
+                keys = [self._key(name, variant)]
+            for key in keys:
+                self._models.pop(key, None)
+                self._stats.pop(key, None)
+        gc.collect()
+
+    def report(self):
+        """Returns load time and resident memory for every loaded model."""
+        with self._lock:
+            return [dict(stats) for stats in self._stats.values()]
+
+    def print_report(self):
+        """Prints a table of load time and resident memory per loaded model."""
+        print(f"{'Model':<55} {'Load (s)':>10} {'RSS (MB)':>10}")
+        for stats in self.report():
+            rss = f"{stats['rss_bytes'] / (1024 * 1024):.1f}" if stats['rss_bytes'] is not None else "n/a"
+            print(f"{stats['model']:<55} {stats['load_seconds']:>10.2f} {rss:>10}")
+
+def _load_spacy(variant):
+    import spacy
+    model_name = variant or config.SPACY_MODEL
+    try:
+        return spacy.load(model_name)
+    except OSError:
+        print(f"Downloading spaCy model: {model_name}")
+        spacy.cli.download(model_name)
+        return spacy.load(model_name)
+
+def _load_emotion(variant):
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=variant or config.EMOTION_MODEL, truncation=True, max_length=512)
+
+def _load_vader(variant):
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    try:
+        return SentimentIntensityAnalyzer()
+    except LookupError:
+        import nltk
+        print("Downloading vader_lexicon for sentiment analysis...")
+        nltk.download('vader_lexicon')
+        return SentimentIntensityAnalyzer()
+
+def _load_spellchecker(variant):
+    from spellchecker import SpellChecker
+    return SpellChecker()
+
+def _load_profanity(variant):
+    # profanity-check exposes its trained model through module-level predict()
+    import profanity_check
+    return profanity_check
+
+model_registry = ModelRegistry()
+model_registry.register('spacy', _load_spacy)
+model_registry.register('emotion', _load_emotion)
+model_registry.register('vader', _load_vader)
+model_registry.register('spellchecker', _load_spellchecker)
+model_registry.register('profanity', _load_profanity, optional=True)
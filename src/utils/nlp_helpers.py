@@ -0,0 +1,13 @@
+# src/utils/nlp_helpers.py
+
+def as_doc(text_or_doc, nlp=None):
+    """
+    Returns a parsed spaCy Doc (or Span) for the input.
+    Raw text is run through `nlp`; an existing Doc or Span is returned as-is
+    so callers never re-tokenize text that has already been parsed.
+    """
+    if isinstance(text_or_doc, str):
+        if nlp is None:
+            raise ValueError("A spaCy pipeline is required to parse raw text.")
+        return nlp(text_or_doc)
+    return text_or_doc
@@ -0,0 +1,129 @@
+# src/utils/profiling.py
+
+import cProfile
+import os
+import threading
+import time
+
+from pipeline.runner import Stage
+
+def _start_profile():
+    """Returns an enabled cProfile.Profile, or None if another profiler is active on this interpreter."""
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows a single active cProfile per interpreter
+        return None
+    return profile
+
+class PhaseProfiler:
+    """
+    Profiles a run phase by phase. Each phase gets its own cProfile session,
+    dumped to `<profile_dir>/<NN>_<phase>.prof`, and its wall and CPU time are
+    collected for a summary table. Pipeline stages run on worker threads, which
+    a main-thread profile doesn't see, so `wrap_stages` profiles each stage call
+    on its worker and merges the result into the current phase.
+    """
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+        self.phases = []
+        self.stage_times = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    def start_phase(self, name):
+        """Ends the running phase, if any, and starts profiling `name`."""
+        self.stop_phase()
+        self._current = {
+            'name': name,
+            'profile': _start_profile(),
+            'worker_profiles': [],
+            'wall_start': time.perf_counter(),
+            'cpu_start': time.process_time(),
+        }
+
+    def stop_phase(self):
+        phase = self._current
+        if phase is None:
+            return
+        if phase['profile']:
+            phase['profile'].disable()
+        phase['wall'] = time.perf_counter() - phase['wall_start']
+        phase['cpu'] = time.process_time() - phase['cpu_start']
+        self.phases.append(phase)
+        self._current = None
+
+    def wrap_stages(self, stages):
+        """Returns copies of `stages` whose calls are profiled on the worker threads."""
+        return [Stage(stage.name, self._profiled(stage.name, stage.func), stage.after) for stage in stages]
+
+    def _profiled(self, stage_name, func):
+        def run(scene_key, context):
+            phase = self._current
+            profile = _start_profile()
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return func(scene_key, context)
+            finally:
+                wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+                if profile:
+                    profile.disable()
+                with self._lock:
+                    totals = self.stage_times.setdefault(stage_name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+                    totals['calls'] += 1
+                    totals['wall'] += wall
+                    totals['cpu'] += cpu
+                    if profile and phase is not None:
+                        phase['worker_profiles'].append(profile)
+        return run
+
+    def finish(self):
+        """Ends the last phase, writes the .prof files and prints the summary table."""
+        import pstats # Slow to import; only needed once profiling is done
+        self.stop_phase()
+        if not self.phases:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        for index, phase in enumerate(self.phases, start=1):
+            profiles = [profile for profile in [phase['profile']] + phase['worker_profiles'] if profile]
+            if not profiles:
+                continue
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            phase['path'] = os.path.join(self.profile_dir, f"{index:02d}_{phase['name']}.prof")
+            stats.dump_stats(phase['path'])
+
+        table = self.summary_table()
+        with open(os.path.join(self.profile_dir, "summary.txt"), 'w', encoding='utf-8') as f:
+            f.write(table + "\n")
+        print("\n--- Profile (sorted by wall time) ---")
+        print(table)
+        print(f"Per-phase profiles saved in: {self.profile_dir}")
+
+    def summary_table(self):
+        """Phases, then per-stage totals, each sorted by wall time."""
+        rows = [(phase['name'], phase['wall'], phase['cpu']) for phase in sorted(self.phases, key=lambda phase: phase['wall'], reverse=True)]
+        rows += [(f"  stage:{name} ({totals['calls']} calls)", totals['wall'], totals['cpu'])
+                 for name, totals in sorted(self.stage_times.items(), key=lambda item: item[1]['wall'], reverse=True)]
+        width = max(len(name) for name, _, _ in rows)
+        lines = [f"{'phase':<{width}}  {'wall (s)':>10}  {'cpu (s)':>10}"]
+        lines += [f"{name:<{width}}  {wall:>10.3f}  {cpu:>10.3f}" for name, wall, cpu in rows]
+        return "\n".join(lines)
+
+class NullProfiler:
+    """Stands in for PhaseProfiler when profiling is off."""
+
+    def start_phase(self, name):
+        pass
+
+    def stop_phase(self):
+        pass
+
+    def wrap_stages(self, stages):
+        return stages
+
+    def finish(self):
+        pass
@@ -0,0 +1,80 @@
+# src/utils/rate_limiter.py
+
+import threading
+import time
+from collections.abc import Mapping
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by concurrent callers.
+    The bucket holds up to `max_requests` tokens and refills continuously over
+    `window_seconds`, so bursts up to the limit proceed immediately and callers
+    only wait once the budget is spent. Server-reported limits
+    (X-RateLimit-Remaining / X-RateLimit-Reset) can tighten the bucket.
+    """
+
+    def __init__(self, max_requests, window_seconds, clock=time.monotonic, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self.configure(max_requests, window_seconds)
+
+    def configure(self, max_requests, window_seconds):
+        """Sets the budget to `max_requests` per `window_seconds` and refills the bucket."""
+        if max_requests <= 0 or window_seconds <= 0:
+            raise ValueError("max_requests and window_seconds must be positive.")
+        with self._lock:
+            self.max_requests = max_requests
+            self.window_seconds = window_seconds
+            self._tokens = float(max_requests)
+            self._updated = self._clock()
+
+    def _refill(self, now):
+        # Caller holds `_lock`
+        elapsed = now - self._updated
+        if elapsed > 0:
+            refill_rate = self.max_requests / self.window_seconds
+            self._tokens = min(float(self.max_requests), self._tokens + elapsed * refill_rate)
+            self._updated = now
+
+    def acquire(self):
+        """Blocks until a request may be sent, then consumes one token."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                refill_rate = self.max_requests / self.window_seconds
+                wait = max(self._blocked_until - now, (1 - self._tokens) / refill_rate)
+            self._sleep(wait)
+
+    def block_for(self, seconds):
+        """Stops all callers for `seconds` (e.g. after an HTTP 429)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def update_from_headers(self, headers):
+        """
+        Applies the server's view of the quota. The bucket never holds more
+        tokens than the server says remain, and an exhausted quota blocks
+        callers until the reported reset.
+        """
+        if not isinstance(headers, Mapping):
+            return
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset_seconds = float(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, float(max(remaining, 0)))
+            if remaining <= 0:
+                self._blocked_until = max(self._blocked_until, now + reset_seconds)
@@ -0,0 +1,98 @@
+# src/utils/tracing.py
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Tracer:
+    """
+    Records timed spans in Chrome Trace Event format, viewable in
+    chrome://tracing or Perfetto. Each span is a complete ('X') event on the
+    track of the thread that ran it; threads are named after their worker pool.
+    Recording is off until `enable()` so untraced runs pay only a flag check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events = []
+        self._named_threads = set()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self):
+        with self._lock:
+            self.enabled = True
+            self._events = []
+            self._named_threads = set()
+            self._origin = time.perf_counter()
+        self._add_metadata("process_name", 0, {'name': "video_creation_cli"})
+
+    def disable(self):
+        self.enabled = False
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _add_metadata(self, name, tid, args):
+        with self._lock:
+            self._events.append({'name': name, 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': args})
+
+    def _thread_id(self):
+        """Returns the current thread's track id, naming the track the first time it's seen."""
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._events.append({'name': "thread_name", 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                                     'args': {'name': threading.current_thread().name}})
+        return tid
+
+    @contextmanager
+    def span(self, name, cat="pipeline", **args):
+        """Records the enclosed block as one span; `args` show up in the viewer's details pane."""
+        if not self.enabled:
+            yield args
+            return
+        tid = self._thread_id()
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            event = {
+                'name': name, 'cat': cat, 'ph': 'X',
+                'ts': start, 'dur': self._now_us() - start,
+                'pid': os.getpid(), 'tid': tid,
+            }
+            if args:
+                event['args'] = args
+            with self._lock:
+                self._events.append(event)
+
+    def traced(self, name, cat="pipeline"):
+        """Decorator that records every call of the function as a span."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, cat):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def save(self, path):
+        """Writes the recorded events to `path` as a Chrome trace JSON file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
+        print(f"Trace saved to: {path}")
+
+# Shared by every module so spans from all stages land on one timeline
+tracer = Tracer()
@@ -1,6 +1,7 @@
 # video_creation_cli/tests/test_analysis.py
 
 import unittest
+from unittest.mock import patch
 import spacy
 import sys
 import os
@@ -10,8 +11,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 
 from analysis.entities import extract_text, check_spelling, identify_entities, segment_text_into_scenes
 from analysis.sentiment import analyze_sentiment
-from analysis.emotion import analyze_emotion
+from analysis.emotion import analyze_emotion, analyze_emotion_batch
 from analysis.pragmatics import analyze_pragmatics
+from analysis.script import AnalyzedScript
+from analysis.batch import analyze_scenes
 from config import SPACY_MODEL, EMOTION_MODEL
 
 class TestAnalysis(unittest.TestCase):
@@ -66,6 +69,33 @@ class TestAnalysis(unittest.TestCase):
         # The model is likely to return 'joy' or 'love'
         self.assertIn(emotion.get('label'), ['joy', 'love', 'optimism'])
 
+    def test_analyze_emotion_batch_preserves_order(self):
+        texts = [
+            "I am so happy and excited today.",
+            "I am terrified, something is hiding in the dark woods and it has been following me all night long.",
+            "This is wonderful!"
+        ]
+        emotions = analyze_emotion_batch(texts, EMOTION_MODEL, batch_size=2)
+        self.assertEqual(len(emotions), len(texts))
+        for text, emotion in zip(texts, emotions):
+            self.assertEqual(emotion.get('label'), analyze_emotion(text, EMOTION_MODEL).get('label'))
+
+    def test_analyze_emotion_batch_failure_is_per_scene(self):
+        class FlakyAnalyzer:
+            def tokenizer(self, texts, truncation, max_length):
+                return {'input_ids': [text.split() for text in texts]}
+
+            def __call__(self, texts, batch_size=None):
+                texts = [texts] if isinstance(texts, str) else texts
+                if any("broken" in text for text in texts):
+                    raise RuntimeError("inference failed")
+                return [{'label': 'joy'} for _ in texts]
+
+        texts = ["a", "a b", "a b broken", "a b c d"]
+        with patch('analysis.emotion._get_emotion_analyzer', return_value=FlakyAnalyzer()):
+            results = analyze_emotion_batch(texts, EMOTION_MODEL, batch_size=2)
+        self.assertEqual(results, [{'label': 'joy'}, {'label': 'joy'}, {}, {'label': 'joy'}])
+
     def test_analyze_pragmatics(self):
         text = "This is a statement. Is this a question? This is an exclamation!"
         pragmatics = analyze_pragmatics(text, self.nlp)
@@ -73,5 +103,36 @@ class TestAnalysis(unittest.TestCase):
         self.assertEqual(pragmatics['sentence_types']['interrogative'], 1)
         self.assertEqual(pragmatics['sentence_types']['exclamatory'], 1)
 
+    def test_analyzed_script_shares_doc(self):
+        text = "The forest was quiet. Is anyone there? Run now!\n\nThe city lights glow."
+        script = AnalyzedScript(text, self.nlp)
+        self.assertEqual(script.scene_texts, segment_text_into_scenes(text, self.nlp))
+        for scene_span in script.scenes.values():
+            self.assertIs(scene_span.doc, script.doc)
+        pragmatics = analyze_pragmatics(script.scenes['S1'])
+        self.assertEqual(pragmatics['sentence_types']['interrogative'], 1)
+        entities = identify_entities(script.scenes['S1'])
+        self.assertIn("forest", entities['nouns'])
+        self.assertIn("forest", script.overall_settings['locations'])
+
+    def test_analyzed_script_parses_paragraphs_in_parallel(self):
+        text = "The forest was quiet. Is anyone there?\n\n\nRun now! The city lights glow.\n\nThe end.\n"
+        serial = AnalyzedScript(text, self.nlp)
+        parallel = AnalyzedScript(text, self.nlp, batch_size=1, n_process=2)
+        self.assertEqual(parallel.doc.text, text)
+        self.assertEqual(parallel.scene_texts, serial.scene_texts)
+        for scene_span in parallel.scenes.values():
+            self.assertIs(scene_span.doc, parallel.doc)
+
+    def test_analyze_scenes_batch(self):
+        scenes = {"S1": "The quick brown fox jumps over the lazy dog.", "S2": "Is this a question?"}
+        piped = analyze_scenes(scenes, self.nlp, batch_size=2, n_process=1)
+        self.assertEqual(list(piped.keys()), ["S1", "S2"])
+        self.assertEqual(piped["S1"]["scene_text"], scenes["S1"])
+        self.assertIn("fox", piped["S1"]["analysis"]["entities"]["nouns"])
+        self.assertEqual(piped["S2"]["analysis"]["pragmatics"]["sentence_types"]["interrogative"], 1)
+        for key in ['spell_check', 'sentiment', 'emotion', 'pragmatics', 'entities']:
+            self.assertIn(key, piped["S1"]["analysis"])
+
 if __name__ == '__main__':
     unittest.main()
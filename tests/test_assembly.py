@@ -0,0 +1,123 @@
+# video_creation_cli/tests/test_assembly.py
+
+import unittest
+from unittest.mock import patch
+import shutil
+import subprocess
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.assembly import write_concat_list, clips_are_concat_compatible, assemble_final_video
+from assets.narration import NarrationTrack
+from assets.render import render_frame_count, render_scene_clip
+from assets.video import ordered_scene_items
+import config
+
+HAS_FFMPEG = bool(shutil.which('ffmpeg') and shutil.which('ffprobe'))
+
+class TestAssembly(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        os.makedirs(self.test_output_dir, exist_ok=True)
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for root, dirs, files in os.walk(self.test_output_dir, topdown=False):
+            for name in files:
+                os.remove(os.path.join(root, name))
+            for name in dirs:
+                os.rmdir(os.path.join(root, name))
+        if os.path.exists(self.test_output_dir):
+            os.rmdir(self.test_output_dir)
+
+    def _lavfi(self, source, path, duration):
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-f', 'lavfi', '-i', source, '-t', str(duration), path], check=True)
+        return path
+
+    def test_ordered_scene_items(self):
+        data = {"S10": {}, "S2": {}, "S1": {}}
+        self.assertEqual([key for key, _ in ordered_scene_items(data)], ["S1", "S2", "S10"])
+
+    def test_write_concat_list(self):
+        list_path = write_concat_list(["a.mp4", "it's.mp4"], os.path.join(self.test_output_dir, "list.txt"))
+        with open(list_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "ffconcat version 1.0")
+        self.assertTrue(lines[1].endswith("a.mp4'"))
+        self.assertIn("it'\\''s.mp4", lines[2])
+
+    def test_write_concat_list_with_outpoints(self):
+        list_path = write_concat_list(["a.mp4", "b.mp4"], os.path.join(self.test_output_dir, "list.txt"), outpoints=[1.5, 2.25])
+        with open(list_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[2], "outpoint 1.500000")
+        self.assertEqual(lines[4], "outpoint 2.250000")
+
+    @patch('assets.assembly.create_final_video', return_value=("reencoded.mp4", 1.0))
+    @patch('assets.assembly.get_ffprobe_exe', return_value=None)
+    def test_missing_ffprobe_is_reported(self, mock_ffprobe, mock_reencode):
+        clip_path = os.path.join(self.test_output_dir, "S1_adjusted.mp4")
+        audio_path = os.path.join(self.test_output_dir, "S1.mp3")
+        for path in (clip_path, audio_path):
+            open(path, 'wb').close()
+        consolidated_data = {"S1": {"adjusted_video_info": {"path": clip_path, "duration": 1.0},
+                                    "audio_info": {"filename": audio_path, "duration": 1.0}}}
+        self.assertEqual(assemble_final_video(consolidated_data, self.test_output_dir, mode='copy'), (None, 0))
+        mock_reencode.assert_not_called()
+        self.assertEqual(assemble_final_video(consolidated_data, self.test_output_dir, mode='auto'), ("reencoded.mp4", 1.0))
+
+    @patch('assets.assembly.create_final_video', return_value=("reencoded.mp4", 2.0))
+    @patch('assets.assembly.run_ffmpeg')
+    @patch('assets.assembly.clips_are_concat_compatible', return_value=True)
+    @patch('assets.assembly.get_ffprobe_exe', return_value="ffprobe")
+    def test_short_clips_are_not_stream_copied(self, mock_ffprobe, mock_compatible, mock_run_ffmpeg, mock_reencode):
+        narration_path = os.path.join(self.test_output_dir, "narration.mp3")
+        consolidated_data = {}
+        for scene_key, frames in (("S1", 31), ("S2", 29)):
+            clip_path = os.path.join(self.test_output_dir, f"{scene_key}_adjusted.mp4")
+            audio_path = os.path.join(self.test_output_dir, f"{scene_key}.mp3")
+            for path in (clip_path, audio_path):
+                open(path, 'wb').close()
+            consolidated_data[scene_key] = {"adjusted_video_info": {"path": clip_path, "duration": 1.0, "frames": frames},
+                                            "audio_info": {"filename": audio_path, "duration": 1.0}}
+
+        def join(audio_paths, output_dir):
+            open(narration_path, 'wb').close()
+            return NarrationTrack(narration_path, 'mp3', [0.0, 1.0], 2.0)
+
+        with patch('assets.assembly.join_narration', side_effect=join):
+            # S2 rendered 29 frames but its scene needs 30
+            self.assertEqual(assemble_final_video(consolidated_data, self.test_output_dir, mode='copy'), (None, 0))
+            self.assertEqual(assemble_final_video(consolidated_data, self.test_output_dir, mode='auto'), ("reencoded.mp4", 2.0))
+        mock_run_ffmpeg.assert_not_called()
+        self.assertFalse(os.path.exists(narration_path))
+
+    @unittest.skipUnless(HAS_FFMPEG, "ffmpeg is not installed")
+    def test_stream_copy_assembly(self):
+        source_path = self._lavfi('testsrc2=size=320x240:rate=25', os.path.join(self.test_output_dir, "source.mp4"), 2)
+        consolidated_data = {}
+        for scene_key, duration in (("S1", 1.0), ("S2", 1.5)):
+            clip_path = os.path.join(self.test_output_dir, f"{scene_key}_adjusted.mp4")
+            audio_path = self._lavfi(f'sine=frequency=440:duration={duration}', os.path.join(self.test_output_dir, f"{scene_key}.mp3"), duration)
+            self.assertTrue(render_scene_clip(source_path, clip_path, duration, (108, 192), 30))
+            consolidated_data[scene_key] = {
+                "adjusted_video_info": {"path": clip_path, "duration": duration, "frames": render_frame_count(duration, 30)},
+                "audio_info": {"filename": audio_path, "duration": duration}
+            }
+
+        clip_paths = [scene["adjusted_video_info"]["path"] for scene in consolidated_data.values()]
+        self.assertTrue(clips_are_concat_compatible(clip_paths))
+        self.assertFalse(clips_are_concat_compatible(clip_paths + [source_path]))
+
+        final_video_path, total_duration = assemble_final_video(consolidated_data, self.test_output_dir, mode='copy')
+        self.assertEqual(final_video_path, os.path.join(self.test_output_dir, config.FINAL_VIDEO_FILE))
+        self.assertTrue(os.path.exists(final_video_path))
+        self.assertAlmostEqual(total_duration, 2.5)
+
+if __name__ == '__main__':
+    unittest.main()
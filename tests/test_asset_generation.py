@@ -10,6 +10,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 
 from assets.audio import generate_audio
 from assets.video import generate_queries, search_videos, download_video
+from assets.downloader import Downloader
+from assets.search_cache import SearchCache
+from utils.rate_limiter import RateLimiter
 import config
 
 class TestAssetGeneration(unittest.TestCase):
@@ -82,6 +85,33 @@ class TestAssetGeneration(unittest.TestCase):
         self.assertEqual(results["hits"][0]["id"], 123)
 
     @patch('assets.video.requests.get')
+    def test_search_videos_retries_after_rate_limit(self, mock_get):
+        """Tests that an HTTP 429 response is retried once the rate limit resets."""
+        limited_response = MagicMock(status_code=429, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '0'})
+        ok_response = MagicMock(status_code=200, headers={'X-RateLimit-Remaining': '99', 'X-RateLimit-Reset': '60'})
+        ok_response.json.return_value = {"totalHits": 1, "hits": [{"id": 123}]}
+        mock_get.side_effect = [limited_response, ok_response]
+
+        results = search_videos("test query", "fake_api_key", rate_limiter=RateLimiter(10, 1))
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(results["hits"][0]["id"], 123)
+
+    @patch('assets.video.requests.get')
+    def test_search_videos_uses_cache(self, mock_get):
+        """Tests that a repeated search is served from the search cache without an API call."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"totalHits": 1, "hits": [{"id": 123}]}
+        mock_get.return_value = mock_response
+        cache = SearchCache(os.path.join(self.test_output_dir, "search.sqlite3"))
+
+        first = search_videos("test query", "fake_api_key", cache=cache)
+        second = search_videos("Test  Query", "fake_api_key", cache=cache)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(first, second)
+
+    @patch('assets.downloader.requests.Session.get')
     def test_download_video(self, mock_get):
         """Tests the video download function."""
         # Configure the mock
@@ -100,5 +130,23 @@ class TestAssetGeneration(unittest.TestCase):
             content = f.read()
             self.assertEqual(content, b'somevideodata')
 
+    def test_downloader_download_many(self):
+        """Tests parallel downloads over a shared session and the throughput report."""
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: MagicMock(iter_content=MagicMock(return_value=[url.encode()]))
+        downloader = Downloader(max_workers=2, chunk_size=4, session=session)
+
+        jobs = [(f"http://fakeurl.com/{i}", os.path.join(self.test_output_dir, f"clip_{i}.mp4")) for i in range(3)]
+        results = downloader.download_many(jobs)
+
+        self.assertEqual(session.get.call_count, 3)
+        for (url, save_path), stats in zip(jobs, results):
+            self.assertEqual(stats['path'], save_path)
+            with open(save_path, 'rb') as f:
+                self.assertEqual(f.read(), url.encode())
+        summary = downloader.summary()
+        self.assertEqual(summary['downloads'], 3)
+        self.assertEqual(summary['bytes'], sum(len(url) for url, _ in jobs))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+# video_creation_cli/tests/test_batch.py
+
+import unittest
+from unittest.mock import patch
+import argparse
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from main import build_parser, find_batch_scripts, batch_job_args
+
+class TestBatchMode(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.batch_dir = os.path.join(self.test_dir, "scripts")
+        os.makedirs(self.batch_dir, exist_ok=True)
+        for name in ("b_story.txt", "a_story.txt", "notes.md"):
+            with open(os.path.join(self.batch_dir, name), 'w', encoding='utf-8') as f:
+                f.write("A sunny day in the park.")
+        os.makedirs(os.path.join(self.batch_dir, "nested.txt"), exist_ok=True)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_find_batch_scripts(self):
+        scripts = find_batch_scripts(self.batch_dir)
+        self.assertEqual([os.path.basename(path) for path in scripts], ["a_story.txt", "b_story.txt"])
+
+    def test_batch_job_args_use_own_output_dir(self):
+        args = build_parser().parse_args(["--batch", self.batch_dir, "--output_dir", self.test_dir, "--api_key", "k"])
+        script_path = os.path.join(self.batch_dir, "a_story.txt")
+        job_args = batch_job_args(args, script_path)
+
+        self.assertEqual(job_args.script_path, script_path)
+        self.assertEqual(job_args.output_dir, os.path.join(self.test_dir, "a_story"))
+        self.assertEqual(job_args.api_key, "k")
+        # The batch arguments themselves are left untouched
+        self.assertIsNone(args.script_path)
+        self.assertEqual(args.output_dir, self.test_dir)
+
+    def test_invalid_stage_workers_are_rejected_by_the_parser(self):
+        parser = build_parser()
+        self.assertEqual(parser.parse_args(["--stage_workers", "tts=4,render=2"]).stage_workers, "tts=4,render=2")
+        for spec in ("tts=x", "render=0"):
+            with patch('sys.stderr'), self.assertRaises(SystemExit):
+                parser.parse_args(["--stage_workers", spec])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# video_creation_cli/tests/test_clip_cache.py
+
+import unittest
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.clip_cache import ClipCache
+
+class FakeDownloader:
+    """Writes a fixed payload instead of downloading, and counts calls."""
+
+    def __init__(self, payload=b'clip-bytes'):
+        self.payload = payload
+        self.calls = 0
+
+    def download(self, url, save_path):
+        self.calls += 1
+        with open(save_path, 'wb') as f:
+            f.write(self.payload)
+
+class TestClipCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        self.run_dir = os.path.join(self.test_output_dir, "run")
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.cache = ClipCache(os.path.join(self.test_output_dir, "cache"))
+        self.downloader = FakeDownloader()
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for root, dirs, files in os.walk(self.test_output_dir, topdown=False):
+            for name in files:
+                os.remove(os.path.join(root, name))
+            for name in dirs:
+                os.rmdir(os.path.join(root, name))
+        if os.path.exists(self.test_output_dir):
+            os.rmdir(self.test_output_dir)
+
+    def test_miss_then_hit(self):
+        first_path = os.path.join(self.run_dir, "S1_raw.mp4")
+        second_path = os.path.join(self.run_dir, "S2_raw.mp4")
+
+        self.assertFalse(self.cache.fetch(123, 'large', "http://fake/123", first_path, self.downloader))
+        self.assertTrue(self.cache.fetch(123, 'large', "http://fake/123", second_path, self.downloader))
+
+        self.assertEqual(self.downloader.calls, 1)
+        with open(second_path, 'rb') as f:
+            self.assertEqual(f.read(), b'clip-bytes')
+        # Hits are hard links to the cached clip, not copies
+        cached_path = self.cache.lookup(123, 'large')
+        self.assertTrue(os.path.samefile(cached_path, second_path))
+
+    def test_renditions_are_cached_separately(self):
+        self.cache.fetch(123, 'large', "http://fake/l", os.path.join(self.run_dir, "a.mp4"), self.downloader)
+        self.cache.fetch(123, 'medium', "http://fake/m", os.path.join(self.run_dir, "b.mp4"), self.downloader)
+        self.assertEqual(self.downloader.calls, 2)
+
+    def test_corrupt_entry_is_redownloaded(self):
+        self.cache.fetch(7, 'large', "http://fake/7", os.path.join(self.run_dir, "a.mp4"), self.downloader)
+        os.remove(os.path.join(self.run_dir, "a.mp4"))
+        with open(self.cache.lookup(7, 'large'), 'ab') as f:
+            f.write(b'garbage')
+
+        self.assertIsNone(self.cache.lookup(7, 'large'))
+        self.assertFalse(self.cache.fetch(7, 'large', "http://fake/7", os.path.join(self.run_dir, "b.mp4"), self.downloader))
+        self.assertEqual(self.downloader.calls, 2)
+
+    def test_checksum_verification(self):
+        cache = ClipCache(self.cache.root, verify_hash=True)
+        cache.fetch(8, 'large', "http://fake/8", os.path.join(self.run_dir, "a.mp4"), self.downloader)
+        os.remove(os.path.join(self.run_dir, "a.mp4"))
+        with open(cache.lookup(8, 'large'), 'r+b') as f:
+            f.write(b'X')
+        self.assertIsNone(cache.lookup(8, 'large'))
+
+    def test_size_mismatch_is_not_cached(self):
+        with self.assertRaises(OSError):
+            self.cache.fetch(9, 'large', "http://fake/9", os.path.join(self.run_dir, "a.mp4"), self.downloader, expected_size=999)
+        self.assertIsNone(self.cache.lookup(9, 'large'))
+
+if __name__ == '__main__':
+    unittest.main()
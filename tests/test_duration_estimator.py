@@ -0,0 +1,132 @@
+# video_creation_cli/tests/test_duration_estimator.py
+
+import unittest
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.duration_estimator import DurationEstimator, fit_line
+from pipeline.runner import Rerun
+from pipeline.stages import RunContext, _needs_reselection, _plan_candidates, render_stage
+import config
+
+OPTIONS = {'engine': 'gtts', 'voice': None, 'lang': 'en', 'speed': 1.0}
+
+def sample_text(chars):
+    return "x" * chars
+
+class TestDurationEstimator(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.history_path = os.path.join(self.test_dir, "durations.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_fit_line(self):
+        intercept, slope = fit_line([(10, 1.5), (20, 2.5), (40, 4.5)])
+        self.assertAlmostEqual(intercept, 0.5)
+        self.assertAlmostEqual(slope, 0.1)
+        self.assertIsNone(fit_line([(10, 1.0), (10, 2.0)]))
+
+    def test_default_rate_until_calibrated(self):
+        estimator = DurationEstimator(self.history_path)
+        text = sample_text(70)
+        self.assertAlmostEqual(estimator.estimate(text, OPTIONS), 70 / config.NARRATION_CHARS_PER_SECOND)
+        self.assertAlmostEqual(estimator.estimate(text, dict(OPTIONS, speed=2.0)), 35 / config.NARRATION_CHARS_PER_SECOND)
+
+    def test_calibrates_per_engine_and_persists(self):
+        estimator = DurationEstimator(self.history_path)
+        for chars in (20, 40, 60, 80, 100, 120):
+            estimator.record(sample_text(chars), OPTIONS, 0.3 + chars * 0.08)
+        self.assertAlmostEqual(estimator.estimate(sample_text(200), OPTIONS), 0.3 + 200 * 0.08)
+
+        other = dict(OPTIONS, engine='espeak')
+        self.assertAlmostEqual(estimator.estimate(sample_text(70), other), 70 / config.NARRATION_CHARS_PER_SECOND)
+
+        reloaded = DurationEstimator(self.history_path)
+        self.assertAlmostEqual(reloaded.estimate(sample_text(200), OPTIONS), 0.3 + 200 * 0.08)
+
+    def test_repeated_text_is_recorded_once(self):
+        estimator = DurationEstimator(self.history_path)
+        estimator.record("Thanks for watching!", OPTIONS, 1.5)
+        estimator.record("Thanks  for watching!", OPTIONS, 1.5)
+        with open(self.history_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    @patch('config.DURATION_HISTORY_SAMPLES', 3)
+    def test_history_keeps_only_recent_samples(self):
+        estimator = DurationEstimator(self.history_path)
+        for chars in range(10, 110, 10):
+            estimator.record(sample_text(chars), OPTIONS, chars * 0.1)
+            with open(self.history_path) as f:
+                self.assertLessEqual(len(f.readlines()), 6)
+
+        with open(self.history_path, 'a') as f:
+            f.write("torn li\n" * 10)
+        DurationEstimator(self.history_path)
+        with open(self.history_path) as f:
+            kept = [json.loads(line)['chars'] for line in f]
+        self.assertEqual(kept, [80, 90, 100])
+
+class TestDurationPlanning(unittest.TestCase):
+
+    def make_context(self, scene_text="A" * 140):
+        args = SimpleNamespace(output_dir="test_output")
+        estimator = DurationEstimator(os.path.join("test_output", "missing", "durations.jsonl"))
+        context = RunContext(args, {'scene_1': {'scene_text': scene_text}}, {}, duration_estimator=estimator)
+        context.estimate_durations(OPTIONS)
+        return context
+
+    def test_planned_duration_uses_estimate_until_tts_is_done(self):
+        context = self.make_context()
+        self.assertAlmostEqual(context.planned_duration('scene_1'), 140 / config.NARRATION_CHARS_PER_SECOND)
+        context.consolidated_analysis['scene_1']['audio_info'] = {'filename': "a.mp3", 'duration': 4.2}
+        self.assertEqual(context.planned_duration('scene_1'), 4.2)
+
+    def test_plan_candidates_prefers_covering_clips(self):
+        candidates = [{'id': 1, 'duration': 5}, {'id': 2, 'duration': 12}, {'id': 3, 'duration': None}, {'id': 4, 'duration': 30}]
+        self.assertEqual([c['id'] for c in _plan_candidates(candidates, 10)], [2, 4, 1, 3])
+        self.assertEqual([c['id'] for c in _plan_candidates(candidates, None)], [1, 2, 3, 4])
+
+    @patch('assets.render.render_scene_clip')
+    def test_selection_is_corrected_only_beyond_tolerance(self, mock_render):
+        os.makedirs("test_output", exist_ok=True)
+        self.addCleanup(shutil.rmtree, "test_output")
+        context = self.make_context()
+        state = context.scene_state['scene_1']
+        short, longer = {'id': 1, 'duration': 8}, {'id': 2, 'duration': 20}
+        raw_path = os.path.join("test_output", "short.mp4")
+        open(raw_path, 'wb').close()
+        state.update(candidates=[short, longer], selected=short, raw_path=raw_path, planned_duration=7.5)
+        context.claim_video(1)
+        scene_data = context.consolidated_analysis['scene_1']
+
+        scene_data['audio_info'] = {'duration': 8.2}
+        self.assertFalse(_needs_reselection('scene_1', context))
+
+        scene_data['audio_info'] = {'duration': 15.0}
+        self.assertTrue(_needs_reselection('scene_1', context))
+        context.claim_video(2) # No longer available to this scene
+        self.assertFalse(_needs_reselection('scene_1', context))
+        context.release_video(2)
+
+        # The replacement is downloaded by download_stage on its own pool, not by the render worker
+        result = render_stage('scene_1', context)
+        self.assertIsInstance(result, Rerun)
+        self.assertEqual(result.stage_names, ('download',))
+        mock_render.assert_not_called()
+        self.assertNotIn('selected', state)
+        self.assertFalse(os.path.exists(raw_path))
+        self.assertFalse(context.is_claimed(1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+# video_creation_cli/tests/test_incremental.py
+
+import unittest
+import types
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.incremental import SceneStore, scene_fingerprints, split_reusable_analysis
+from pipeline.runner import Stage
+
+class FakeContext:
+    """The parts of pipeline.stages.RunContext that the scene store touches."""
+
+    def __init__(self, output_dir, consolidated_analysis):
+        self.consolidated_analysis = consolidated_analysis
+        self.scene_state = {scene_key: {} for scene_key in consolidated_analysis}
+        self.audio_dir = os.path.join(output_dir, "audio")
+        self.video_clips_dir = os.path.join(output_dir, "video_clips")
+        self.adjusted_clips_dir = os.path.join(output_dir, "adjusted_video_clips")
+        for directory in (self.audio_dir, self.video_clips_dir, self.adjusted_clips_dir):
+            os.makedirs(directory, exist_ok=True)
+        self.claimed = set()
+
+    def claim_video(self, video_id):
+        if video_id in self.claimed:
+            return False
+        self.claimed.add(video_id)
+        return True
+
+    def release_video(self, video_id):
+        self.claimed.discard(video_id)
+
+STAGES = [
+    Stage('tts', None),
+    Stage('search', None, after=('tts',)),
+    Stage('download', None, after=('search',)),
+    Stage('render', None, after=('tts', 'download')),
+]
+
+class TestIncrementalRendering(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        os.makedirs(self.test_output_dir, exist_ok=True)
+        self.args = types.SimpleNamespace(safesearch=False, video_type='film', per_page=200, order='latest',
+                                          pixabay_endpoint='https://pixabay.com/api/videos/',
+                                          tts_engine='gtts', tts_voice=None, tts_lang='en', tts_speed=1.0)
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for root, dirs, files in os.walk(self.test_output_dir, topdown=False):
+            for name in files:
+                os.remove(os.path.join(root, name))
+            for name in dirs:
+                os.rmdir(os.path.join(root, name))
+        if os.path.exists(self.test_output_dir):
+            os.rmdir(self.test_output_dir)
+
+    def _write(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _complete_scene(self, store, context, scene_key, fingerprints, video_id):
+        """Simulates the pipeline finishing every stage of a scene and publishing it."""
+        scene_data = context.consolidated_analysis[scene_key]
+        state = context.scene_state[scene_key]
+        scene_data['audio_info'] = {'filename': self._write(os.path.join(context.audio_dir, f"{scene_key}.mp3"), scene_data['scene_text']), 'duration': 2.0}
+        store.publish_stage(scene_key, 'tts', fingerprints, context)
+        scene_data['generated_queries'] = ["query"]
+        state['candidates'] = [{'id': video_id}]
+        store.publish_stage(scene_key, 'search', fingerprints, context)
+        state['selected'] = {'id': video_id}
+        state['planned_duration'] = 2.5
+        state['raw_path'] = self._write(os.path.join(context.video_clips_dir, f"{scene_key}_{video_id}_raw.mp4"), "raw")
+        store.publish_stage(scene_key, 'download', fingerprints, context)
+        scene_data['video_info'] = {'id': video_id}
+        scene_data['adjusted_video_info'] = {'path': self._write(os.path.join(context.adjusted_clips_dir, f"{scene_key}_adjusted.mp4"), "render"), 'duration': 2.0}
+        store.publish_stage(scene_key, 'render', fingerprints, context)
+
+    def test_fingerprints_only_change_downstream_of_edits(self):
+        base = scene_fingerprints("The forest.", {'locations': []}, self.args)
+        edited = scene_fingerprints("The dark forest.", {'locations': []}, self.args)
+        other_order = scene_fingerprints("The forest.", {'locations': []}, types.SimpleNamespace(**dict(vars(self.args), order='popular')))
+
+        self.assertEqual(base, scene_fingerprints("The forest.", {'locations': []}, self.args))
+        self.assertNotEqual(base['tts'], edited['tts'])
+        self.assertNotEqual(base['render'], edited['render'])
+        self.assertEqual(base['tts'], other_order['tts'])
+        self.assertNotEqual(base['search'], other_order['search'])
+
+    def test_only_changed_scene_is_regenerated(self):
+        store_dir = os.path.join(self.test_output_dir, "scene_cache")
+        overall_settings = {'locations': []}
+        first_run = {"S1": {"scene_text": "One."}, "S2": {"scene_text": "Two."}}
+        context = FakeContext(self.test_output_dir, first_run)
+        store = SceneStore(store_dir)
+        for index, scene_key in enumerate(first_run, start=1):
+            fingerprints = scene_fingerprints(first_run[scene_key]['scene_text'], overall_settings, self.args)
+            store.put('analysis', fingerprints['analysis'], {'entities': {}})
+            self._complete_scene(store, context, scene_key, fingerprints, video_id=index)
+        store.save()
+
+        # Second run: a new scene is inserted before "Two.", which shifts its key to S3
+        second_run = {"S1": {"scene_text": "One."}, "S2": {"scene_text": "Inserted."}, "S3": {"scene_text": "Two."}}
+        fingerprints = {key: scene_fingerprints(data['scene_text'], overall_settings, self.args) for key, data in second_run.items()}
+        store = SceneStore(store_dir)
+        reused, pending = split_reusable_analysis({key: data['scene_text'] for key, data in second_run.items()}, fingerprints, store)
+        self.assertEqual(sorted(reused), ["S1", "S3"])
+        self.assertEqual(pending, {"S2": "Inserted."})
+
+        context = FakeContext(self.test_output_dir, second_run)
+        completed = store.restore_scenes(STAGES, fingerprints, context)
+
+        self.assertEqual(completed["S1"], {'tts', 'search', 'download', 'render'})
+        self.assertEqual(completed["S3"], {'tts', 'search', 'download', 'render'})
+        self.assertEqual(completed["S2"], set())
+        with open(second_run["S3"]['audio_info']['filename']) as f:
+            self.assertEqual(f.read(), "Two.")
+        self.assertTrue(second_run["S3"]['adjusted_video_info']['path'].endswith("S3_adjusted.mp4"))
+        self.assertEqual(context.claimed, {1, 2})
+        self.assertEqual(context.scene_state["S3"]['planned_duration'], 2.5) # Kept with the selection for render-time checks
+
+    def test_save_drops_stale_results(self):
+        store_dir = os.path.join(self.test_output_dir, "scene_cache")
+        run = {"S1": {"scene_text": "One."}, "S2": {"scene_text": "Two."}}
+        context = FakeContext(self.test_output_dir, run)
+        store = SceneStore(store_dir)
+        fingerprints = {key: scene_fingerprints(data['scene_text'], {}, self.args) for key, data in run.items()}
+        for index, scene_key in enumerate(run, start=1):
+            store.put('analysis', fingerprints[scene_key]['analysis'], {'entities': {}})
+            self._complete_scene(store, context, scene_key, fingerprints[scene_key], video_id=index)
+        open(os.path.join(store_dir, "orphan.mp4"), 'w').close()
+
+        # "One." was edited out of the script
+        store.save([fingerprints["S2"]])
+
+        store = SceneStore(store_dir)
+        for stage_name in ('analysis', 'tts', 'search', 'download', 'render'):
+            self.assertIsNone(store.get(stage_name, fingerprints["S1"][stage_name]))
+            self.assertIsNotNone(store.get(stage_name, fingerprints["S2"][stage_name]))
+        kept = sorted(os.listdir(store_dir))
+        self.assertEqual(kept, sorted(["manifest.json", f"{fingerprints['S2']['tts']}.mp3",
+                                       f"{fingerprints['S2']['search']}_raw.mp4", f"{fingerprints['S2']['render']}.mp4"]))
+
+    def test_completed_stages_are_kept(self):
+        store = SceneStore(os.path.join(self.test_output_dir, "scene_cache"))
+        context = FakeContext(self.test_output_dir, {"S1": {"scene_text": "One."}})
+        fingerprints = {"S1": scene_fingerprints("One.", {}, self.args)}
+        completed = store.restore_scenes(STAGES, fingerprints, context, completed={"S1": {'tts'}})
+        self.assertEqual(completed, {"S1": {'tts'}})
+
+if __name__ == '__main__':
+    unittest.main()
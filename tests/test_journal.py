@@ -0,0 +1,59 @@
+# video_creation_cli/tests/test_journal.py
+
+import unittest
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.journal import RunJournal, hash_text
+
+class TestRunJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        os.makedirs(self.test_output_dir, exist_ok=True)
+        self.journal = RunJournal(os.path.join(self.test_output_dir, "run_journal.jsonl"))
+        self.journal.reset()
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for name in os.listdir(self.test_output_dir):
+            os.remove(os.path.join(self.test_output_dir, name))
+        os.rmdir(self.test_output_dir)
+
+    def test_empty_journal_has_nothing_to_resume(self):
+        self.assertIsNone(self.journal.load())
+        self.assertIsNone(RunJournal(os.path.join(self.test_output_dir, "missing.jsonl")).load())
+
+    def test_replay_stages(self):
+        analysis = {"S1": {"scene_text": "One.", "analysis": {}}, "S2": {"scene_text": "Two.", "analysis": {}}}
+        self.journal.record_analysis(hash_text("One. Two."), {"S1": "One.", "S2": "Two."}, {'locations': []}, analysis)
+        self.journal.record_stage("S1", "tts", {"audio_info": {"filename": "S1.mp3", "duration": 1.5}}, {})
+        self.journal.record_stage("S1", "search", {"generated_queries": ["q"]}, {"candidates": [{"id": 1}]})
+
+        progress = self.journal.load()
+        self.assertEqual(progress['script_hash'], hash_text("One. Two."))
+        self.assertEqual(progress['consolidated_analysis'], analysis)
+        self.assertEqual(progress['scene_progress']['S1']['stages'], ["tts", "search"])
+        self.assertEqual(progress['scene_progress']['S1']['state'], {"candidates": [{"id": 1}]})
+        self.assertNotIn("S2", progress['scene_progress'])
+
+    def test_torn_last_line_is_ignored(self):
+        self.journal.record_analysis("hash", {"S1": "One."}, {}, {"S1": {}})
+        self.journal.record_stage("S1", "tts", {"audio_info": {}}, {})
+        with open(self.journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"event": "stage", "scene_key": "S1", "sta')
+
+        progress = self.journal.load()
+        self.assertEqual(progress['scene_progress']['S1']['stages'], ["tts"])
+
+    def test_reset_discards_previous_run(self):
+        self.journal.record_analysis("hash", {}, {}, {})
+        self.journal.reset()
+        self.assertIsNone(self.journal.load())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# video_creation_cli/tests/test_model_registry.py
+
+import unittest
+import threading
+import time
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.model_registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.load_calls = []
+        self.registry = ModelRegistry()
+
+        def loader(variant):
+            self.load_calls.append(variant)
+            return {'variant': variant}
+
+        self.registry.register('fake', loader)
+
+    def test_lazy_single_load(self):
+        """Models are only loaded on first use and then reused."""
+        self.assertFalse(self.registry.is_loaded('fake'))
+        first = self.registry.get('fake')
+        second = self.registry.get('fake')
+        self.assertIs(first, second)
+        self.assertEqual(self.load_calls, [None])
+
+    def test_variants_are_loaded_separately(self):
+        self.registry.get('fake', 'a')
+        self.registry.get('fake', 'b')
+        self.registry.get('fake', 'a')
+        self.assertEqual(self.load_calls, ['a', 'b'])
+
+    def test_concurrent_get_loads_once(self):
+        threads = [threading.Thread(target=self.registry.get, args=('fake',)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.load_calls, [None])
+
+    def test_warm_up_and_unload(self):
+        self.registry.warm_up(['fake', ('fake', 'x')])
+        self.assertTrue(self.registry.is_loaded('fake'))
+        self.assertTrue(self.registry.is_loaded('fake', 'x'))
+        self.registry.unload('fake')
+        self.assertFalse(self.registry.is_loaded('fake'))
+        self.registry.get('fake')
+        self.assertEqual(self.load_calls, [None, 'x', None])
+
+    def test_warm_up_skips_missing_optional_models(self):
+        def missing(variant):
+            raise ImportError("No module named 'missing_package'")
+
+        self.registry.register('extra', missing, optional=True)
+        self.registry.warm_up()
+        self.assertTrue(self.registry.is_loaded('fake'))
+        self.assertFalse(self.registry.is_loaded('extra'))
+
+        self.registry.register('required', missing)
+        with self.assertRaises(ImportError):
+            self.registry.warm_up()
+
+    def test_loads_are_serialized(self):
+        active = []
+        overlaps = []
+
+        def slow(variant):
+            active.append(variant)
+            overlaps.append(len(active))
+            time.sleep(0.02)
+            active.remove(variant)
+            return variant
+
+        self.registry.register('slow', slow)
+        threads = [threading.Thread(target=self.registry.get, args=('slow', str(i))) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(max(overlaps), 1)
+
+    def test_unload_waits_for_a_running_load(self):
+        loading = threading.Event()
+        release = threading.Event()
+
+        def slow(variant):
+            loading.set()
+            release.wait(5)
+            return 'slow model'
+
+        self.registry.register('slow', slow)
+        loader = threading.Thread(target=self.registry.get, args=('slow',))
+        loader.start()
+        loading.wait(5)
+        unloader = threading.Thread(target=self.registry.unload, args=('slow',))
+        unloader.start()
+        unloader.join(0.05)
+        self.assertTrue(unloader.is_alive()) # Blocked until the load and its stats are complete
+        release.set()
+        loader.join()
+        unloader.join()
+        self.assertFalse(self.registry.is_loaded('slow'))
+        self.assertEqual(self.registry.report(), [])
+
+    def test_report(self):
+        self.registry.get('fake')
+        report = self.registry.report()
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]['model'], 'fake')
+        self.assertGreaterEqual(report[0]['load_seconds'], 0)
+        self.assertIn('rss_bytes', report[0])
+
+    def test_unknown_model(self):
+        with self.assertRaises(ValueError):
+            self.registry.get('missing')
+
+if __name__ == '__main__':
+    unittest.main()
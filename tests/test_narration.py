@@ -0,0 +1,108 @@
+# video_creation_cli/tests/test_narration.py
+
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import subprocess
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.narration import NarrationTrack, concat_narration_frames, join_narration
+from assets.mp3_frames import mp3_duration
+from assets.audio import audio_duration
+from devtools.tts_server import SILENT_FRAME, SILENT_FRAME_HEADER, SILENT_FRAME_SECONDS
+import config
+
+# A LAME Info header frame (joint stereo: 32 bytes of side info) recording 576 samples of encoder delay and 1000 of padding
+LAME_INFO_FRAME = (SILENT_FRAME_HEADER + bytes(32) + b'Info' + bytes(116) + b'LAME3.100' + bytes(12)
+                   + bytes([0x24, 0x03, 0xE8])).ljust(len(SILENT_FRAME), b'\x00')
+MONO_22K_FRAME = bytes([0xFF, 0xF3, 0x80, 0xC4]) + bytes(204) # MPEG-2, 64 kbps, 22.05 kHz, mono
+
+class TestNarration(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_scene(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_frames_are_joined_with_exact_offsets(self):
+        paths = [
+            self.write_scene("S1.mp3", b'ID3\x04\x00\x00\x00\x00\x00\x0a' + bytes(10) + SILENT_FRAME * 3),
+            self.write_scene("S2.mp3", SILENT_FRAME * 5 + b'TAG' + bytes(125)),
+            self.write_scene("S3.mp3", SILENT_FRAME * 2),
+        ]
+        narration = join_narration(paths, self.test_dir)
+
+        self.assertEqual(narration.codec, 'mp3')
+        with open(narration.path, 'rb') as f:
+            self.assertEqual(f.read(), SILENT_FRAME * 10)
+        self.assertEqual(narration.offsets, [0.0, 3 * 1152 / 44100, 8 * 1152 / 44100])
+        self.assertAlmostEqual(narration.duration, 10 * SILENT_FRAME_SECONDS)
+        self.assertAlmostEqual(mp3_duration(SILENT_FRAME * 10), narration.duration)
+
+    @patch('assets.audio.MP3')
+    def test_scene_durations_match_the_joined_track(self, mock_mp3):
+        # mutagen trims the encoder delay and padding that the joined track keeps
+        mock_mp3.return_value.info.length = 4 * SILENT_FRAME_SECONDS - 1576 / 44100
+        paths = [self.write_scene("S1.mp3", LAME_INFO_FRAME + SILENT_FRAME * 4),
+                 self.write_scene("S2.mp3", LAME_INFO_FRAME + SILENT_FRAME * 2)]
+        narration = join_narration(paths, self.test_dir)
+
+        durations = [audio_duration(path) for path in paths]
+        self.assertAlmostEqual(durations[0], 4 * SILENT_FRAME_SECONDS)
+        self.assertAlmostEqual(narration.offsets[1], durations[0])
+        self.assertAlmostEqual(narration.duration, sum(durations))
+        mock_mp3.assert_not_called()
+
+    def test_scene_frames_follow_the_narration_timeline(self):
+        narration = NarrationTrack("joined.mp3", 'mp3', [0.0, 1.01, 2.02, 3.03], 4.04)
+        frames = narration.scene_frames(30)
+        # Every scene is 1.01s (30.3 frames); snapping boundaries keeps the total at round(4.04 * 30)
+        self.assertEqual(frames, [30, 31, 30, 30])
+        self.assertEqual(sum(frames), round(4.04 * 30))
+
+    def test_mismatched_formats_leave_no_partial_file(self):
+        paths = [self.write_scene("S1.mp3", SILENT_FRAME * 2), self.write_scene("S2.mp3", MONO_22K_FRAME * 2)]
+        output_path = os.path.join(self.test_dir, "joined.mp3")
+        self.assertIsNone(concat_narration_frames(paths, output_path))
+        self.assertFalse(os.path.exists(output_path))
+
+    @patch('assets.audio.audio_duration', side_effect=[1.5, 2.25])
+    @patch('assets.narration.run_ffmpeg')
+    def test_mixed_formats_are_transcoded_once(self, mock_run_ffmpeg, mock_duration):
+        paths = [self.write_scene("S1.mp3", SILENT_FRAME * 2), self.write_scene("S2.mp3", MONO_22K_FRAME * 2)]
+        narration = join_narration(paths, self.test_dir)
+
+        mock_run_ffmpeg.assert_called_once()
+        ffmpeg_args = mock_run_ffmpeg.call_args[0][0]
+        self.assertIn("concat=n=2:v=0:a=1[narration]", ffmpeg_args[ffmpeg_args.index('-filter_complex') + 1])
+        self.assertEqual(ffmpeg_args[-1], os.path.join(self.test_dir, f"{config.NARRATION_FILE}.m4a"))
+        self.assertEqual(narration.codec, 'aac')
+        self.assertEqual(narration.offsets, [0.0, 1.5])
+        self.assertAlmostEqual(narration.duration, 3.75)
+
+    @patch('assets.narration.run_ffmpeg')
+    def test_failed_transcode_leaves_no_partial_file(self, mock_run_ffmpeg):
+        def partial_encode(ffmpeg_args):
+            with open(ffmpeg_args[-1], 'wb') as f:
+                f.write(b"partial")
+            raise subprocess.CalledProcessError(1, "ffmpeg", stderr="disk full")
+        mock_run_ffmpeg.side_effect = partial_encode
+        paths = [self.write_scene("S1.mp3", SILENT_FRAME * 2), self.write_scene("S2.mp3", MONO_22K_FRAME * 2)]
+        with self.assertRaises(subprocess.CalledProcessError):
+            join_narration(paths, self.test_dir)
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["S1.mp3", "S2.mp3"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# video_creation_cli/tests/test_narration_cache.py
+
+import unittest
+import json
+from unittest.mock import patch
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.audio import TTSEngine, generate_audio
+from assets.narration_cache import NarrationCache, narration_key
+from devtools.tts_server import SILENT_FRAME, SILENT_FRAME_SECONDS
+
+class CountingEngine(TTSEngine):
+    name = 'counting'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def synthesize(self, text, output_path):
+        self.calls += 1
+        with open(output_path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+
+class TestNarrationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.audio_dir = os.path.join(self.test_dir, "audio")
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.cache = NarrationCache(os.path.join(self.test_dir, "narration"))
+        self.options = {'engine': 'gtts', 'voice': None, 'lang': 'en', 'speed': 1.0}
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_key_normalizes_whitespace_and_includes_options(self):
+        self.assertEqual(narration_key("Welcome  back\nto the show.", self.options),
+                         narration_key(" Welcome back to the show. ", self.options))
+        self.assertNotEqual(narration_key("Welcome back.", self.options),
+                            narration_key("Welcome back.", dict(self.options, voice='co.uk')))
+
+    def test_store_and_lookup(self):
+        source_path = os.path.join(self.audio_dir, "S1.mp3")
+        with open(source_path, 'wb') as f:
+            f.write(b"narration")
+        self.assertIsNone(self.cache.lookup("Welcome back.", self.options))
+
+        self.cache.store("Welcome back.", self.options, source_path, 1.75)
+        cached_path, duration = self.cache.lookup("Welcome  back.", self.options)
+        self.assertEqual(duration, 1.75)
+        with open(cached_path, 'rb') as f:
+            self.assertEqual(f.read(), b"narration")
+
+        # Entries survive a restart through the index
+        reloaded = NarrationCache(self.cache.root)
+        self.assertEqual(reloaded.lookup("Welcome back.", self.options)[1], 1.75)
+        self.assertIsNone(reloaded.lookup("Welcome back.", dict(self.options, speed=1.5)))
+
+    def _store(self, cache, text, content):
+        source_path = os.path.join(self.audio_dir, "source.mp3")
+        with open(source_path, 'wb') as f:
+            f.write(content)
+        return cache.store(text, self.options, source_path, 1.0)
+
+    def test_corrupt_entries_are_dropped(self):
+        cached_path = self._store(self.cache, "Welcome back.", b"narration")
+        with open(cached_path, 'wb') as f:
+            f.write(b"torn")
+        with patch('sys.stdout'):
+            self.assertIsNone(self.cache.lookup("Welcome back.", self.options))
+        self.assertEqual(len(self.cache), 0)
+        self.assertFalse(os.path.exists(cached_path))
+        self.assertEqual(len(NarrationCache(self.cache.root)), 0)
+
+    def test_least_recently_used_entries_are_evicted_beyond_the_cap(self):
+        cache = NarrationCache(os.path.join(self.test_dir, "capped"), max_bytes=25)
+        self._store(cache, "One.", b"x" * 10)
+        self._store(cache, "Two.", b"x" * 10)
+        self.assertIsNotNone(cache.lookup("One.", self.options)) # "Two." is now the least recently used
+        self._store(cache, "Three.", b"x" * 10)
+
+        self.assertIsNotNone(cache.lookup("One.", self.options))
+        self.assertIsNone(cache.lookup("Two.", self.options))
+        self.assertEqual(cache.total_bytes, 20)
+
+        reloaded = NarrationCache(cache.root, max_bytes=25)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(reloaded.prune(0), 2)
+        self.assertEqual(len(NarrationCache(cache.root)), 0)
+
+    def test_legacy_durations_are_recounted_from_frames(self):
+        key = narration_key("Hello.", self.options)
+        path = os.path.join(self.cache.root, key[:2], f"{key}.mp3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(SILENT_FRAME * 3)
+        with open(self.cache.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'key': key, 'duration': 0.01, 'size': len(SILENT_FRAME) * 3, 'options': self.options}) + "\n")
+
+        _, duration = NarrationCache(self.cache.root).lookup("Hello.", self.options)
+        self.assertAlmostEqual(duration, 3 * SILENT_FRAME_SECONDS)
+        _, duration = NarrationCache(self.cache.root).lookup("Hello.", self.options)
+        self.assertAlmostEqual(duration, 3 * SILENT_FRAME_SECONDS)
+
+    @patch('assets.audio.MP3')
+    def test_generate_audio_reuses_cached_narration(self, mock_mp3):
+        mock_mp3.return_value.info.length = 3.0
+        engine = CountingEngine()
+
+        first_path, first_duration = generate_audio("S1", "Thanks for watching.", self.audio_dir, engine=engine, cache=self.cache)
+        second_path, second_duration = generate_audio("S9", "Thanks  for watching.", self.audio_dir, engine=engine, cache=self.cache)
+
+        self.assertEqual(engine.calls, 1)
+        self.assertEqual(mock_mp3.call_count, 1)
+        self.assertEqual((first_duration, second_duration), (3.0, 3.0))
+        self.assertEqual(second_path, os.path.join(self.audio_dir, "S9.mp3"))
+        with open(second_path, 'rb') as f:
+            self.assertEqual(f.read(), b"Thanks for watching.")
+
+    @patch('assets.audio.MP3')
+    def test_generate_audio_resynthesizes_evicted_narration(self, mock_mp3):
+        mock_mp3.return_value.info.length = 3.0
+        engine = CountingEngine()
+        generate_audio("S1", "Thanks for watching.", self.audio_dir, engine=engine, cache=self.cache)
+
+        lookup = self.cache.lookup
+        def lookup_then_prune(text, options):
+            cached = lookup(text, options)
+            self.cache.prune(0) # Another job prunes the cache right after this lookup
+            return cached
+
+        with patch.object(self.cache, 'lookup', side_effect=lookup_then_prune):
+            audio_path, duration = generate_audio("S2", "Thanks for watching.", self.audio_dir, engine=engine, cache=self.cache)
+        self.assertEqual(engine.calls, 2)
+        self.assertEqual((audio_path, duration), (os.path.join(self.audio_dir, "S2.mp3"), 3.0))
+
+if __name__ == '__main__':
+    unittest.main()
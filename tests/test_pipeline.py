@@ -0,0 +1,127 @@
+# video_creation_cli/tests/test_pipeline.py
+
+import unittest
+import threading
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.runner import Rerun, Stage, StagePools, ScenePipeline, parse_stage_workers
+
+class TestScenePipeline(unittest.TestCase):
+
+    def test_stages_run_in_dependency_order(self):
+        """Every scene passes through every stage, each after its dependencies."""
+        events = []
+        lock = threading.Lock()
+
+        def make_stage(name):
+            def func(scene_key, context):
+                with lock:
+                    events.append((scene_key, name))
+                return True
+            return func
+
+        stages = [
+            Stage('a', make_stage('a')),
+            Stage('b', make_stage('b'), after=('a',)),
+            Stage('c', make_stage('c'), after=('b',)),
+        ]
+        with StagePools({'a': 2, 'b': 2, 'c': 2}) as pools:
+            completed = ScenePipeline(stages, pools).run(['S1', 'S2', 'S3'], None)
+
+        for scene_key in ['S1', 'S2', 'S3']:
+            self.assertEqual(completed[scene_key], {'a', 'b', 'c'})
+            scene_events = [name for key, name in events if key == scene_key]
+            self.assertEqual(scene_events, ['a', 'b', 'c'])
+
+    def test_failed_stage_stops_only_that_scene(self):
+        def fail_s2(scene_key, context):
+            if scene_key == 'S2':
+                raise RuntimeError("boom")
+            return True
+
+        stages = [Stage('a', fail_s2), Stage('b', lambda scene_key, context: True, after=('a',))]
+        with StagePools() as pools:
+            completed = ScenePipeline(stages, pools).run(['S1', 'S2'], None)
+
+        self.assertEqual(completed['S1'], {'a', 'b'})
+        self.assertEqual(completed['S2'], set())
+
+    def test_scenes_overlap_across_stages(self):
+        """A later scene can be in stage 'a' while an earlier scene is already in stage 'b'."""
+        b_started = threading.Event()
+        overlapped = []
+
+        def stage_a(scene_key, context):
+            if scene_key == 'S2':
+                overlapped.append(b_started.wait(timeout=2))
+            return True
+
+        def stage_b(scene_key, context):
+            b_started.set()
+            return True
+
+        stages = [Stage('a', stage_a), Stage('b', stage_b, after=('a',))]
+        with StagePools({'a': 1, 'b': 1}) as pools:
+            ScenePipeline(stages, pools).run(['S1', 'S2'], None)
+        self.assertEqual(overlapped, [True])
+
+    def test_resume_skips_completed_stages(self):
+        calls = []
+        recorded = []
+
+        def make_stage(name):
+            def func(scene_key, context):
+                calls.append((scene_key, name))
+                return True
+            return func
+
+        stages = [Stage('a', make_stage('a')), Stage('b', make_stage('b'), after=('a',))]
+        with StagePools() as pools:
+            completed = ScenePipeline(stages, pools).run(
+                ['S1', 'S2'], None,
+                completed={'S1': {'a', 'b'}, 'S2': {'a'}},
+                on_stage_complete=lambda scene_key, stage_name: recorded.append((scene_key, stage_name))
+            )
+
+        self.assertEqual(calls, [('S2', 'b')])
+        self.assertEqual(recorded, [('S2', 'b')])
+        self.assertEqual(completed['S1'], {'a', 'b'})
+        self.assertEqual(completed['S2'], {'a', 'b'})
+
+    def test_rerun_resets_earlier_stages(self):
+        calls = []
+        attempts = {'b': 0}
+
+        def stage_a(scene_key, context):
+            calls.append('a')
+            return True
+
+        def stage_b(scene_key, context):
+            calls.append('b')
+            attempts['b'] += 1
+            return Rerun('a') if attempts['b'] == 1 else True
+
+        stages = [Stage('a', stage_a), Stage('b', stage_b, after=('a',))]
+        with StagePools() as pools:
+            completed = ScenePipeline(stages, pools).run(['S1'], None)
+        self.assertEqual(calls, ['a', 'b', 'a', 'b'])
+        self.assertEqual(completed['S1'], {'a', 'b'})
+
+    def test_empty_run(self):
+        with StagePools() as pools:
+            self.assertEqual(ScenePipeline([Stage('a', lambda k, c: True)], pools).run([], None), {})
+
+    def test_parse_stage_workers(self):
+        self.assertEqual(parse_stage_workers("tts=4, download=8"), {'tts': 4, 'download': 8})
+        self.assertEqual(parse_stage_workers(""), {})
+        with self.assertRaises(ValueError):
+            parse_stage_workers("tts=many")
+        with self.assertRaises(ValueError):
+            parse_stage_workers("render=0")
+
+if __name__ == '__main__':
+    unittest.main()
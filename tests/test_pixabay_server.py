@@ -0,0 +1,118 @@
+# video_creation_cli/tests/test_pixabay_server.py
+
+import unittest
+import http.client
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from devtools.pixabay_server import FixtureCatalog, PixabayStandIn
+
+class TestPixabayStandIn(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        self.fixtures_dir = os.path.join(self.test_dir, "fixtures")
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        self.contents = {}
+        for index, name in enumerate(["beach_sunset_1080x1920.mp4", "city_night.mp4", "forest_walk.mp4", "notes.txt"]):
+            content = bytes([index]) * (200 * 1024 + index)
+            with open(os.path.join(self.fixtures_dir, name), 'wb') as f:
+                f.write(content)
+            self.contents[name] = content
+        self.catalog = FixtureCatalog.from_directory(self.fixtures_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _get(self, url):
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def _search(self, stand_in, **params):
+        params.setdefault('key', "test_key")
+        return self._get(f"{stand_in.api_url}?{urllib.parse.urlencode(params)}")
+
+    def test_catalog_from_directory(self):
+        self.assertEqual([entry['tags'] for entry in self.catalog.entries], ["beach, sunset", "city, night", "forest, walk"])
+        self.assertEqual((self.catalog.entries[0]['width'], self.catalog.entries[0]['height']), (1080, 1920))
+        self.assertEqual([entry['id'] for entry in self.catalog.search("Forest trail")], [3])
+
+    def test_search_and_pagination(self):
+        with PixabayStandIn(self.catalog) as stand_in:
+            status, _, body = self._search(stand_in, q="", per_page=3)
+            self.assertEqual(status, 200)
+            results = json.loads(body)
+            self.assertEqual(results['totalHits'], 3)
+            self.assertEqual([hit['id'] for hit in results['hits']], [1, 2, 3])
+            self.assertTrue(results['hits'][0]['videos']['large']['url'].startswith(stand_in.url))
+
+            status, _, body = self._search(stand_in, q="city", per_page=3)
+            self.assertEqual([hit['id'] for hit in json.loads(body)['hits']], [2])
+
+            status, _, body = self._search(stand_in, q="", per_page=3, page=2)
+            self.assertEqual(status, 400)
+            status, _, body = self._search(stand_in, key="", q="city")
+            self.assertEqual(status, 400)
+
+    def test_rate_limit_headers_and_429(self):
+        with PixabayStandIn(self.catalog, rate_limit=2, rate_limit_window=60) as stand_in:
+            status, headers, _ = self._search(stand_in, q="city")
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['X-RateLimit-Limit'], "2")
+            self.assertEqual(headers['X-RateLimit-Remaining'], "1")
+            self._search(stand_in, q="city")
+            status, headers, body = self._search(stand_in, q="city")
+            self.assertEqual(status, 429)
+            self.assertEqual(headers['X-RateLimit-Remaining'], "0")
+            self.assertIn("Retry-After", headers)
+            self.assertEqual(stand_in.stats['rate_limited'], 1)
+
+    def test_injected_server_errors(self):
+        with PixabayStandIn(self.catalog, error_rate=1.0, error_status=502) as stand_in:
+            status, _, body = self._search(stand_in, q="city")
+            self.assertEqual(status, 502)
+            status, _, _ = self._get(stand_in.video_url(1, 'large'))
+            self.assertEqual(status, 502)
+            self.assertEqual(stand_in.stats['injected_errors'], 2)
+
+    def test_streams_video_bytes(self):
+        with PixabayStandIn(self.catalog) as stand_in:
+            status, headers, body = self._get(stand_in.video_url(3, 'medium'))
+            self.assertEqual(status, 200)
+            self.assertEqual(body, self.contents["forest_walk.mp4"])
+            self.assertEqual(int(headers['Content-Length']), len(body))
+
+            status, _, _ = self._get(stand_in.video_url(99, 'large'))
+            self.assertEqual(status, 404)
+
+    def test_truncated_video_body(self):
+        with PixabayStandIn(self.catalog, truncate_rate=1.0) as stand_in:
+            with self.assertRaises(http.client.IncompleteRead):
+                self._get(stand_in.video_url(1, 'large'))
+            self.assertEqual(stand_in.stats['truncated'], 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("requests"), "requests is not installed")
+    def test_search_videos_against_stand_in(self):
+        from assets.video import search_videos
+        from utils.rate_limiter import RateLimiter
+
+        with PixabayStandIn(self.catalog) as stand_in:
+            results = search_videos("beach", "test_key", per_page=3, endpoint_url=stand_in.api_url,
+                                    rate_limiter=RateLimiter(100, 60))
+        self.assertEqual([hit['id'] for hit in results['hits']], [1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# video_creation_cli/tests/test_profiling.py
+
+import unittest
+import os
+import pstats
+import shutil
+import sys
+import time
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.runner import Stage, StagePools, ScenePipeline
+from utils.profiling import PhaseProfiler
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_phases_dump_profiles_and_summary(self):
+        profiler = PhaseProfiler(os.path.join(self.test_dir, "profile"))
+        profiler.start_phase("short")
+        busy_wait(0.01)
+        profiler.start_phase("long")
+        busy_wait(0.05)
+        profiler.finish()
+
+        self.assertEqual([phase['name'] for phase in profiler.phases], ["short", "long"])
+        for name in ("01_short.prof", "02_long.prof"):
+            pstats.Stats(os.path.join(self.test_dir, "profile", name)) # Loads as a valid profile
+
+        lines = profiler.summary_table().splitlines()
+        self.assertTrue(lines[1].startswith("long"))
+        self.assertTrue(lines[2].startswith("short"))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "profile", "summary.txt")))
+
+    def test_wrapped_stages_profile_worker_threads(self):
+        def slow_stage(scene_key, context):
+            busy_wait(0.01)
+            return True
+
+        profiler = PhaseProfiler(os.path.join(self.test_dir, "profile"))
+        profiler.start_phase("pipeline")
+        stages = profiler.wrap_stages([Stage('render', slow_stage)])
+        with StagePools({'render': 2}) as pools:
+            ScenePipeline(stages, pools).run(['scene_1', 'scene_2'], context=None)
+        profiler.finish()
+
+        self.assertEqual(profiler.stage_times['render']['calls'], 2)
+        self.assertGreater(profiler.stage_times['render']['wall'], 0.015)
+        stats = pstats.Stats(profiler.phases[0]['path'])
+        profiled_functions = {function for _, _, function in stats.stats}
+        self.assertIn('slow_stage', profiled_functions)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# video_creation_cli/tests/test_rate_limiter.py
+
+import unittest
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.rate_limiter import RateLimiter
+
+class FakeClock:
+    """A manual clock whose sleep() simply advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(5, 10, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_up_to_limit_without_waiting(self):
+        for _ in range(5):
+            self.limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_waits_for_refill_once_exhausted(self):
+        for _ in range(6):
+            self.limiter.acquire()
+        # 5 requests per 10 seconds refills one token every 2 seconds
+        self.assertAlmostEqual(self.clock.now, 2.0)
+
+    def test_remaining_header_caps_tokens(self):
+        self.limiter.update_from_headers({'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': '10'})
+        self.limiter.acquire()
+        self.limiter.acquire()
+        self.assertGreater(self.clock.now, 0)
+
+    def test_exhausted_quota_blocks_until_reset(self):
+        self.limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '7'})
+        self.limiter.acquire()
+        self.assertGreaterEqual(self.clock.now, 7.0)
+
+    def test_block_for(self):
+        self.limiter.block_for(3)
+        self.limiter.acquire()
+        self.assertGreaterEqual(self.clock.now, 3.0)
+
+    def test_ignores_missing_or_invalid_headers(self):
+        self.limiter.update_from_headers({})
+        self.limiter.update_from_headers({'X-RateLimit-Remaining': 'n/a', 'X-RateLimit-Reset': '1'})
+        self.limiter.update_from_headers(None)
+        for _ in range(5):
+            self.limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0, 60)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# video_creation_cli/tests/test_render.py
+
+import unittest
+from unittest.mock import patch
+import shutil
+import subprocess
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.render import build_filter_chain, plan_scene_render, render_frame_count, render_scene_clip
+import config
+
+class TestRenderPlanner(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        os.makedirs(self.test_output_dir, exist_ok=True)
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for root, dirs, files in os.walk(self.test_output_dir, topdown=False):
+            for name in files:
+                os.remove(os.path.join(root, name))
+            for name in dirs:
+                os.rmdir(os.path.join(root, name))
+        if os.path.exists(self.test_output_dir):
+            os.rmdir(self.test_output_dir)
+
+    def test_filter_chain(self):
+        chain = build_filter_chain((1080, 1920), 30)
+        self.assertEqual(chain.split(',')[:3], [
+            "scale=1080:1920:force_original_aspect_ratio=increase",
+            "crop=1080:1920",
+            "fps=30"
+        ])
+
+    def test_plan_is_single_encode_with_loop_and_trim(self):
+        args = plan_scene_render("raw.mp4", "out.mp4", 7.004)
+        self.assertEqual(args.count('-i'), 1)
+        self.assertEqual(args[args.index('-stream_loop') + 1], '-1')
+        self.assertEqual(args[args.index('-frames:v') + 1], str(211 + config.RENDER_TAIL_FRAMES)) # ceil(7.004 * 30) frames
+        self.assertEqual(args[args.index('-bf') + 1], '0')
+        self.assertEqual(args[args.index('-c:v') + 1], 'libx264')
+        self.assertEqual(args[-1], "out.mp4")
+
+    def test_frame_count(self):
+        self.assertEqual(render_frame_count(2.0, 30), 60 + config.RENDER_TAIL_FRAMES)
+        self.assertEqual(render_frame_count(1.0 / 3, 30), 10 + config.RENDER_TAIL_FRAMES)
+
+    def test_invalid_duration(self):
+        self.assertFalse(render_scene_clip("raw.mp4", "out.mp4", None))
+
+    @patch('assets.render.run_ffmpeg', side_effect=subprocess.TimeoutExpired(['ffmpeg'], 80))
+    def test_render_timeout_fails_the_render(self, mock_run_ffmpeg):
+        self.assertFalse(render_scene_clip("raw.mp4", "out.mp4", 2.0))
+        self.assertEqual(mock_run_ffmpeg.call_args.kwargs['timeout'],
+                         config.RENDER_TIMEOUT_BASE + 2.0 * config.RENDER_TIMEOUT_PER_SECOND)
+
+    @unittest.skipUnless(shutil.which('ffmpeg') and shutil.which('ffprobe'), "ffmpeg is not installed")
+    def test_render_trim_and_loop(self):
+        source_path = os.path.join(self.test_output_dir, "source.mp4")
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-f', 'lavfi', '-i', 'testsrc2=size=640x360:rate=25',
+                        '-t', '2', source_path], check=True)
+        for target_duration in (1.0, 5.0):
+            output_path = os.path.join(self.test_output_dir, f"scene_{target_duration}.mp4")
+            self.assertTrue(render_scene_clip(source_path, output_path, target_duration, (108, 192), 30))
+            probe = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries',
+                                    'stream=width,height:format=duration', '-of', 'default=noprint_wrappers=1',
+                                    output_path], check=True, capture_output=True, text=True).stdout
+            self.assertIn("width=108", probe)
+            self.assertIn("height=192", probe)
+            duration = float(probe.split("duration=")[1].split()[0])
+            self.assertAlmostEqual(duration, target_duration, delta=0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# video_creation_cli/tests/test_search_cache.py
+
+import unittest
+from unittest.mock import patch
+import os
+import sqlite3
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.search_cache import SearchCache
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory for tests."""
+        self.test_output_dir = "test_output"
+        os.makedirs(self.test_output_dir, exist_ok=True)
+        self.now = 1000.0
+        self.cache = SearchCache(os.path.join(self.test_output_dir, "search.sqlite3"), ttl_seconds=60,
+                                 max_entries=2, clock=lambda: self.now)
+        self.params = {'key': 'secret', 'q': 'Father  Son', 'orientation': 'vertical', 'safesearch': 'false',
+                       'video_type': 'film', 'editors_choice': 'true', 'per_page': 200, 'order': 'latest', 'page': 1}
+
+    def tearDown(self):
+        """Clean up the temporary output directory and files after tests."""
+        for name in os.listdir(self.test_output_dir):
+            os.remove(os.path.join(self.test_output_dir, name))
+        os.rmdir(self.test_output_dir)
+
+    def test_round_trip_and_normalization(self):
+        self.assertIsNone(self.cache.get(self.params))
+        self.cache.put(self.params, {"hits": [{"id": 1}]})
+        # The API key is not part of the key and the query is normalized
+        same_search = dict(self.params, key='other', q='father son')
+        self.assertEqual(self.cache.get(same_search), {"hits": [{"id": 1}]})
+        self.assertIsNone(self.cache.get(dict(self.params, page=2)))
+
+    def test_connections_are_closed(self):
+        opened = []
+        real_connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            connection = real_connect(*args, **kwargs)
+            opened.append(connection)
+            return connection
+
+        with patch('assets.search_cache.sqlite3.connect', side_effect=tracking_connect):
+            self.cache.put(self.params, {"hits": []})
+            self.cache.get(self.params)
+            len(self.cache)
+        self.assertEqual(len(opened), 3)
+        for connection in opened:
+            with self.assertRaises(sqlite3.ProgrammingError): # Raised for closed connections
+                connection.execute("SELECT 1")
+
+    def test_ttl_expiry(self):
+        self.cache.put(self.params, {"hits": []})
+        self.now += 61
+        self.assertIsNone(self.cache.get(self.params))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.put(dict(self.params, q='a'), {"q": "a"})
+        self.now += 1
+        self.cache.put(dict(self.params, q='b'), {"q": "b"})
+        self.now += 1
+        self.cache.get(dict(self.params, q='a'))
+        self.now += 1
+        self.cache.put(dict(self.params, q='c'), {"q": "c"})
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get(dict(self.params, q='a')))
+        self.assertIsNone(self.cache.get(dict(self.params, q='b')))
+
+    def test_purge_expired(self):
+        self.cache.put(self.params, {"hits": []})
+        self.now += 120
+        self.assertEqual(self.cache.purge_expired(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
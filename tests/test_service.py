@@ -0,0 +1,130 @@
+# video_creation_cli/tests/test_service.py
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from main import build_parser
+from service import JobManager, make_server
+import config
+
+class TestRenderService(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.runs = []
+
+        def fake_runner(args, pools, analysis_lock):
+            self.runs.append(args)
+            os.makedirs(args.output_dir, exist_ok=True)
+            with open(os.path.join(args.output_dir, config.CONSOLIDATED_JSON_FILE), 'w', encoding='utf-8') as f:
+                json.dump({}, f)
+            return {'ok': True}
+
+        base_args = build_parser().parse_args(["--api_key", "service_key", "--per_page", "7"])
+        self.manager = JobManager(base_args, os.path.join(self.test_dir, "jobs"), pools=None, runner=fake_runner)
+        self.server = make_server(self.manager, "127.0.0.1", 0)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.manager.shutdown()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def _wait_for(self, job_id):
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            status, job = self._request("GET", f"/jobs/{job_id}")
+            if job['status'] in ('done', 'failed'):
+                return job
+            time.sleep(0.02)
+        self.fail(f"Job {job_id} did not finish")
+
+    def test_submit_job_and_poll_status(self):
+        status, created = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"order": "latest", "tts_speed": "1.2"}})
+        self.assertEqual(status, 202)
+
+        job = self._wait_for(created['id'])
+        self.assertEqual(job['status'], 'done')
+        self.assertIn('consolidated_analysis', job['artifacts'])
+        self.assertTrue(os.path.exists(job['artifacts']['consolidated_analysis']))
+
+        # Job options override the service's arguments, which fill in the rest
+        job_args = self.runs[0]
+        self.assertEqual(job_args.order, "latest")
+        self.assertEqual(job_args.tts_speed, 1.2) # Converted by the CLI parser
+        self.assertEqual(job_args.per_page, 7)
+        self.assertEqual(job_args.api_key, "service_key")
+        with open(job_args.script_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "A sunny day.")
+
+        status, listing = self._request("GET", "/jobs")
+        self.assertEqual([listed['id'] for listed in listing['jobs']], [created['id']])
+
+    def test_rejects_invalid_jobs(self):
+        status, body = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"no_such_flag": 1}})
+        self.assertEqual(status, 400)
+        self.assertIn("no_such_flag", body['error'])
+
+        status, body = self._request("POST", "/jobs", {"options": {}})
+        self.assertEqual(status, 400)
+
+        status, body = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"per_page": "abc"}})
+        self.assertEqual(status, 400)
+        self.assertIn("per_page", body['error'])
+
+        status, body = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"assembly": "fastest"}})
+        self.assertEqual(status, 400)
+
+        status, body = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"stage_workers": "render=8"}})
+        self.assertEqual(status, 400)
+        self.assertIn("stage_workers", body['error'])
+
+        status, body = self._request("POST", "/jobs", {"script_text": "A sunny day.", "options": {"clip_cache_dir": "/tmp/elsewhere"}})
+        self.assertEqual(status, 400)
+        self.assertIn("clip_cache_dir", body['error'])
+
+        status, body = self._request("GET", "/jobs/unknown")
+        self.assertEqual(status, 404)
+        self.assertEqual(self.runs, [])
+
+    def test_finished_jobs_are_evicted(self):
+        self.manager.max_finished_jobs = 2
+        job_ids = []
+        for index in range(3):
+            status, created = self._request("POST", "/jobs", {"script_text": f"Scene {index}."})
+            self.assertEqual(status, 202)
+            self._wait_for(created['id'])
+            job_ids.append(created['id'])
+
+        status, listing = self._request("GET", "/jobs")
+        self.assertEqual([listed['id'] for listed in listing['jobs']], job_ids[1:])
+        status, body = self._request("GET", f"/jobs/{job_ids[0]}")
+        self.assertEqual(status, 404)
+        self.assertFalse(os.path.exists(os.path.join(self.manager.jobs_dir, job_ids[0])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# video_creation_cli/tests/test_stages.py
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.runner import Rerun
+from pipeline.stages import RunContext, download_stage, render_stage, search_stage
+
+def hit(video_id):
+    return {'id': video_id, 'tags': "sea", 'duration': 10, 'videos': {'large': {'url': f"https://example.com/{video_id}.mp4", 'size': 100}}}
+
+def fake_video_module(results_by_query):
+    """Stands in for assets.video, whose HTTP and moviepy imports these stage tests don't need."""
+    def download_video(url, path, **kwargs):
+        with open(path, 'wb') as f:
+            f.write(b"video")
+        return True
+    return SimpleNamespace(
+        generate_queries=lambda analysis, settings: list(results_by_query),
+        search_videos=MagicMock(side_effect=lambda query, *args, **kwargs: {'hits': [hit(i) for i in results_by_query[query]]}),
+        download_video=download_video,
+    )
+
+class TestSceneStages(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        args = SimpleNamespace(output_dir=self.test_dir, api_key="key", safesearch=True, video_type="film", per_page=3,
+                               order="popular", pixabay_endpoint=None)
+        self.context = RunContext(args, {'S1': {'scene_text': "The sea.", 'analysis': {}}}, {})
+        os.makedirs(self.context.video_clips_dir, exist_ok=True)
+        os.makedirs(self.context.adjusted_clips_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_search_continues_past_claimed_clips(self):
+        video = fake_video_module({'sea': [1, 2], 'ocean': [3]})
+        self.context.claim_video(1)
+        self.context.claim_video(2)
+        with patch.dict(sys.modules, {'assets.video': video}):
+            self.assertTrue(search_stage('S1', self.context))
+        self.assertEqual([c['id'] for c in self.context.scene_state['S1']['candidates']], [1, 2, 3])
+
+    def test_download_searches_next_query_when_candidates_were_claimed(self):
+        video = fake_video_module({'sea': [1], 'ocean': [2]})
+        with patch.dict(sys.modules, {'assets.video': video}):
+            self.assertTrue(search_stage('S1', self.context))
+            self.context.claim_video(1) # Claimed by another scene after the search
+            self.assertTrue(download_stage('S1', self.context))
+        self.assertEqual(self.context.scene_state['S1']['selected']['id'], 2)
+        self.assertEqual(video.search_videos.call_count, 2)
+
+    @patch('assets.render.render_scene_clip', return_value=False)
+    def test_failed_render_releases_clip_and_reruns_download(self, mock_render):
+        video = fake_video_module({'sea': [1, 2]})
+        state = self.context.scene_state['S1']
+        self.context.consolidated_analysis['S1']['audio_info'] = {'filename': "S1.mp3", 'duration': 5.0}
+        with patch.dict(sys.modules, {'assets.video': video}):
+            search_stage('S1', self.context)
+            download_stage('S1', self.context)
+            raw_path = state['raw_path']
+            self.assertIsInstance(render_stage('S1', self.context), Rerun)
+            self.assertFalse(os.path.exists(raw_path))
+            self.assertFalse(self.context.is_claimed(1))
+            self.assertTrue(download_stage('S1', self.context))
+        self.assertEqual(state['selected']['id'], 2)
+        self.assertEqual(state['rejected'], [1])
+
+if __name__ == '__main__':
+    unittest.main()
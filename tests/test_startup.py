@@ -0,0 +1,28 @@
+# video_creation_cli/tests/test_startup.py
+
+import unittest
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+BUDGET_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'startup_budget.json'))
+
+class TestStartupImports(unittest.TestCase):
+
+    def test_entry_points_import_no_heavy_dependencies(self):
+        with open(BUDGET_PATH, 'r', encoding='utf-8') as f:
+            budget = json.load(f)
+        for module_name in budget['entry_points']:
+            # A fresh interpreter, so modules imported by other tests don't count
+            result = subprocess.run(
+                [sys.executable, "-c", f"import sys, {module_name}; print('\\n'.join(sys.modules))"],
+                cwd=SRC_DIR, capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            loaded = {name.split('.', 1)[0] for name in result.stdout.splitlines()}
+            self.assertEqual(loaded & set(budget['forbidden_modules']), set(), module_name)
+
+if __name__ == '__main__':
+    unittest.main()
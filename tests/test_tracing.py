@@ -0,0 +1,70 @@
+# video_creation_cli/tests/test_tracing.py
+
+import unittest
+import json
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.runner import Stage, StagePools, ScenePipeline
+from utils.tracing import Tracer, tracer
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        tracer.disable()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_disabled_tracer_records_nothing(self):
+        local_tracer = Tracer()
+        with local_tracer.span("search_videos", query="park") as span:
+            span['cached'] = True
+        self.assertEqual(local_tracer.events(), [])
+
+    def test_spans_are_saved_as_chrome_trace_events(self):
+        local_tracer = Tracer()
+        local_tracer.enable()
+
+        @local_tracer.traced("render", cat="encode")
+        def render():
+            return "done"
+
+        with local_tracer.span("search_videos", cat="network", query="park") as span:
+            span['cached'] = True
+        self.assertEqual(render(), "done")
+
+        trace_path = os.path.join(self.test_dir, "trace.json")
+        local_tracer.save(trace_path)
+        with open(trace_path, 'r', encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+
+        spans = [event for event in events if event['ph'] == 'X']
+        self.assertEqual([event['name'] for event in spans], ["search_videos", "render"])
+        self.assertEqual(spans[0]['args'], {'query': "park", 'cached': True})
+        self.assertTrue(all(event['dur'] >= 0 and 'pid' in event and 'tid' in event for event in spans))
+        self.assertIn("thread_name", [event['name'] for event in events if event['ph'] == 'M'])
+
+    def test_pipeline_emits_a_span_per_scene_and_stage(self):
+        tracer.enable()
+        stages = [Stage('tts', lambda scene_key, context: True),
+                  Stage('search', lambda scene_key, context: True, after=('tts',))]
+        with StagePools({'tts': 2, 'search': 2}) as pools:
+            ScenePipeline(stages, pools).run(['scene_1', 'scene_2'], context=None)
+
+        events = tracer.events()
+        stage_spans = {(event['args']['scene'], event['name']) for event in events if event.get('cat') == 'stage'}
+        self.assertEqual(stage_spans, {(scene, stage) for scene in ('scene_1', 'scene_2') for stage in ('tts', 'search')})
+        thread_names = {event['args']['name'] for event in events if event['name'] == 'thread_name'}
+        self.assertTrue(any(name.startswith('tts-worker') for name in thread_names))
+        self.assertTrue(any(name.startswith('search-worker') for name in thread_names))
+
+if __name__ == '__main__':
+    unittest.main()
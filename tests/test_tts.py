@@ -0,0 +1,79 @@
+# video_creation_cli/tests/test_tts.py
+
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.audio import TTSEngine, GTTSEngine, EspeakEngine, generate_audio, get_tts_engine
+
+class RecordingEngine(TTSEngine):
+    name = 'recording'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.texts = []
+
+    def synthesize(self, text, output_path):
+        self.texts.append(text)
+        with open(output_path, 'wb') as f:
+            f.write(b"mp3")
+
+class TestTTSEngines(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_get_tts_engine(self):
+        engine = get_tts_engine('espeak', voice='en-gb', lang='en', speed=1.25)
+        self.assertIsInstance(engine, EspeakEngine)
+        self.assertTrue(engine.local)
+        self.assertEqual(engine.options(), {'engine': 'espeak', 'voice': 'en-gb', 'lang': 'en', 'speed': 1.25})
+        self.assertFalse(get_tts_engine('gtts').local)
+        with self.assertRaises(ValueError):
+            get_tts_engine('no_such_engine')
+
+    @patch('assets.audio.MP3')
+    def test_generate_audio_with_engine(self, mock_mp3):
+        mock_mp3.return_value.info.length = 2.5
+        engine = RecordingEngine()
+
+        audio_filepath, duration = generate_audio("S2", "A quiet forest.", self.test_dir, engine=engine)
+
+        self.assertEqual(audio_filepath, os.path.join(self.test_dir, "S2.mp3"))
+        self.assertEqual(duration, 2.5)
+        self.assertEqual(engine.texts, ["A quiet forest."])
+
+    @patch('assets.audio.gTTS')
+    def test_gtts_engine_voice_and_speed(self, mock_gtts):
+        GTTSEngine(voice='co.uk', lang='en', speed=0.8).synthesize("Hello.", "out.mp3")
+        mock_gtts.assert_called_with(text="Hello.", lang='en', tld='co.uk', slow=True)
+        mock_gtts.return_value.save.assert_called_with("out.mp3")
+
+    @patch('assets.audio.shutil.which', return_value=None)
+    def test_missing_local_engine_binary(self, mock_which):
+        audio_filepath, duration = generate_audio("S1", "Hello.", self.test_dir, engine=EspeakEngine())
+        self.assertIsNone(audio_filepath)
+        self.assertIsNone(duration)
+
+class TestTTSArguments(unittest.TestCase):
+
+    def test_parser_validates_engine_and_speed(self):
+        from main import build_parser
+        parser = build_parser()
+        self.assertEqual(parser.parse_args(["--tts_engine", "espeak", "--tts_speed", "1.5"]).tts_speed, 1.5)
+        for argv in (["--tts_speed", "0"], ["--tts_speed", "-1"], ["--tts_engine", "nope"]):
+            with patch('sys.stderr'), self.assertRaises(SystemExit):
+                parser.parse_args(argv)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# video_creation_cli/tests/test_tts_chunking.py
+
+import unittest
+import os
+import threading
+import time
+import shutil
+import sys
+
+# Add src to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from assets.audio import HTTPTTSEngine, TTSEngine, generate_audio, split_for_synthesis
+from assets.mp3_frames import concat_mp3, mp3_duration, parse_frames
+from devtools.tts_server import SILENT_FRAME, SILENT_FRAME_SECONDS, TTSStandIn, silent_mp3
+
+LONG_TEXT = (
+    "The river winds through the valley at dawn. Mist rises from the water, and herons wade "
+    "in the shallows; a fisherman pushes his boat out from the reeds, slowly, carefully, without a sound. "
+    "By noon the sun burns the mist away! Children run along the bank — they chase dragonflies "
+    "between the willows until their parents call them home for lunch."
+)
+
+def id3v2_tag(body_size=20):
+    size = bytes([(body_size >> shift) & 0x7F for shift in (21, 14, 7, 0)])
+    return b'ID3\x04\x00\x00' + size + bytes(body_size)
+
+def xing_frame():
+    frame = bytearray(SILENT_FRAME)
+    frame[4 + 32:4 + 36] = b'Xing' # After the side info of a stereo MPEG-1 frame
+    return bytes(frame)
+
+class TestSplitForSynthesis(unittest.TestCase):
+
+    def test_chunks_fit_and_preserve_text(self):
+        for max_chars in (40, 100, 150):
+            chunks = split_for_synthesis(LONG_TEXT, max_chars)
+            self.assertGreater(len(chunks), 1)
+            self.assertTrue(all(len(chunk) <= max_chars for chunk in chunks))
+            self.assertEqual(' '.join(chunks), ' '.join(LONG_TEXT.split()))
+
+    def test_prefers_sentence_boundaries(self):
+        chunks = split_for_synthesis("First sentence here. Second sentence here. Third one.", 45)
+        self.assertEqual(chunks, ["First sentence here. Second sentence here.", "Third one."])
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_for_synthesis("  A short   line. "), ["A short line."])
+
+class TestMP3Frames(unittest.TestCase):
+
+    def test_concat_strips_tags_and_info_frame(self):
+        first = id3v2_tag() + xing_frame() + SILENT_FRAME * 3 + b'TAG' + bytes(125)
+        second = SILENT_FRAME * 2
+        joined = concat_mp3([first, second])
+        self.assertEqual(joined, SILENT_FRAME * 5)
+        self.assertAlmostEqual(mp3_duration(joined), 5 * SILENT_FRAME_SECONDS)
+
+    def test_mismatched_formats_raise(self):
+        mono_22k = bytes([0xFF, 0xF3, 0x80, 0xC4]) + bytes(204) # MPEG-2, 64 kbps, 22.05 kHz, mono: 208-byte frames
+        self.assertEqual(parse_frames(mono_22k * 2)[0].format, (2, 22050, 1))
+        with self.assertRaises(ValueError):
+            concat_mp3([SILENT_FRAME, mono_22k])
+
+    def test_no_frames_raise(self):
+        with self.assertRaises(ValueError):
+            parse_frames(b"not an mp3 at all")
+
+class TestChunkedSynthesis(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.stand_in = TTSStandIn(latency=0.2, seconds_per_char=0.05).start()
+
+    def tearDown(self):
+        self.stand_in.stop()
+        shutil.rmtree(self.test_dir)
+
+    def test_long_scene_is_synthesized_in_parallel_and_joined(self):
+        engine = HTTPTTSEngine(endpoint=self.stand_in.url)
+        path, duration = generate_audio("scene_1", LONG_TEXT, self.test_dir, engine=engine)
+
+        chunks = split_for_synthesis(LONG_TEXT)
+        self.assertEqual([request['text'] for request in sorted(self.stand_in.requests, key=lambda r: LONG_TEXT.index(r['text']))], chunks)
+        self.assertGreater(self.stand_in.max_concurrency, 1)
+
+        with open(path, 'rb') as f:
+            audio = f.read()
+        expected = b''.join(silent_mp3(len(chunk) * 0.05) for chunk in chunks)
+        self.assertEqual(audio, expected)
+        self.assertAlmostEqual(duration, mp3_duration(expected))
+        self.assertEqual(os.listdir(self.test_dir), ["scene_1.mp3"])
+
+    def test_failed_chunk_cancels_the_rest_and_cleans_up(self):
+        class FailingEngine(TTSEngine):
+            name = 'failing'
+            chunked = True
+            calls = 0
+            lock = threading.Lock()
+
+            def synthesize(self, text, output_path):
+                with self.lock:
+                    type(self).calls += 1
+                    first = type(self).calls == 1
+                if first:
+                    raise RuntimeError("service unavailable")
+                time.sleep(0.05)
+                with open(output_path, 'wb') as f:
+                    f.write(SILENT_FRAME)
+
+        text = " ".join(f"Sentence number {index} of a long narration." for index in range(40))
+        path, duration = generate_audio("S1", text, self.test_dir, engine=FailingEngine())
+        self.assertIsNone(path)
+        self.assertLess(FailingEngine.calls, len(split_for_synthesis(text)))
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_short_scene_is_one_request(self):
+        engine = HTTPTTSEngine(endpoint=self.stand_in.url)
+        path, duration = generate_audio("scene_1", "Just a short line.", self.test_dir, engine=engine)
+        self.assertEqual(len(self.stand_in.requests), 1)
+        self.assertIsNotNone(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,7 +38,7 @@ class TestVideoOperations(unittest.TestCase):
         if os.path.exists(self.test_output_dir):
             os.rmdir(self.test_output_dir)
 
-    @patch('assets.video.requests.get')
+    @patch('assets.downloader.requests.Session.get')
     def test_download_video(self, mock_get):
         """Tests the video download function."""
         mock_response = MagicMock()